@@ -5,6 +5,18 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+실시간 알림(SSE: events/memberships, .../events)은 ASGI 로 띄워야 연결을 열어 둔 채 보낸다.
+    uvicorn config.asgi:application --workers 2
+열린 연결은 이벤트 루프에서 기다리기만 하므로 스레드/DB 연결을 잡지 않는다(submit/events.py).
+발행/구독은 프로세스 안에서만 전달되므로, 워커가 여럿이면 공유 캐시(CACHES)를 써야
+다른 워커의 변경이 하트비트(EVENTS_HEARTBEAT) 안에 반영된다.
+
+파일 다운로드·팀 대표 이미지·청크 업로드는 async 뷰이고, 다운로드/ZIP/성적 내보내기는 async iterator 로
+조각씩 보낸다(submit/streaming.py) → 느린 전송 수백 개가 동시에 있어도 스레드를 잡거나 파일을 통째로 메모리에 올리지 않는다.
+
+Django 는 요청 본문을 다 받은 뒤에 미들웨어를 부르므로, 제출 접수 시각(ArrivalTimeMiddleware)은
+stamp_arrival 래퍼가 scope 에 남긴 시각(본문을 받기 전)을 쓴다.
 """
 
 import os
@@ -12,5 +24,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# settings 에 ASGI 로 뜬다는 것을 알린다(CONN_MAX_AGE=0, settings.DATABASES 참고)
+os.environ.setdefault("DJANGO_ASGI", "1")
+
+django_application = get_asgi_application()
+
+# 제출 접수 시각: 본문을 다 받기 전(서버가 앱을 부른 순간)의 시각을 scope 에 남긴다(submit.middleware.stamp_arrival)
+from submit.middleware import stamp_arrival  # noqa: E402  (앱 로딩 뒤에 가져온다)
 
-application = get_asgi_application()
+application = stamp_arrival(django_application)
@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import datetime
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 요청 도착 시각(제출 접수 시각의 기준)은 다른 어떤 처리보다 먼저 찍는다
+    "submit.middleware.ArrivalTimeMiddleware",
+    # 가장 바깥에서 요청 전체(다른 미들웨어 포함)를 측정
+    "submit.middleware.RequestProfileMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     'django.middleware.locale.LocaleMiddleware',
@@ -64,6 +71,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "submit.context_processors.unread_notifications",
             ],
         },
     },
@@ -75,10 +83,26 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# submit.sqlite: sqlite3 + WAL/PRAGMA, BEGIN IMMEDIATE, 잠금 재시도 (submit/sqlite/base.py 참고)
+# CONN_MAX_AGE: WSGI 워커는 연결을 유지해서 요청마다 연결/PRAGMA 를 반복하지 않는다.
+#   ASGI(config/asgi.py 가 DJANGO_ASGI=1 을 설정)에서는 0: 동기 코드가 sync_to_async 스레드에서 돌고
+#   연결 정리(request_started/finished)는 다른 스레드에서 일어나므로, 유지한 연결이 스레드마다 쌓여 닫히지 않는다.
+# SQLITE_PATH: 저장소에 들어 있는 db.sqlite3(개발용)는 journal_mode 를 바꾸지 않는다(WAL 전환은 파일 헤더를
+#   고쳐서 git 에 수정으로 잡힌다). 배포 DB 는 저장소 밖 파일을 가리키면 WAL 이 적용된다.
+ASGI = os.environ.get("DJANGO_ASGI") == "1"
+SQLITE_PATH = Path(os.environ.get("SQLITE_PATH") or BASE_DIR / "db.sqlite3")
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": "submit.sqlite",
+        "NAME": SQLITE_PATH,
+        "CONN_MAX_AGE": 0 if ASGI else 60,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "lock_retries": 3,
+            # 저장소의 개발용 DB: 기존 rollback 저널 그대로(synchronous 도 기본값 FULL)
+            "pragmas": {"journal_mode": None, "synchronous": None} if SQLITE_PATH == BASE_DIR / "db.sqlite3" else {},
+        },
     }
 }
 
@@ -117,6 +141,20 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / 'static']
+# 배포: python manage.py collectstatic → 해시 이름 + .gz/.br 압축본(submit.storage.CompressedManifestStaticFilesStorage)
+STATIC_ROOT = BASE_DIR / "staticfiles"
+# 앞단 서버가 /static/ 을 맡지 않으면 Django 가 STATIC_ROOT 를 직접 보낸다(submit.fileserve.serve_static)
+SERVE_STATIC = not DEBUG
+# 해시 이름 정적 파일의 브라우저 캐시 시간(초). 내용이 바뀌면 이름이 바뀌므로 길게(immutable)
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+# 화면 CSS: python manage.py build_css 가 Tailwind CLI 로 static/css/style.css 를 만든다(결과 파일은 커밋)
+#   TAILWIND_CLI     : pip install tailwindcss-bin==4.3.3 의 tailwindcss 명령, 또는 독립 실행 파일(tailwindcss-linux-x64 등) 경로
+#   TAILWIND_VERSION : 커밋된 style.css 를 만든 CLI 버전. 다른 버전이면 결과가 달라지므로 build_css 가 거절한다
+TAILWIND_CLI = os.environ.get("TAILWIND_CLI", "tailwindcss")
+TAILWIND_VERSION = "4.3.3"
+TAILWIND_INPUT = BASE_DIR / "assets" / "tailwind.css"
+TAILWIND_OUTPUT = BASE_DIR / "static" / "css" / "style.css"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -133,4 +171,82 @@ LOGIN_REDIRECT_URL = "teacher_team_list"  # 로그인 후 팀 가입 페이지
 LOGOUT_REDIRECT_URL = "login"  # 있어도 무방(우리는 뷰에서 redirect 처리함)
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / "media"
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    # 개발(DEBUG)은 원래 이름 그대로, 배포는 collectstatic 이 만든 매니페스트(해시 이름)를 쓴다
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG
+        else "submit.storage.CompressedManifestStaticFilesStorage",
+    },
+    # 제출 파일: SHA-256 내용 주소 저장(중복 제거 + 참조 카운트)
+    "submissions": {"BACKEND": "submit.storage.ContentAddressedStorage"},
+}
+
+# 보호된 파일 전송 방식
+#   ""       : Django 가 직접 전송(FileResponse/sendfile, Range·조건부 요청 지원)
+#   "nginx"  : X-Accel-Redirect → SENDFILE_URL 은 MEDIA_ROOT 를 가리키는 internal location
+#   "apache" : X-Sendfile (mod_xsendfile)
+SENDFILE_BACKEND = ""
+SENDFILE_URL = "/protected-media/"
+
+# 이어받기(청크) 업로드: 조립 중인 파일은 MEDIA 밖 스테이징에 둔다
+UPLOAD_STAGING_ROOT = BASE_DIR / "staging" / "uploads"
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024        # 클라이언트 권장 청크 크기
+UPLOAD_CHUNK_MAX_BYTES = 32 * 1024 * 1024  # 한 요청(청크)의 최대 크기
+
+# 마감 직전 제출 접수 큐(submit/ingest.py). True 면 제출 요청은 파일을 스풀에 옮기고 접수증만 남긴 뒤 바로 응답하고,
+# DB 반영은 `python manage.py ingest_worker` 한 프로세스가 여러 건씩 묶어서 한다(켤 때는 워커를 꼭 함께 띄울 것).
+# 지각 여부는 반영 시각이 아니라 접수 시각(요청 도착 시각)으로 판단한다.
+# 워커의 캐시 세대 변경·이벤트 발행이 웹 워커에 닿으려면 CACHES 가 공유 캐시(Redis/Memcached 등)여야 한다.
+SUBMISSION_INGEST_QUEUE = False
+SUBMISSION_INGEST_ROOT = BASE_DIR / "staging" / "ingest"
+# 앞단 프록시가 붙이는 X-Request-Start("t=<초>") 를 도착 시각으로 쓸지. 프록시가 본문을 다 받은 뒤 넘기는 경우
+# (nginx 버퍼링) 더 이른 시각이 된다. 클라이언트가 보낸 값을 지우고 새로 붙이는 프록시 뒤에서만 켤 것.
+TRUST_X_REQUEST_START = False
+
+# 요청 프로파일링(submit.middleware.RequestProfileMiddleware)
+#   SAMPLE_RATE   : 측정할 요청 비율(0~1). 0 이면 끔. manage.py test 에서는 끈다(요청마다 로그 한 줄이 테스트 출력을 덮음)
+#                   — 측정을 확인하는 테스트만 override_settings 로 켠다
+#   SERVER_TIMING : 측정한 요청에 Server-Timing 헤더를 붙일지(브라우저 개발자도구 Timing 탭에서 확인)
+TESTING = sys.argv[1:2] == ["test"]
+REQUEST_PROFILE_SAMPLE_RATE = 0 if TESTING else 1.0 if DEBUG else 0.05
+REQUEST_PROFILE_SERVER_TIMING = DEBUG
+
+# 팀 접근 권한(멤버십) 캐시 유지 시간(초). 기본 캐시(LocMem)는 프로세스별이라
+# 여러 워커로 운영할 때는 CACHES 를 Redis/Memcached 등 공유 캐시로 바꾸면 즉시 무효화된다.
+ACCESS_CACHE_TIMEOUT = 60
+
+# 로그인 후 첫 화면(내 팀 카드) 사용자별 캐시 유지 시간(초). 변경은 세대 카운터로 바로 반영되고,
+# 이 값은 놓친 변경(bulk_create 등 save() 를 거치지 않는 쓰기)이 남아 있는 최대 시간이다.
+HOME_CACHE_TIMEOUT = 300
+
+# 팀/과제 화면의 공유 조각(과제 목록, 과제 머리글) 캐시 유지 시간(초). 버전 키라 변경 즉시 새 키를 쓴다.
+FRAGMENT_CACHE_TIMEOUT = 600
+
+# 안 읽은 알림 수 캐시 카운터 유지 시간(초). 만들기/읽음은 바로 반영되고,
+# 이 값은 submit.notifications 를 거치지 않은 변경이 배지에 남아 있는 최대 시간이다.
+NOTIFICATION_COUNT_TIMEOUT = 3600
+
+# 마감 임박 알림(send_due_reminders) 구간: 마감까지 남은 시간이 이 안에 들어오면 미제출자에게 한 번씩 보낸다
+DUE_REMINDER_WINDOWS = (datetime.timedelta(hours=24), datetime.timedelta(hours=1))
+
+# 실시간 알림(SSE): 열린 연결은 이 간격(초)마다 keepalive 를 보내며 다른 프로세스의 변경(캐시 세대)을 확인한다.
+# WSGI 로 돌 때는 연결을 열어 두지 않고 EVENTS_POLL_RETRY 초마다 다시 연결하게 한다.
+EVENTS_HEARTBEAT = 15
+EVENTS_POLL_RETRY = 10
+
+# 삭제/재발급으로 반납된 팀코드를 새 팀에 다시 내주기까지의 기간(옛 코드로 엉뚱한 팀에 요청이 가지 않도록)
+JOIN_CODE_REUSE_AFTER = datetime.timedelta(days=30)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "submit.profile": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
@@ -15,12 +15,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from submit import views
+from submit.fileserve import serve_static
 from django.views.generic import RedirectView
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -31,6 +33,14 @@ urlpatterns = [
     path('accounts/logout/', views.logout_view, name='logout'),
     path('accounts/signup/', views.signup, name='signup'),
 
+    # 알림
+    path('notifications/', views.notification_list, name='notification_list'),
+    path('notifications/<int:notification_id>/open', views.notification_open, name='notification_open'),
+
+    # 실시간 알림(SSE)
+    path('events/memberships', views.membership_events, name='membership_events'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/events', views.assignment_events, name='assignment_events'),
+
     # 팀
     path('teams', views.teacher_team_list, name='teacher_team_list'),
     path('teams/create', views.create_team, name='create_team'),
@@ -49,12 +59,26 @@ urlpatterns = [
     path('teams/<int:team_id>/join', views.join_team, name='team_join'),
     path('teams/<int:team_id>/delete', views.team_delete, name='team_delete'),
     path("teams/<int:team_id>/edit", views.team_edit, name="team_edit"),
+    path("teams/<int:team_id>/cover", views.team_cover, name="team_cover"),
+    path("teams/<int:team_id>/cover/<str:variant>", views.team_cover, name="team_cover_variant"),
+    path("teams/<int:team_id>/gradebook", views.team_gradebook, name="team_gradebook"),
+    path("teams/<int:team_id>/gradebook/export", views.team_grades_export, name="team_grades_export"),
     
     #  과제: 생성/상세/제출/제출목록
     path('teams/<int:team_id>/assignments/create', views.assignment_create, name='assignment_create'),
     path('teams/<int:team_id>/assignments/<int:assignment_id>', views.assignment_detail, name='assignment_detail'),
     path('teams/<int:team_id>/assignments/<int:assignment_id>/submit', views.assignment_submit, name='assignment_submit'),
     path('teams/<int:team_id>/assignments/<int:assignment_id>/submissions', views.assignment_submissions, name='assignment_submissions'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/submissions/download', views.assignment_submissions_zip, name='assignment_submissions_zip'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/grades/export', views.assignment_grades_export, name='assignment_grades_export'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/grades/import', views.assignment_grades_import, name='assignment_grades_import'),
+
+    # 이어받기(청크) 업로드
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/uploads', views.upload_create, name='upload_create'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/uploads/commit', views.upload_commit, name='upload_commit'),
+    path('teams/<int:team_id>/assignments/<int:assignment_id>/uploads/<uuid:upload_id>', views.upload_session, name='upload_session'),
+    # 제출 접수증(접수 큐 사용 시 반영 상태 조회)
+    path('receipts/<uuid:receipt_id>', views.submission_receipt, name='submission_receipt'),
     path("teams/<int:team_id>/assignments/", views.assignment_list, name="assignment_list"),
 
 
@@ -67,7 +91,13 @@ urlpatterns = [
         views.assignment_close, name='assignment_close'),
     path('teams/<int:team_id>/assignments/<int:assignment_id>/reopen',
         views.assignment_reopen, name='assignment_reopen'),
+
+    # 파일 다운로드 (MEDIA 직접 노출 대신 권한 확인 후 전송)
+    path('files/<int:file_id>', views.submission_file_download, name='submission_file_download'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# 앞단 서버 없이 배포할 때 collectstatic 결과(압축본, 1년 캐시) 전송. 개발 서버(DEBUG)는 staticfiles 앱이 보낸다.
+if settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(r"^%s(?P<path>.+)$" % re.escape(settings.STATIC_URL.lstrip("/")), serve_static),
+    ]
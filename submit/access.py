@@ -0,0 +1,148 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.shortcuts import get_object_or_404
+
+from . import generations
+from .models import Assignment, Team, TeamMembership
+
+# =========================
+# 팀 접근 권한 해석기
+# =========================
+# 뷰마다 반복되던 Team 조회 → Assignment 조회 → 멤버십 exists() 를
+# - 요청 안에서는 한 번만(request 에 메모),
+# - 캐시에 멤버십이 있으면 Team(+Assignment) 한 번만,
+# - 없으면 멤버십까지 서브쿼리로 붙인 한 번의 쿼리로 끝낸다.
+#
+# 멤버십 캐시는 팀별 세대(generations 의 access 세대)로 무효화한다. 멤버십 저장/삭제, 팀 삭제 시 세대를 바꾸면
+# 그 팀의 (팀, 사용자) 항목은 모두 버려진다. 캐시가 프로세스별(LocMem)이면 다른 워커에는
+# ACCESS_CACHE_TIMEOUT 만큼 늦게 반영되므로, 여러 워커로 띄울 때는 공유 캐시를 설정한다.
+
+_MISSING = object()
+
+
+def _entry_key(team_id, user_id):
+    return f"access:m:{team_id}:{user_id}"
+
+
+def invalidate_team(team_id):
+    """팀 멤버십 캐시 무효화(세대 변경)"""
+    generations.bump("access", team_id)
+
+
+class TeamAccess:
+    """요청 사용자 기준 팀(+과제) 접근 정보"""
+    __slots__ = ("team", "assignment", "user_id", "status", "joined_at")
+
+    def __init__(self, team, assignment, user_id, status, joined_at):
+        self.team = team
+        self.assignment = assignment
+        self.user_id = user_id
+        self.status = status          # 멤버십 상태(PENDING/APPROVED/...) 또는 None
+        self.joined_at = joined_at
+
+    @property
+    def is_owner(self):
+        return self.user_id is not None and self.team.owner_id == self.user_id
+
+    @property
+    def is_member(self):
+        """승인된 멤버"""
+        return self.status == "APPROVED"
+
+    @property
+    def is_joined(self):
+        """승인 + 참가 완료 멤버"""
+        return self.is_member and self.joined_at is not None
+
+    @property
+    def can_view(self):
+        return self.is_owner or self.is_member
+
+
+def _cached_membership(team_id, user_id):
+    """(status, joined_at) 또는 _MISSING. 버전 키와 항목을 한 번에 읽는다."""
+    vkey, ekey = generations.key("access", team_id), _entry_key(team_id, user_id)
+    found = cache.get_many([vkey, ekey])
+    version, entry = found.get(vkey), found.get(ekey)
+    if version is None or entry is None or entry[0] != version:
+        return _MISSING, version
+    return (entry[1], entry[2]), version
+
+
+def _store_membership(team_id, user_id, version, status, joined_at):
+    if version is None:
+        # 세대가 아직 없으면 만든다(다른 요청이 먼저 만들었으면 그것을 따른다)
+        version = generations.current("access", [team_id])[team_id]
+    cache.set(
+        _entry_key(team_id, user_id), (version, status, joined_at),
+        getattr(settings, "ACCESS_CACHE_TIMEOUT", 60),
+    )
+
+
+def _membership_subqueries(team_ref, user_id):
+    mship = TeamMembership.objects.filter(team=OuterRef(team_ref), student_id=user_id)
+    return {
+        "_m_status": Subquery(mship.values("status")[:1]),
+        "_m_joined": Subquery(mship.values("joined_at")[:1]),
+    }
+
+
+def resolve(request, team_id, assignment_id=None):
+    """
+    팀(과제 포함 가능)과 요청 사용자의 멤버십을 한 번에 가져온다. 없으면 404.
+    같은 요청 안에서 다시 부르면 쿼리 없이 같은 객체를 돌려준다.
+    """
+    memo = request.__dict__.setdefault("_team_access", {})
+    key = (team_id, assignment_id)
+    if key in memo:
+        return memo[key]
+
+    user_id = request.user.id
+    cached, version = _cached_membership(team_id, user_id) if user_id else ((None, None), None)
+
+    if assignment_id is None:
+        qs = Team.objects.all()
+        if cached is _MISSING:
+            qs = qs.annotate(**_membership_subqueries("pk", user_id))
+        obj = get_object_or_404(qs, pk=team_id)
+        team, assignment = obj, None
+    else:
+        qs = Assignment.objects.select_related("team").filter(team_id=team_id)
+        if cached is _MISSING:
+            qs = qs.annotate(**_membership_subqueries("team_id", user_id))
+        obj = get_object_or_404(qs, pk=assignment_id)
+        team, assignment = obj.team, obj
+
+    if cached is _MISSING:
+        status, joined_at = obj._m_status, obj._m_joined
+        _store_membership(team_id, user_id, version, status, joined_at)
+    else:
+        status, joined_at = cached
+
+    access = memo[key] = TeamAccess(team, assignment, user_id, status, joined_at)
+    return access
+
+
+def of_team(request, team):
+    """이미 불러온 팀에 대한 멤버십만 확인(캐시 → 없으면 멤버십 한 번)"""
+    memo = request.__dict__.setdefault("_team_access", {})
+    key = (team.pk, None)
+    if key in memo:
+        return memo[key]
+
+    user_id = request.user.id
+    if not user_id or team.owner_id == user_id:
+        # 팀장은 멤버십과 무관하게 접근 가능
+        cached, version = (None, None), None
+    else:
+        cached, version = _cached_membership(team.pk, user_id)
+    if cached is _MISSING:
+        row = TeamMembership.objects.filter(team=team, student_id=user_id).values_list("status", "joined_at").first()
+        status, joined_at = row or (None, None)
+        _store_membership(team.pk, user_id, version, status, joined_at)
+    else:
+        status, joined_at = cached
+
+    access = memo[key] = TeamAccess(team, None, user_id, status, joined_at)
+    return access
@@ -3,7 +3,7 @@ from .models import (
     StudentProfile,
     Team, TeamMembership,
     Assignment, Submission, SubmissionFile, Grade,
-    Notification,
+    Notification, UploadSession, StoredBlob,
 )
 
 @admin.register(StudentProfile)
@@ -38,7 +38,18 @@ class SubmissionAdmin(admin.ModelAdmin):
 
 @admin.register(SubmissionFile)
 class SubmissionFileAdmin(admin.ModelAdmin):
-    list_display = ("id", "submission", "version", "size")
+    list_display = ("id", "submission", "version", "original_name", "size", "sha256")
+    search_fields = ("original_name", "sha256")
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "refcount", "created_at")
+    search_fields = ("sha256",)
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "assignment", "student", "filename", "received", "total_size", "updated_at")
+    search_fields = ("filename", "student__username")
 
 @admin.register(Grade)
 class GradeAdmin(admin.ModelAdmin):
@@ -0,0 +1,125 @@
+import functools
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from . import access, fragments, notifications
+from .models import Assignment, Submission
+
+# =========================
+# 조건부 GET(ETag / Last-Modified)
+# =========================
+# 팀/과제 화면은 새로 고침·뒤로 가기로 자주 다시 열리지만 대부분 그대로다. 뷰를 돌리기 전에 싼 값으로
+# 검증값을 만들어 브라우저가 가진 것(If-None-Match / If-Modified-Since)과 같으면 템플릿 없이 304 를 돌려준다.
+#   - 화면 내용: 팀/과제 updated_at + 캐시 세대(fragments.*_version), 관련 제출/채점의 최신 시각과 개수
+#   - 보는 사람: 사용자/역할, CSRF 비밀값(폼 토큰), 안 읽은 알림 수(배지). 남은 messages 가 있으면 항상 새로 그린다.
+#   - 쿼리 문자열(필터, 페이지 커서)
+#   - 권한이 없으면 검증값을 만들지 않는다 → 뷰가 그대로 403
+# 응답은 private, no-cache: 브라우저는 매번 확인만 하고(304), 공유 캐시에는 두지 않는다.
+
+
+def _submission_stamps(submissions):
+    s = submissions.aggregate(n=Count("id"), submitted=Max("submitted_at"), graded=Max("grade__graded_at"))
+    return [s["n"], s["submitted"], s["graded"]], [s["submitted"], s["graded"]]
+
+
+# ===== 화면별 검증값: (값 목록, Last-Modified 후보 시각들) | None(권한 없음) =====
+def team_page(request, team_id):
+    acc = access.resolve(request, team_id)
+    if not acc.can_view:
+        return None
+    team = acc.team
+    version = fragments.team_version(team, grades=acc.is_owner)
+    # 팀장 화면의 제출/채점 수는 grades 세대로 캐시하지만, 캐시가 프로세스마다 따로면(LocMem) 다른 워커의
+    # 세대 올림을 못 본다 → 세대와 별개로 DB 집계(팀 전체 제출)를 검증값에 넣는다
+    submissions = Submission.objects.filter(assignment__team=team)
+    if not acc.is_owner:
+        submissions = submissions.filter(student=request.user)
+    parts, stamps = _submission_stamps(submissions)
+    return [acc.is_owner, version, *parts], [team.updated_at, *stamps]
+
+
+def assignment_page(request, team_id, assignment_id):
+    acc = access.resolve(request, team_id, assignment_id)
+    if not (acc.is_owner or acc.is_joined):
+        return None
+    team, a = acc.team, acc.assignment
+    # 학생 화면은 내 제출/채점, 그리고 마감 시각이 지났는지(수정 가능 여부)에 따라 달라진다
+    parts, stamps = [], []
+    if not acc.is_owner:
+        parts, stamps = _submission_stamps(Submission.objects.filter(assignment=a, student=request.user))
+        parts.append(bool(a.due_at and timezone.now() > a.due_at))
+    return [acc.is_owner, fragments.assignment_version(team, a), *parts], [team.updated_at, a.updated_at, *stamps]
+
+
+def assignment_list_page(request, team_id):
+    acc = access.resolve(request, team_id)
+    if not (acc.is_owner or acc.is_joined):
+        return None
+    team = acc.team
+    s = Assignment.objects.filter(team=team).aggregate(n=Count("id"), updated=Max("updated_at"))
+    return [acc.is_owner, fragments.team_version(team), s["n"], s["updated"]], [team.updated_at, s["updated"]]
+
+
+def submissions_page(request, team_id, assignment_id):
+    acc = access.resolve(request, team_id, assignment_id)
+    if not acc.is_owner:
+        return None
+    team, a = acc.team, acc.assignment
+    parts, stamps = _submission_stamps(Submission.objects.filter(assignment=a))
+    return [fragments.assignment_version(team, a), *parts], [team.updated_at, a.updated_at, *stamps]
+
+
+# ===== 데코레이터 =====
+def _validators(request, validator, kwargs):
+    """(ETag, Last-Modified) | None. condition() 이 두 번 부르므로 요청에 한 번만 만든다."""
+    memo = request.__dict__.setdefault("_page_validators", {})
+    if validator not in memo:
+        memo[validator] = None
+        if request.method in ("GET", "HEAD") and not len(get_messages(request)):
+            found = validator(request, **kwargs)
+            if found is not None:
+                parts, stamps = found
+                user_id = request.user.pk
+                get_token(request)  # 첫 방문이면 여기서 CSRF 비밀값을 정한다(그려진 폼과 같은 값)
+                parts = [
+                    user_id, request.GET.urlencode(), *parts,  # 쿼리: 필터/페이지(pagination)
+                    request.META["CSRF_COOKIE"], notifications.unread_count(user_id),
+                ]
+                stamps = [s for s in stamps if s]
+                memo[validator] = (
+                    hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest(),
+                    max(stamps) if stamps else None,
+                )
+    return memo[validator]
+
+
+def conditional_page(validator):
+    """
+    @login_required 아래에 둔다. validator(request, **kwargs) 는 위 화면별 함수.
+    같으면 304(뷰를 부르지 않음), 다르면 뷰를 그리고 ETag/Last-Modified 를 붙인다.
+    """
+    def etag_func(request, *args, **kwargs):
+        found = _validators(request, validator, kwargs)
+        return found and found[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        found = _validators(request, validator, kwargs)
+        return found and found[1]
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @functools.wraps(view)
+        def _wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.has_header("ETag"):
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return _wrapped
+    return decorator
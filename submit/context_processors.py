@@ -0,0 +1,9 @@
+from . import notifications
+
+
+def unread_notifications(request):
+    """base.html 알림 배지. 템플릿이 실제로 쓸 때만 캐시 카운터를 읽는다(로그인 전에는 0)."""
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return {"unread_notifications": 0}
+    return {"unread_notifications": lambda: notifications.unread_count(user.id)}
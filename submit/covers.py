@@ -0,0 +1,192 @@
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.urls import reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# =========================
+# 팀 대표 이미지 변형(썸네일)
+# =========================
+# 원본은 Team.cover 에 그대로 두고, 올릴 때(create_team/team_edit) 폭별 WebP/JPEG 변형을 만들어
+# Team.cover_variants 에 이름·크기를 남긴다. 팀 카드는 <picture srcset> 으로 화면 폭에 맞는 것만 받는다.
+#   {"source": 원본 이름, "width": W, "height": H,
+#    "items": [{"key": "320w.webp", "name": 저장 이름, "width": 320, "height": 180, "format": "webp"}, ...]}
+# 변형은 원본 업로드마다 새 이름으로 저장되므로(내용 해시) 오래 캐시해도 되고, 대표 이미지를 바꾸면
+# 이전 변형은 커밋 후 지운다. 이 모듈을 거치지 않고 cover 만 바뀐 팀(관리자 화면 등)은 source 가 달라
+# 원본을 그대로 보여 준다(build_cover_variants 로 다시 만든다).
+
+# 카드 폭(모바일 한 칸 ~ 데스크톱 세 칸) × 1~2배 화면
+WIDTHS = (320, 640, 960)
+FORMATS = (
+    # (형식, 확장자, 저장 옵션)
+    ("webp", "webp", {"quality": 80, "method": 4}),
+    ("jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+VARIANT_DIR = "team_covers/variants"
+# 원본으로 받는 형식(브라우저가 그대로 보여 주는 래스터 이미지) → (저장 확장자, Content-Type).
+# 원본은 팀 화면과 같은 출처에서 보내므로 HTML/SVG 같은 활성 콘텐츠는 받지 않는다.
+ACCEPTED = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "GIF": ("gif", "image/gif"),
+    "WEBP": ("webp", "image/webp"),
+}
+
+
+class InvalidCover(ValueError):
+    pass
+
+
+def _widths(original):
+    # 원본보다 크게 늘리지 않는다(원본이 더 작으면 원본 폭이 가장 큰 변형)
+    widths = [w for w in WIDTHS if w < original]
+    if original <= WIDTHS[-1]:
+        widths.append(original)
+    return widths
+
+
+def _encode(image, fmt, options):
+    if fmt == "jpeg" and image.mode != "RGB":
+        # 투명 배경은 흰색으로
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+        image = background
+    buf = io.BytesIO()
+    image.save(buf, fmt.upper(), **options)
+    return buf.getvalue()
+
+
+def build(upload, storage):
+    """
+    업로드된 이미지(파일 객체)로 변형을 만들어 storage 에 저장하고 cover_variants 값(source 제외)을 돌려준다.
+    이미지로 열 수 없으면 {} (원본만 쓴다).
+    """
+    upload.seek(0)
+    digest = hashlib.sha256(upload.read()).hexdigest()[:16]
+    upload.seek(0)
+    try:
+        with Image.open(upload) as opened:
+            opened.draft("RGB", (max(WIDTHS), max(WIDTHS)))  # JPEG 는 디코딩부터 줄여서
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return {}
+    finally:
+        upload.seek(0)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    width, height = image.size
+    items = []
+    for w in _widths(width):
+        h = max(1, round(height * w / width))
+        resized = image if w == width else image.resize((w, h), Image.LANCZOS)
+        for fmt, ext, options in FORMATS:
+            key = f"{w}w.{ext}"
+            name = storage.save(f"{VARIANT_DIR}/{digest}-{key}", ContentFile(_encode(resized, fmt, options)))
+            items.append({"key": key, "name": name, "width": w, "height": h, "format": fmt})
+    return {"width": width, "height": height, "items": items}
+
+
+def identify(upload):
+    """Pillow 가 알아보는 ACCEPTED 형식이면 그 이름(JPEG 등), 아니면 None. 파일 이름·Content-Type 은 보지 않는다."""
+    upload.seek(0)
+    try:
+        with Image.open(upload) as opened:
+            fmt = opened.format
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return None
+    finally:
+        upload.seek(0)
+    return fmt if fmt in ACCEPTED else None
+
+
+def content_type(name):
+    """저장된 원본을 보낼 Content-Type. 이미지 확장자가 아니면(검사 이전에 올라온 파일) None"""
+    ext = os.path.splitext(str(name))[1].lower().lstrip(".")
+    types = dict(ACCEPTED.values())
+    types["jpeg"] = types["jpg"]
+    return types.get(ext)
+
+
+def attach(team, upload):
+    """
+    team.cover 를 upload 로 바꾸고 변형을 만든다(team.save() 는 부르는 쪽에서).
+    이미지가 아니면 InvalidCover(아무것도 저장하지 않음).
+    반환: 지워야 할 이전 변형 이름들 → team.save() 뒤 discard_on_commit(...) 에 넘긴다.
+    """
+    fmt = identify(upload)
+    if fmt is None:
+        raise InvalidCover("대표 이미지는 JPEG, PNG, GIF, WebP 파일만 올릴 수 있습니다.")
+    stale = names(team.cover_variants)
+    variants = build(upload, team.cover.storage)
+    # 원본을 먼저 저장해 이름을 정한다(save() 때 다시 저장하지 않음). 확장자는 실제 형식으로 → 보낼 때 Content-Type
+    stem = os.path.splitext(os.path.basename(upload.name or ""))[0] or "cover"
+    team.cover.save(f"{stem}.{ACCEPTED[fmt][0]}", upload, save=False)
+    team.cover_variants = {**variants, "source": team.cover.name} if variants else {}
+    return stale
+
+
+def names(variants):
+    return [item["name"] for item in (variants or {}).get("items", ())]
+
+
+def discard_on_commit(storage, stale):
+    if not stale:
+        return
+
+    def _delete():
+        for name in stale:
+            storage.delete(name)
+    transaction.on_commit(_delete)
+
+
+def current(cover_name, variants):
+    """지금 원본에 맞는 변형 목록(없거나 다른 원본의 것이면 [])"""
+    if not cover_name or not variants or variants.get("source") != str(cover_name):
+        return []
+    return variants.get("items", [])
+
+
+def find(team, key):
+    for item in current(team.cover.name, team.cover_variants):
+        if item["key"] == key:
+            return item
+    return None
+
+
+def picture(team_id, cover_name, variants):
+    """
+    템플릿용 <picture> 값: {"webp": srcset, "jpeg": srcset, "src": 기본 JPEG URL, "width", "height"}
+    변형이 없으면 None(원본 URL 로 보여 준다).
+    """
+    items = current(cover_name, variants)
+    if not items:
+        return None
+
+    def url(item):
+        return reverse("team_cover_variant", kwargs={"team_id": team_id, "variant": item["key"]})
+
+    srcsets = {
+        fmt: ", ".join(f"{url(i)} {i['width']}w" for i in items if i["format"] == fmt)
+        for fmt, _, _ in FORMATS
+    }
+    jpegs = [i for i in items if i["format"] == "jpeg"]
+    # 기본 src/크기는 카드 폭에 맞는 중간 것(srcset 을 모르는 브라우저용, width/height 로 자리 미리 잡기)
+    default = jpegs[min(1, len(jpegs) - 1)]
+    return {**srcsets, "src": url(default), "width": default["width"], "height": default["height"]}
+
+
+def rebuild(team):
+    """저장된 원본으로 변형을 다시 만든다(build_cover_variants). 반환: 만든 변형 수"""
+    stale = names(team.cover_variants)
+    storage = team.cover.storage
+    with storage.open(team.cover.name, "rb") as fh:
+        variants = build(fh, storage)
+    team.cover_variants = {**variants, "source": team.cover.name} if variants else {}
+    team.save(update_fields=["cover_variants", "updated_at"])  # 팀 세대 → 팀 카드 캐시도 새로
+    discard_on_commit(storage, stale)
+    return len(team.cover_variants.get("items", ()))
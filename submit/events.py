@@ -0,0 +1,160 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+# =========================
+# 실시간 알림(SSE)용 프로세스 안 발행/구독
+# =========================
+# 모델 저장(커밋 후) → publish(채널, 데이터) → 그 채널을 구독 중인 SSE 연결마다 큐에 넣는다.
+# 연결은 이벤트 루프에서 큐만 기다리므로 열려 있는 동안 스레드/DB 연결을 잡지 않는다(ASGI 에서만 계속 연결).
+#
+# 발행은 같은 프로세스 안에서만 전달된다. 다른 프로세스(워커 여러 개, ingest_worker 등)에서 바뀐 것은
+# 하트비트마다 캐시 세대(generations) 값을 비교해 바뀌었으면 전체 상태를 다시 보내는 것으로 따라잡는다
+# (공유 캐시를 쓰면 하트비트 간격 안에 반영).
+#
+# 채널
+#   memberships:{user_id}   학생의 참가 요청 상태          (TeamMembership.save)
+#   assignment:{id}         과제의 제출/채점 수            (Submission.save, 일괄 채점/접수 반영)
+
+# 느린 연결의 큐가 이만큼 차면 가장 오래된 것을 버린다(이벤트마다 최신 상태 전체를 보내므로 잃는 것이 없다)
+QUEUE_SIZE = 16
+
+_lock = threading.Lock()
+_subscribers = defaultdict(set)
+
+
+def membership_channel(user_id):
+    return f"memberships:{user_id}"
+
+
+def assignment_channel(assignment_id):
+    return f"assignment:{assignment_id}"
+
+
+class Subscription:
+    """이벤트 루프 안에서 with 로 연다. 닫으면 구독이 풀린다."""
+
+    def __init__(self, *channels):
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def __enter__(self):
+        with _lock:
+            for channel in self.channels:
+                _subscribers[channel].add(self)
+        return self
+
+    def __exit__(self, *exc):
+        with _lock:
+            for channel in self.channels:
+                subs = _subscribers.get(channel)
+                if subs is not None:
+                    subs.discard(self)
+                    if not subs:
+                        del _subscribers[channel]
+
+    def _offer(self, item):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+    async def get(self, timeout):
+        """(채널, 데이터). timeout 안에 없으면 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def has_subscribers(channel):
+    return channel in _subscribers
+
+
+def publish(channel, data):
+    """어느 스레드에서 불러도 된다(구독자의 이벤트 루프로 넘긴다)."""
+    with _lock:
+        subs = list(_subscribers.get(channel, ()))
+    for sub in subs:
+        try:
+            sub.loop.call_soon_threadsafe(sub._offer, (channel, data))
+        except RuntimeError:
+            # 루프가 이미 닫힘(종료 중) → 구독도 곧 풀린다
+            pass
+
+
+def publish_on_commit(channel, build):
+    """커밋 후, 구독자가 있을 때만 build() 로 데이터를 만들어 발행(구독자가 없으면 쿼리도 없다)."""
+    def _send():
+        if has_subscribers(channel):
+            publish(channel, build())
+    transaction.on_commit(_send)
+
+
+# ===== 채널별 데이터 =====
+def membership_data(m):
+    return {"id": m.pk, "team": m.team_id, "status": m.status, "status_label": m.get_status_display()}
+
+
+def membership_changed(m):
+    publish_on_commit(membership_channel(m.student_id), lambda: membership_data(m))
+
+
+def _counts_query(assignment_id):
+    from .models import Submission
+    return Submission.objects.filter(assignment_id=assignment_id), {
+        "submitted": Count("id", filter=~Q(status="not_submitted")),
+        "graded": Count("id", filter=Q(status="graded")),
+    }
+
+
+def submission_counts(assignment_id):
+    qs, aggregates = _counts_query(assignment_id)
+    return qs.aggregate(**aggregates)
+
+
+async def asubmission_counts(assignment_id):
+    qs, aggregates = _counts_query(assignment_id)
+    return await qs.aaggregate(**aggregates)
+
+
+def submissions_changed(assignment_id):
+    publish_on_commit(assignment_channel(assignment_id), lambda: submission_counts(assignment_id))
+
+
+# ===== SSE 스트림 =====
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode()
+
+
+async def stream(channel, event, snapshot, version, live, update_event=None):
+    """
+    처음에 snapshot() 을 보내고, 이후 채널 이벤트를 update_event(없으면 event) 로 보낸다.
+    - 하트비트(EVENTS_HEARTBEAT 초)마다 version() 이 바뀌었으면 snapshot() 을 다시 보낸다(다른 프로세스의 변경).
+    - live 가 아니면(WSGI: 응답을 끝까지 모은 뒤 보냄) 한 번만 보내고 EventSource 가 retry 간격으로 다시 연결하게 한다.
+    """
+    heartbeat = getattr(settings, "EVENTS_HEARTBEAT", 15)
+    # 스냅샷 전에 구독 → 그 사이 바뀐 것도 놓치지 않는다
+    with Subscription(channel) as sub:
+        current = version()
+        yield sse(event, await snapshot())
+        if not live:
+            yield f"retry: {int(getattr(settings, 'EVENTS_POLL_RETRY', 10) * 1000)}\n\n".encode()
+            return
+        while True:
+            item = await sub.get(heartbeat)
+            if item is not None:
+                current = version()
+                yield sse(update_event or event, item[1])
+                continue
+            latest = version()
+            if latest != current:
+                current = latest
+                yield sse(event, await snapshot())
+            else:
+                yield b": keepalive\n\n"
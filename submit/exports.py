@@ -0,0 +1,167 @@
+import csv
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+from .models import Submission
+from .streaming import IterReader, zip_stream
+
+# =========================
+# 성적 내보내기 (CSV / XLSX 스트리밍)
+# =========================
+# 행은 values_list().iterator(chunk_size) 로 읽고 바로 직렬화해서 내보낸다.
+# 전체 결과를 메모리에 올리지 않으므로 수강생 수와 무관하게 메모리가 일정하고, 첫 바이트가 바로 나간다.
+
+HEADER = ("학번", "이름", "아이디", "과제", "상태", "제출일시", "점수", "만점", "피드백")
+STATUS_LABELS = dict(Submission.STATUS)
+ROWS_PER_CHUNK = 500
+
+# 수식 주입 방지(CSV/XLSX injection): 스프레드시트가 수식으로 읽는 글자로 시작하는 문자열 칸은 앞에 ' 를 붙인다.
+# 이름/과제 제목/피드백은 학생·교수가 입력한 값 그대로라 "=HYPERLINK(...)" 같은 값이 들어올 수 있다.
+# 성적 일괄 입력(gradeimport.parse)은 unescape_formula 로 되돌리므로 내보낸 파일을 고쳐 올려도 값이 그대로다.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_formula(value):
+    # 원래 ' 로 시작하던 값도 한 번 더 감싸야 unescape_formula 가 원래 값을 돌려준다
+    if isinstance(value, str) and value.lstrip("'").startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_formula(value):
+    if value.startswith("'") and value.lstrip("'").startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def grade_rows(submissions, chunk_size=2000):
+    """Submission queryset → HEADER 순서의 튜플"""
+    for number, first_name, username, title, status, submitted_at, score, max_score, feedback in (
+        submissions
+        .order_by("assignment__due_at", "assignment_id", "student__studentprofile__student_id", "student__username")
+        .values_list(
+            "student__studentprofile__student_id", "student__first_name", "student__username",
+            "assignment__title", "status", "submitted_at", "grade__score", "assignment__max_score",
+            "grade__feedback_text",
+        )
+        .iterator(chunk_size=chunk_size)
+    ):
+        yield (
+            number or "",
+            first_name or username,
+            username,
+            title,
+            STATUS_LABELS.get(status, status),
+            timezone.localtime(submitted_at).strftime("%Y-%m-%d %H:%M") if submitted_at else "",
+            score,
+            max_score,
+            feedback or "",
+        )
+
+
+# ---------- CSV ----------
+class _Echo:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 가짜 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    writer = csv.writer(_Echo())
+    # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM
+    yield "\ufeff" + writer.writerow(HEADER)
+    batch = []
+    for row in rows:
+        batch.append(writer.writerow(["" if v is None else escape_formula(v) for v in row]))
+        if len(batch) >= ROWS_PER_CHUNK:
+            yield "".join(batch)
+            batch.clear()
+    if batch:
+        yield "".join(batch)
+
+
+# ---------- XLSX ----------
+# 최소 구성의 OOXML 통합 문서(시트 1개, inline 문자열). 시트 XML 은 generator 로 만들어 ZIP 에 바로 흘려보낸다.
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _cell(value):
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_ILLEGAL_XML.sub("", escape_formula(str(value))))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _sheet_xml(rows):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        "<row>" + "".join(_cell(v) for v in HEADER) + "</row>"
+    ).encode()
+    batch = []
+    for row in rows:
+        batch.append("<row>" + "".join(_cell(v) for v in row) + "</row>")
+        if len(batch) >= ROWS_PER_CHUNK:
+            yield "".join(batch).encode()
+            batch.clear()
+    batch.append("</sheetData></worksheet>")
+    yield "".join(batch).encode()
+
+
+def _static(text):
+    return lambda: IterReader([text.encode()])
+
+
+def xlsx_stream(rows, sheet_name="성적"):
+    # 시트 이름: 31자, []:*?/\ 불가
+    sheet_name = escape(re.sub(r"[\[\]:*?/\\]", "_", sheet_name)[:31] or "성적", {'"': "&quot;"})
+    stamp = timezone.localtime().timetuple()[:6]
+    entries = [
+        ("[Content_Types].xml", _static(_CONTENT_TYPES), stamp),
+        ("_rels/.rels", _static(_ROOT_RELS), stamp),
+        ("xl/workbook.xml", _static(_WORKBOOK.format(name=sheet_name)), stamp),
+        ("xl/_rels/workbook.xml.rels", _static(_WORKBOOK_RELS), stamp),
+        ("xl/worksheets/sheet1.xml", lambda: IterReader(_sheet_xml(rows)), stamp),
+    ]
+    return zip_stream(entries, compression=zipfile.ZIP_DEFLATED)
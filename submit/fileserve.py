@@ -0,0 +1,200 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+from .streaming import CHUNK_SIZE, is_asgi
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header, size):
+    """단일 구간 Range 만 지원. 반환: (start, end) | None(무시하고 전체 전송) | False(범위 밖 → 416)"""
+    m = _RANGE_RE.match(header.strip())
+    if not m or m.group(1) == m.group(2) == "":
+        return None
+    if m.group(1) == "":
+        # bytes=-500 → 마지막 500바이트
+        length = int(m.group(2))
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(m.group(1))
+    end = int(m.group(2)) if m.group(2) else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == etag
+    # RFC 9110 13.1.5: 날짜는 Last-Modified 와 정확히 같을 때만 일치(이전/이후 날짜는 전체 응답)
+    since = parse_http_date_safe(value)
+    return since is not None and int(mtime) == since
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            block = fh.read(min(CHUNK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+async def _aread_range(path, start, length):
+    """_read_range 의 async 판: 디스크 읽기만 스레드 풀에서 하고, 보내는 동안에는 스레드를 잡지 않는다."""
+    fh = await sync_to_async(open, thread_sensitive=False)(path, "rb")
+    read = sync_to_async(fh.read, thread_sensitive=False)
+    try:
+        await sync_to_async(fh.seek, thread_sensitive=False)(start)
+        while length > 0:
+            block = await read(min(CHUNK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        fh.close()
+
+
+def serve_file(request, fieldfile, filename=None, as_attachment=True, max_age=0, content_type=None):
+    """
+    권한 체크를 마친 뒤 호출하는 파일 전송. content_type 을 주지 않으면 filename 확장자로 정한다.
+    - SENDFILE_BACKEND="nginx"  → X-Accel-Redirect (프런트 서버가 전송, Range/캐시도 처리)
+    - SENDFILE_BACKEND="apache" → X-Sendfile
+    - 그 외                     → FileResponse(wsgi.file_wrapper → sendfile) + Range/조건부 요청 직접 처리
+                                   (ASGI 에서는 async iterator 로 조각씩 — 느린 클라이언트가 스레드를 잡지 않는다)
+    """
+    name = fieldfile.name
+    path = fieldfile.storage.path(name)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    filename = filename or os.path.basename(name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    etag = quote_etag(f"{int(st.st_mtime):x}-{st.st_size:x}")
+
+    # If-None-Match / If-Modified-Since → 304, If-Match 등 불일치 → 412
+    response = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if response is None:
+        backend = getattr(settings, "SENDFILE_BACKEND", "")
+        if backend == "nginx":
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = settings.SENDFILE_URL.rstrip("/") + "/" + quote(name)
+        elif backend == "apache":
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = path
+        else:
+            response = _local_response(request, path, st.st_size, content_type, etag, st.st_mtime)
+        response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(st.st_mtime)
+    patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+def _local_response(request, path, size, content_type, etag, mtime):
+    byte_range = None
+    header = request.headers.get("Range")
+    if header and _if_range_matches(request, etag, mtime):
+        byte_range = _parse_range(header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None and not is_asgi(request):
+        # 전체 전송은 FileResponse → WSGI 서버의 file_wrapper(sendfile)로 커널이 바로 복사
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range or (0, size - 1)
+        read = _aread_range if is_asgi(request) else _read_range
+        response = StreamingHttpResponse(
+            read(path, start, end - start + 1), status=206 if byte_range else 200, content_type=content_type,
+        )
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+# ===== 정적 파일(collectstatic 결과) =====
+# 앞단 서버(nginx 등)가 /static/ 을 맡지 않는 배포에서만 쓴다(SERVE_STATIC). 미리 만든 .br/.gz 를 Accept-Encoding 에 맞춰
+# 그대로 보내고, 해시 이름(ManifestStaticFilesStorage)은 내용이 바뀌면 이름도 바뀌므로 1년 immutable 로 캐시시킨다.
+_HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        q = params.strip().replace(" ", "")
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue  # q=0 → 받지 않음
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve_static(request, path):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    try:
+        full = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("파일을 찾을 수 없습니다.")
+    content_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+
+    accepted = _accepted_encodings(request)
+    chosen, encoding = full, None
+    for coding, ext in _PRECOMPRESSED:
+        if coding in accepted and os.path.isfile(full + ext):
+            chosen, encoding = full + ext, coding
+            break
+    try:
+        st = os.stat(chosen)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("파일을 찾을 수 없습니다.")
+    if not os.path.isfile(chosen):
+        raise Http404("파일을 찾을 수 없습니다.")
+
+    # 표현(압축 방식)마다 다른 ETag
+    etag = quote_etag(f"{int(st.st_mtime):x}-{st.st_size:x}" + (f"-{encoding}" if encoding else ""))
+    response = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if response is None:
+        response = _local_response(request, chosen, st.st_size, content_type, etag, st.st_mtime)
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(st.st_mtime)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    if _HASHED_NAME_RE.search(path):
+        patch_cache_control(response, public=True, max_age=settings.STATIC_MAX_AGE, immutable=True)
+    else:
+        # 해시 없는 이름(직접 적은 경로)은 매번 ETag 로 확인
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
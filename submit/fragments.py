@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template import Context
+from django.template.loader import get_template, render_to_string
+from django.template.loader_tags import BlockNode
+from django.utils.safestring import mark_safe
+
+from . import generations
+
+# =========================
+# 템플릿 조각 캐시
+# =========================
+# 여러 사용자가 똑같이 보는 부분(팀의 과제 목록, 과제 머리글)은 한 번 그린 HTML 을 캐시에 두고,
+# 사용자마다 다른 부분(내 제출 상태 등)만 요청마다 그려서 끼워 넣는다.
+#
+# 키 = 조각 이름 + 버전. 버전은 updated_at 과 팀 세대(generations, 다른 캐시와 같은 도우미)로 만들므로
+# 팀/과제 저장, 과제 마감·해제, 멤버 변경 시 키가 바뀌어 예전 조각은 그대로 만료된다(직접 지우지 않음).
+# 팀장 화면처럼 제출/채점 수를 보여 주는 조각은 grades 세대도 버전에 넣는다.
+
+
+def _stamp(dt):
+    return f"{dt.timestamp():.6f}" if dt else "0"
+
+
+def team_version(team, grades=False):
+    version = f"{team.pk}.{_stamp(team.updated_at)}.{generations.current('team', [team.pk])[team.pk]}"
+    if grades:
+        version += f".{generations.current('grades', [team.pk])[team.pk]}"
+    return version
+
+
+def assignment_version(team, assignment):
+    return f"{team_version(team)}.{assignment.pk}.{_stamp(assignment.updated_at)}"
+
+
+def get_or_render(name, version, render):
+    """캐시에 있으면 그대로, 없으면 render() 결과를 저장해서 돌려준다."""
+    key = f"frag:{name}:{version}"
+    value = cache.get(key)
+    if value is None:
+        value = render()
+        cache.set(key, value, getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 600))
+    return value
+
+
+def render(template_name, context):
+    return mark_safe(render_to_string(template_name, context))
+
+
+def render_rows(template_name, context, items, name="item"):
+    """
+    템플릿의 {% block %} 들을 항목마다 따로 그려 [(pk, {블록 이름: HTML}), ...] 로 돌려준다.
+    블록마다 온전한 HTML 이므로, 사용자별 내용은 페이지 템플릿에서 블록 사이에 그려 넣는다.
+    """
+    template = get_template(template_name).template
+    blocks = template.nodelist.get_nodes_by_type(BlockNode)
+    ctx = Context(context, autoescape=template.engine.autoescape)
+    rows = []
+    with ctx.bind_template(template):
+        for item in items:
+            with ctx.push({name: item}):
+                rows.append((item.pk, {block.name: mark_safe(block.render(ctx)) for block in blocks}))
+    return rows
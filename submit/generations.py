@@ -0,0 +1,55 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+# =========================
+# 캐시 세대(generation) 카운터
+# =========================
+# 화면 캐시를 직접 지우지 않고, 키에 섞어 쓰는 "세대" 값만 바꾼다.
+#   team:{id}   팀 정보/과제/멤버 수가 바뀔 때 (Team, Assignment, TeamMembership 저장·삭제)
+#   user:{id}   사용자가 보는 팀 목록 자체가 바뀔 때 (팀 생성, 멤버십 변경)
+#   grades:{id} 팀의 제출/채점이 바뀔 때 (팀장 화면의 제출·채점 수). 학생이 제출할 때마다 바뀌므로
+#                멤버 화면 캐시까지 버리지 않도록 team 과 나눠 둔다.
+#   access:{id} 팀 멤버십 캐시(access.invalidate_team). 과제 저장으로는 바뀌지 않도록 team 과 나눠 둔다.
+# 세대 값은 만료 없이 두고, 없으면 새로 만든다(캐시가 비워지면 모든 화면 캐시가 자연스럽게 무효).
+# 커밋 전(같은 요청)과 커밋 후(다른 요청이 커밋 전 값으로 다시 채우는 경합) 두 번 바꾼다.
+
+
+def key(scope, pk):
+    """세대 값의 캐시 키 — 항목과 세대를 get_many 한 번에 읽을 때 쓴다"""
+    return f"gen:{scope}:{pk}"
+
+
+def bump(scope, pk):
+    cache_key = key(scope, pk)
+
+    def _bump():
+        cache.set(cache_key, uuid.uuid4().hex, None)
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def bump_team(team_id):
+    bump("team", team_id)
+
+
+def bump_user(user_id):
+    bump("user", user_id)
+
+
+def bump_grades(team_id):
+    bump("grades", team_id)
+
+
+def current(scope, ids):
+    """{id: 세대}. 캐시 왕복 한 번(없던 값을 만들 때만 한 번 더)."""
+    keys = {key(scope, pk): pk for pk in ids}
+    found = cache.get_many(keys)
+    missing = [k for k in keys if k not in found]
+    if missing:
+        for k in missing:
+            # 동시에 만들면 먼저 넣은 값을 따른다
+            cache.add(k, uuid.uuid4().hex, None)
+        found.update(cache.get_many(missing))
+    return {keys[k]: value for k, value in found.items()}
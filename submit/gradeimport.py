@@ -0,0 +1,250 @@
+import csv
+import io
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import events, generations, notifications
+from .exports import unescape_formula
+from .gradebook import student_label
+from .models import Grade, Submission, TeamMembership
+
+# =========================
+# 성적 일괄 입력 (CSV / 붙여넣은 표)
+# =========================
+# 1) parse  : 텍스트 → (줄 번호, 학번/아이디, 점수, 피드백) 목록
+# 2) plan   : 승인 멤버·기존 성적과 비교해 신규/변경/동일/오류로 나눈다(쿼리 2번, 쓰기 없음 → 미리보기)
+# 3) apply  : 한 트랜잭션 안에서 Submission bulk_create(없는 학생) + Grade bulk_create/bulk_update
+#             + 상태 UPDATE 한 번. 행 수와 무관하게 쿼리 수가 일정하다.
+# 확인(적용) 시에는 같은 텍스트로 트랜잭션 안에서 plan 을 다시 만든다 → 미리보기 이후 바뀐 성적을 기준으로 다시 판정.
+
+MAX_BYTES = 1024 * 1024
+
+# 헤더 이름 → 역할. 성적 내보내기(exports.HEADER) 파일을 고쳐서 그대로 올려도 읽히도록 같은 이름을 쓴다.
+_KEY_COLUMNS = ("학번", "student_id", "아이디", "username")
+_SCORE_COLUMNS = ("점수", "score")
+_FEEDBACK_COLUMNS = ("피드백", "feedback", "feedback_text")
+
+CREATE, UPDATE, SAME = "create", "update", "same"
+KIND_LABELS = {CREATE: "신규", UPDATE: "변경", SAME: "동일"}
+
+
+class GradeImportError(ValueError):
+    """파일 전체를 읽을 수 없음(인코딩, 크기, 열 구성 등)"""
+
+
+class Row:
+    __slots__ = ("line", "keys", "score", "feedback")
+
+    def __init__(self, line, keys, score, feedback):
+        self.line = line          # 원본 줄 번호(1부터)
+        self.keys = keys          # 학생을 찾을 값들(학번, 아이디 순)
+        self.score = score        # 점수 문자열
+        self.feedback = feedback  # None 이면 피드백 열 없음 → 기존 피드백 유지
+
+
+class Change:
+    __slots__ = ("line", "kind", "student_id", "label", "submission_id", "grade_id",
+                 "old_score", "old_feedback", "score", "feedback")
+
+    def __init__(self, line, kind, student_id, label, submission_id, grade_id,
+                 old_score, old_feedback, score, feedback):
+        self.line = line
+        self.kind = kind
+        self.student_id = student_id
+        self.label = label
+        self.submission_id = submission_id  # None 이면 제출 기록부터 만든다
+        self.grade_id = grade_id
+        self.old_score = old_score
+        self.old_feedback = old_feedback
+        self.score = score
+        self.feedback = feedback
+
+    @property
+    def kind_label(self):
+        return KIND_LABELS[self.kind]
+
+    @property
+    def feedback_changed(self):
+        return self.feedback != (self.old_feedback or "")
+
+
+class Plan:
+    def __init__(self, changes, errors):
+        self.changes = changes  # [Change, ...] (줄 순서)
+        self.errors = errors    # [(줄 번호, 메시지), ...]
+
+    def count(self, kind):
+        return sum(1 for c in self.changes if c.kind == kind)
+
+    @property
+    def created(self):
+        return self.count(CREATE)
+
+    @property
+    def updated(self):
+        return self.count(UPDATE)
+
+    @property
+    def unchanged(self):
+        return self.count(SAME)
+
+    @property
+    def pending(self):
+        return [c for c in self.changes if c.kind != SAME]
+
+
+# ---------- 1) 읽기 ----------
+def decode(upload):
+    """업로드 파일 → 문자열. 엑셀이 저장한 CSV(cp949)도 읽는다."""
+    if upload.size > MAX_BYTES:
+        raise GradeImportError("파일이 너무 큽니다(최대 1MB).")
+    raw = upload.read()
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise GradeImportError("파일 인코딩을 읽을 수 없습니다(UTF-8 또는 CP949).")
+
+
+def _find(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
+
+
+def _cell(cells, index):
+    # 내보내기 파일에서 수식 방지용으로 붙인 ' 는 떼어 낸다(exports.escape_formula)
+    return unescape_formula(cells[index].strip()) if index is not None and index < len(cells) else ""
+
+
+def parse(text):
+    text = text.lstrip("\ufeff")
+    if len(text.encode()) > MAX_BYTES:
+        raise GradeImportError("입력이 너무 깁니다(최대 1MB).")
+    lines = text.splitlines()
+    first = next((line for line in lines if line.strip()), "")
+    if not first:
+        raise GradeImportError("입력이 비어 있습니다.")
+    # 엑셀에서 복사한 표는 탭, CSV 파일은 쉼표(또는 세미콜론)
+    delimiter = "\t" if "\t" in first else (";" if first.count(";") > first.count(",") else ",")
+
+    reader = csv.reader(io.StringIO("\n".join(lines)), delimiter=delimiter)
+    header = [cell.strip().lower() for cell in next(reader)]
+    score_col = _find(header, _SCORE_COLUMNS)
+    if score_col is not None:
+        key_cols = [i for i in (_find(header, _KEY_COLUMNS[:2]), _find(header, _KEY_COLUMNS[2:])) if i is not None]
+        if not key_cols:
+            raise GradeImportError("학번 또는 아이디 열이 없습니다.")
+        feedback_col = _find(header, _FEEDBACK_COLUMNS)
+        start = 2
+    else:
+        # 헤더 없음: 학번(또는 아이디), 점수, [피드백]
+        key_cols, score_col, feedback_col = [0], 1, (2 if len(header) > 2 else None)
+        reader = csv.reader(io.StringIO("\n".join(lines)), delimiter=delimiter)
+        start = 1
+
+    rows = []
+    for line, cells in enumerate(reader, start=start):
+        if not any(cell.strip() for cell in cells):
+            continue
+        score = _cell(cells, score_col)
+        if not score:
+            # 점수 칸이 빈 행(내보내기 파일의 미채점 행 등)은 건너뛴다
+            continue
+        keys = [k for k in (_cell(cells, i) for i in key_cols) if k]
+        feedback = None if feedback_col is None else _cell(cells, feedback_col)
+        rows.append(Row(line, keys, score, feedback))
+    return rows
+
+
+# ---------- 2) 미리보기 ----------
+def plan(assignment, team, rows):
+    members = {}
+    for student_id, username, first_name, number in (
+        TeamMembership.objects.filter(team=team, status="APPROVED")
+        .values_list("student_id", "student__username", "student__first_name", "student__studentprofile__student_id")
+    ):
+        label = student_label(username, first_name, number)
+        members[username] = (student_id, label)
+        if number:
+            members[number] = (student_id, label)
+
+    existing = {
+        student_id: (sub_id, grade_id, score, feedback)
+        for sub_id, student_id, grade_id, score, feedback in (
+            Submission.objects.filter(assignment=assignment)
+            .values_list("id", "student_id", "grade__id", "grade__score", "grade__feedback_text")
+        )
+    }
+
+    changes, errors, seen = [], [], {}
+    for row in rows:
+        member = next((members[k] for k in row.keys if k in members), None)
+        if member is None:
+            errors.append((row.line, f"'{(row.keys or [''])[0]}' 은(는) 승인된 팀 멤버가 아닙니다."))
+            continue
+        student_id, label = member
+        if student_id in seen:
+            errors.append((row.line, f"{label} 이(가) {seen[student_id]}번째 줄과 중복됩니다."))
+            continue
+        seen[student_id] = row.line
+        try:
+            score = int(row.score)
+        except ValueError:
+            errors.append((row.line, f"점수 '{row.score}' 이(가) 정수가 아닙니다."))
+            continue
+        if not 0 <= score <= assignment.max_score:
+            errors.append((row.line, f"점수 {score} 이(가) 0~{assignment.max_score} 범위를 벗어났습니다."))
+            continue
+
+        sub_id, grade_id, old_score, old_feedback = existing.get(student_id, (None, None, None, None))
+        feedback = (old_feedback or "") if row.feedback is None else row.feedback
+        if grade_id is None:
+            kind = CREATE
+        elif old_score != score or (old_feedback or "") != feedback:
+            kind = UPDATE
+        else:
+            kind = SAME
+        changes.append(Change(row.line, kind, student_id, label, sub_id, grade_id,
+                              old_score, old_feedback, score, feedback))
+    return Plan(changes, errors)
+
+
+# ---------- 3) 적용 ----------
+def apply(plan, assignment, grader):
+    """plan.pending 을 한 트랜잭션으로 반영하고 반영한 행 수를 돌려준다."""
+    pending = plan.pending
+    if not pending:
+        return 0
+    now = timezone.now()
+    # 뷰가 plan 과 함께 이미 트랜잭션을 열었으면 그대로 합류(불필요한 SAVEPOINT 왕복 생략)
+    with transaction.atomic(savepoint=False):
+        # 제출 기록이 없는 학생(미제출자에게 점수 부여): 채점완료 상태로 바로 만든다
+        missing = [c for c in pending if c.submission_id is None]
+        if missing:
+            created = Submission.objects.bulk_create([
+                Submission(assignment=assignment, student_id=c.student_id, status="graded") for c in missing
+            ])
+            for change, sub in zip(missing, created):
+                change.submission_id = sub.pk
+
+        Grade.objects.bulk_create([
+            Grade(submission_id=c.submission_id, score=c.score, feedback_text=c.feedback, grader=grader)
+            for c in pending if c.kind == CREATE
+        ])
+        # bulk_update 는 auto_now 를 채우지 않으므로 graded_at 을 직접 넣는다
+        Grade.objects.bulk_update([
+            Grade(pk=c.grade_id, score=c.score, feedback_text=c.feedback, grader=grader, graded_at=now)
+            for c in pending if c.kind == UPDATE
+        ], ["score", "feedback_text", "grader", "graded_at"])
+
+        Submission.objects.filter(pk__in=[c.submission_id for c in pending]).exclude(status="graded").update(
+            status="graded"
+        )
+        notifications.graded(assignment, [(c.student_id, c.score) for c in pending])
+    generations.bump_grades(assignment.team_id)
+    events.submissions_changed(assignment.pk)
+    return len(pending)
@@ -0,0 +1,296 @@
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.db import OperationalError, transaction
+from django.utils.dateparse import parse_datetime
+
+from . import events, generations
+from .models import StoredBlob, Submission, SubmissionFile, SubmissionReceipt
+from .uploads import StagedFile
+
+logger = logging.getLogger("submit.ingest")
+
+# =========================
+# 제출 접수 큐 (SUBMISSION_INGEST_QUEUE)
+# =========================
+# 마감 직전에는 수백 명이 동시에 제출하고, 제출마다 "이전 파일 삭제 → 새 파일 저장 → 제출 갱신"이
+# SQLite 쓰기 잠금 하나를 두고 다툰다. 접수 큐를 켜면
+#   1) 요청: 업로드 바이트를 스풀 디렉터리로 옮기고 receipt.json(접수 시각 포함)을 쓴 뒤 바로 응답 (DB 쓰기 없음)
+#   2) 워커(ingest_worker, 한 프로세스): 접수 시각 순으로 여러 건을 모아 트랜잭션 하나로 반영
+# 스풀 구조: <SUBMISSION_INGEST_ROOT>/<접수번호>/{receipt.json, 1, 2, ...}
+#   디렉터리는 <접수번호>.tmp 로 만든 뒤 다 쓰고 rename → 워커는 반쯤 쓴 접수를 보지 못한다.
+#   SubmissionReceipt 행(accepted/superseded/failed)이 커밋된 접수만 지우므로, 도중에 죽으면 다시 처리되고
+#   SubmissionReceipt 로 중복을 거른다. DB 잠금 등 일시적인 오류(OperationalError)는 스풀을 남겨 다음 회차에 다시 시도하고,
+#   실패 기록조차 남기지 못한 접수는 <접수번호>.failed 로 옮겨 둔다(지우지 않음, 다시 처리하지 않음).
+# 접수 시각(accepted_at)은 요청 도착 시각(ArrivalTimeMiddleware)이고 그대로 submitted_at 이 된다.
+# 같은 학생이 여러 번 접수하면 접수 시각이 가장 늦은 것만 반영하고 나머지는 "superseded" 로 남긴다.
+
+RECEIPT_FILE = "receipt.json"
+TMP_SUFFIX = ".tmp"
+FAILED_SUFFIX = ".failed"
+# 이 시간(초)보다 오래된 .tmp 디렉터리는 요청 도중 죽은 흔적 → 워커가 지운다
+STALE_TMP_AFTER = 3600
+
+
+def enabled():
+    return getattr(settings, "SUBMISSION_INGEST_QUEUE", False)
+
+
+def spool_root():
+    return Path(settings.SUBMISSION_INGEST_ROOT)
+
+
+def enqueue(assignment, student, comment, files, accepted_at):
+    """
+    files: [(File, 원본 파일명, size), ...] 를 스풀로 옮기고(임시 파일은 복사 없이 이동) 접수 기록을 남긴다.
+    반환: 접수번호(UUID)
+    """
+    receipt_id = uuid.uuid4()
+    final = spool_root() / str(receipt_id)
+    tmp = final.with_name(final.name + TMP_SUFFIX)
+    tmp.mkdir(parents=True)
+    try:
+        entries = []
+        for idx, (fobj, name, size) in enumerate(files, start=1):
+            path = tmp / str(idx)
+            if hasattr(fobj, "temporary_file_path"):
+                file_move_safe(fobj.temporary_file_path(), str(path))
+            else:
+                with open(path, "wb") as fh:
+                    for chunk in fobj.chunks():
+                        fh.write(chunk)
+            entries.append({"path": path.name, "name": os.path.basename(name), "size": size})
+
+        record = {
+            "id": str(receipt_id),
+            "team": assignment.team_id,
+            "assignment": assignment.pk,
+            "student": student.pk,
+            "comment": comment,
+            "accepted_at": accepted_at.isoformat(),
+            "files": entries,
+        }
+        with open(tmp / RECEIPT_FILE, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.rename(tmp, final)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return receipt_id
+
+
+def _load(directory):
+    try:
+        with open(directory / RECEIPT_FILE, encoding="utf-8") as fh:
+            record = json.load(fh)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    record["accepted_at"] = parse_datetime(record["accepted_at"])
+    return record
+
+
+def lookup(receipt_id):
+    """아직 반영되지 않은 접수 기록(dict). 없으면 None"""
+    return _load(spool_root() / str(receipt_id))
+
+
+def pending(limit):
+    """반영 대기 중인 접수를 접수 시각 순으로 최대 limit 건"""
+    root = spool_root()
+    if not root.exists():
+        return []
+    records = []
+    stale_before = time.time() - STALE_TMP_AFTER
+    with os.scandir(root) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            if entry.name.endswith(TMP_SUFFIX):
+                if entry.stat().st_mtime < stale_before:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            if entry.name.endswith(FAILED_SUFFIX):
+                continue
+            record = _load(Path(entry.path))
+            if record:
+                records.append(record)
+    records.sort(key=lambda r: (r["accepted_at"], r["id"]))
+    return records[:limit]
+
+
+def process(records):
+    """
+    접수 묶음을 반영하고, 접수 기록이 커밋된 것만 스풀에서 지운다. 반환: 상태별 건수(Counter, 다음 회차로 미룬 것은 retry)
+    묶음 트랜잭션이 실패하면 한 건 때문에 큐 전체가 막히지 않도록 한 건씩 다시 시도한다.
+    """
+    done = {str(pk) for pk in SubmissionReceipt.objects.filter(pk__in=[r["id"] for r in records])
+            .values_list("pk", flat=True)}
+    fresh = [r for r in records if r["id"] not in done]
+    counts = Counter(duplicate=len(records) - len(fresh))
+    finished = [r for r in records if r["id"] in done]
+    if fresh:
+        try:
+            counts += _apply(fresh)
+            finished += fresh
+        except Exception:
+            logger.exception("접수 %d건 일괄 반영 실패 → 한 건씩 다시 시도", len(fresh))
+            for record in fresh:
+                try:
+                    counts += _apply([record])
+                    finished.append(record)
+                except OperationalError:
+                    # DB 잠김 등 일시적인 오류: 스풀을 그대로 두고 다음 회차에 다시 시도
+                    logger.exception("접수 %s 반영 실패 → 다음 회차에 다시 시도", record["id"])
+                    counts["retry"] += 1
+                except Exception as e:
+                    logger.exception("접수 %s 반영 실패", record["id"])
+                    counts["failed"] += 1
+                    if _record_failure(record, e):
+                        finished.append(record)
+                    else:
+                        _park(record)
+    for record in finished:
+        shutil.rmtree(spool_root() / record["id"], ignore_errors=True)
+    return counts
+
+
+def _park(record):
+    """실패 기록을 남기지 못한 접수: 지우지 않고 큐에서만 뺀다(관리자가 확인)"""
+    path = spool_root() / record["id"]
+    try:
+        os.rename(path, path.with_name(path.name + FAILED_SUFFIX))
+    except OSError:
+        logger.exception("접수 %s 스풀을 옮기지 못함", record["id"])
+
+
+def _staged(record, entry):
+    return StagedFile(spool_root() / record["id"] / entry["path"], entry["name"])
+
+
+def _store(record):
+    """
+    스풀 파일을 제출 저장소에 쓴다(트랜잭션 밖). 스풀 원본은 남는다(반영이 실패하면 다시 처리).
+    반환: [(저장 이름, digest, 항목), ...]
+    """
+    field = SubmissionFile._meta.get_field("file")
+    stored = []
+    for entry in record["files"]:
+        staged = _staged(record, entry)
+        try:
+            name = field.storage.save(field.generate_filename(None, entry["name"]), staged)
+        finally:
+            staged.close()
+        stored.append((name, field.storage.digest_of(name), entry))
+    return stored
+
+
+def _discard_unreferenced(stored):
+    """반영이 실패한 접수가 써 둔 blob 중 아무도 참조하지 않는 것을 지운다"""
+    storage = SubmissionFile._meta.get_field("file").storage
+    blobs = {digest: name for files in stored.values() for name, digest, _ in files}
+    try:
+        StoredBlob.drop_unreferenced(blobs, storage)
+    except Exception:
+        # 남은 파일은 참조 수가 없을 뿐 내용은 온전하다 → 같은 내용이 다시 올라오면 그대로 쓰인다
+        logger.exception("반영 실패한 접수의 blob %d개를 정리하지 못함", len(blobs))
+
+
+def _apply(records):
+    # 같은 (과제, 학생)은 접수 시각이 가장 늦은 것만 반영 (records 는 접수 시각 순)
+    latest = {}
+    for record in records:
+        latest[(record["assignment"], record["student"])] = record
+    existing = {
+        (s.assignment_id, s.student_id): s
+        for s in Submission.objects.filter(
+            assignment_id__in={a for a, _ in latest}, student_id__in={s for _, s in latest},
+        )
+    }
+    apply = []
+    for key, record in latest.items():
+        sub = existing.get(key)
+        # 이미 더 늦게 접수된 제출이 반영돼 있으면(늦게 도착한 큰 업로드 등) 덮어쓰지 않는다
+        if sub is not None and sub.submitted_at and sub.submitted_at >= record["accepted_at"]:
+            continue
+        apply.append((record, sub or Submission(assignment_id=key[0], student_id=key[1])))
+    # 파일 저장(디스크 I/O)은 쓰기 잠금을 잡기 전에 끝낸다. 제출을 쓰는 곳은 이 워커뿐이라 위에서 읽은 상태가 유지된다
+    stored = {}
+    try:
+        for record, _ in apply:
+            stored[record["id"]] = _store(record)
+        return _commit(records, apply, existing, stored)
+    except BaseException:
+        _discard_unreferenced(stored)
+        raise
+
+
+def _commit(records, apply, existing, stored):
+    status = {record["id"]: "superseded" for record in records}
+    subs_of = {}
+    storage = SubmissionFile._meta.get_field("file").storage
+    with transaction.atomic():
+        Submission.objects.bulk_create([sub for _, sub in apply if sub.pk is None])
+        SubmissionFile.objects.filter(
+            submission__in=[sub.pk for _, sub in apply if (sub.assignment_id, sub.student_id) in existing]
+        ).delete()
+        new_files = []
+        for record, sub in apply:
+            for version, (name, digest, entry) in enumerate(stored[record["id"]], start=1):
+                new_files.append(SubmissionFile(
+                    submission=sub, file=name, version=version, size=entry["size"],
+                    sha256=digest, original_name=entry["name"],
+                ))
+            sub.comment = record["comment"]
+            sub.status = "submitted"
+            sub.submitted_at = record["accepted_at"]
+            status[record["id"]] = "accepted"
+            subs_of[record["id"]] = sub
+        SubmissionFile.objects.bulk_create(new_files)
+        for f in new_files:
+            StoredBlob.acquire(f.sha256, f.file.name, f.size)
+        # 파일을 쓴 뒤 참조를 잡기 전에 다른 요청이 같은 blob 의 마지막 참조를 놓아 지웠을 수 있다 → 스풀에서 다시 쓴다
+        for record, _ in apply:
+            for name, _, entry in stored[record["id"]]:
+                if not storage.exists(name):
+                    with _staged(record, entry) as staged:
+                        storage.ensure(name, staged)
+        Submission.objects.bulk_update([sub for _, sub in apply], ["comment", "status", "submitted_at"])
+
+        SubmissionReceipt.objects.bulk_create([
+            SubmissionReceipt(
+                id=record["id"], assignment_id=record["assignment"], student_id=record["student"],
+                submission=subs_of.get(record["id"]), status=status[record["id"]],
+                accepted_at=record["accepted_at"], file_count=len(record["files"]),
+            )
+            for record in records
+        ])
+        for team_id in {record["team"] for record, _ in apply}:
+            generations.bump_grades(team_id)
+        for assignment_id in {record["assignment"] for record, _ in apply}:
+            events.submissions_changed(assignment_id)
+    return Counter(status.values())
+
+
+def _record_failure(record, error):
+    """실패 기록(SubmissionReceipt)을 남긴다. 반환: 커밋됐는지"""
+    try:
+        SubmissionReceipt.objects.create(
+            id=record["id"], assignment_id=record["assignment"], student_id=record["student"],
+            status="failed", accepted_at=record["accepted_at"], file_count=len(record["files"]),
+            error=str(error)[:255],
+        )
+    except Exception:
+        # 과제/학생이 이미 삭제된 경우 등: 남길 곳이 없으므로 로그만
+        logger.exception("접수 %s 실패 기록을 남기지 못함", record["id"])
+        return False
+    return True
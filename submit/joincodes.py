@@ -0,0 +1,128 @@
+import datetime
+import functools
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from .models import JoinCodeSequence, RetiredJoinCode
+
+# =========================
+# 팀코드 할당기
+# =========================
+# 6자리 코드 공간 [0, 10^6) 을 키가 있는 순열(4라운드 Feistel, 2^20 위에서 cycle-walking)로 섞고,
+# DB 에는 "몇 번째 코드까지 나눠 줬는지" 카운터 하나만 둔다.
+#   i 번째 코드 = permute(i)  → 순열이므로 서로 다른 i 는 절대 같은 코드가 되지 않음
+# 따라서 코드 하나 받는 비용은 점유율과 무관하게 일정하다(반납 풀 DELETE 1회 + 카운터 UPDATE 1회, 둘 다 RETURNING).
+# RETURNING 은 SQLite 3.35+ / PostgreSQL 에서 지원된다.
+# 삭제/재발급으로 반납된 코드는 RetiredJoinCode 에 쌓였다가 JOIN_CODE_REUSE_AFTER 이후 먼저 재사용된다.
+
+CODE_SPACE = 10 ** 6
+_HALF_BITS = 10
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+class JoinCodeExhausted(Exception):
+    """순열의 모든 코드를 나눠 줬고 재사용 가능한 반납 코드도 없음"""
+
+
+@functools.lru_cache(maxsize=None)
+def _round_tables(key):
+    # 라운드 함수 F(r, x) 를 미리 표로 만들어 둔다(10비트 입력 → 1024칸 × 4라운드)
+    return tuple(
+        tuple(
+            int.from_bytes(salted_hmac("submit.joincodes", f"{r}:{x}", secret=key).digest()[:2], "big") & _HALF_MASK
+            for x in range(1 << _HALF_BITS)
+        )
+        for r in range(_ROUNDS)
+    )
+
+
+def _feistel(x, tables):
+    left, right = x >> _HALF_BITS, x & _HALF_MASK
+    for table in tables:
+        left, right = right, left ^ table[right]
+    return (left << _HALF_BITS) | right
+
+
+def permute(index, key=None):
+    """[0, CODE_SPACE) 위의 전단사 함수. 같은 키면 항상 같은 결과."""
+    if not 0 <= index < CODE_SPACE:
+        raise ValueError("index 가 코드 공간을 벗어났습니다.")
+    tables = _round_tables(key or settings.SECRET_KEY)
+    x = _feistel(index, tables)
+    # 2^20 > 10^6 이므로 범위 밖이면 범위 안에 들어올 때까지 다시 섞는다(평균 1.05회)
+    while x >= CODE_SPACE:
+        x = _feistel(x, tables)
+    return x
+
+
+def format_code(value):
+    return f"{value:06d}"
+
+
+def _reserve(count):
+    """카운터를 count 만큼 올리고 받은 구간의 시작 인덱스를 돌려준다(UPDATE ... RETURNING 한 번)."""
+    table = connection.ops.quote_name(JoinCodeSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET next_index = next_index + %s WHERE id = 1 RETURNING next_index", [count]
+        )
+        row = cursor.fetchone()
+    if row is None:
+        # 첫 사용: 행을 만들고 다시 시도(동시에 만들면 한쪽은 무시됨)
+        JoinCodeSequence.objects.get_or_create(pk=1)
+        return _reserve(count)
+    end = row[0]
+    if end > CODE_SPACE:
+        raise JoinCodeExhausted("사용 가능한 팀코드가 없습니다.")
+    return end - count
+
+
+def _from_retired():
+    """
+    쿨다운이 지난 반납 코드 하나를 가져간다.
+    DELETE ... RETURNING 으로 고르기와 지우기를 한 문장에 해서 동시 요청이 같은 코드를 받지 않는다.
+    """
+    cutoff = timezone.now() - getattr(settings, "JOIN_CODE_REUSE_AFTER", datetime.timedelta(days=30))
+    table = connection.ops.quote_name(RetiredJoinCode._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE code = ("
+            f"SELECT code FROM {table} WHERE retired_at <= %s ORDER BY retired_at LIMIT 1"
+            f") RETURNING code",
+            [connection.ops.adapt_datetimefield_value(cutoff)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def allocate():
+    """새 팀코드 하나. DB 에서 코드 존재 여부를 찾아보지 않는다."""
+    return _from_retired() or format_code(permute(_reserve(1)))
+
+
+def allocate_many(count):
+    """대량 생성(seed_load 등)용: 카운터를 한 번에 count 만큼 올린다. 반납 풀은 쓰지 않는다."""
+    if count <= 0:
+        return []
+    start = _reserve(count)
+    return [format_code(permute(i)) for i in range(start, start + count)]
+
+
+def retire(code, reusable_now=False):
+    """
+    더 이상 쓰지 않는 코드를 반납한다.
+    reusable_now: 사용자에게 보인 적 없는 코드(저장 실패 등)는 쿨다운 없이 바로 재사용.
+    """
+    if not code:
+        return
+    retired_at = timezone.now()
+    if reusable_now:
+        retired_at -= getattr(settings, "JOIN_CODE_REUSE_AFTER", datetime.timedelta(days=30))
+    RetiredJoinCode.objects.bulk_create(
+        [RetiredJoinCode(code=code, retired_at=retired_at)],
+        update_conflicts=True, unique_fields=["code"], update_fields=["retired_at"],
+    )
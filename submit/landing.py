@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import covers, generations
+from .models import Assignment, Team, TeamMembership
+
+# =========================
+# 로그인 후 첫 화면: 내 팀 카드
+# =========================
+# 내가 만든 팀 UNION ALL 승인 멤버로 속한 팀(내가 만든 팀 제외 → 겹치지 않으므로 중복 제거 불필요)을
+# 관리자 이름, 멤버 수/진행 중 과제 수/대기 요청 수(상관 서브쿼리)와 함께 쿼리 한 번으로 읽는다.
+# 팀 수가 늘어도 쿼리 수는 그대로이고, 카운터 서브쿼리는 (team, status) 인덱스를 탄다.
+#
+# 결과(dict 목록)는 사용자별로 캐시한다. 다음 중 하나라도 바뀌면 다시 만든다.
+#   - 사용자 세대: 팀을 만들거나 멤버십이 바뀜(목록 자체가 달라짐)
+#   - 카드에 나온 팀들의 세대: 팀 수정/삭제, 과제 추가·마감, 멤버 승인 등(카운터가 달라짐)
+#   - 가장 가까운 마감 시각이 지남(진행 중 과제 수가 달라짐)
+# 쿼리와 세대 읽기 사이에 바뀐 내용은 HOME_CACHE_TIMEOUT 안에 반영된다.
+
+FIELDS = ("id", "name", "description", "cover", "cover_variants", "join_code", "owner_id", "updated_at")
+
+
+def _count(qs):
+    return Coalesce(
+        Subquery(qs.order_by().values("team").annotate(n=Count("pk")).values("n")),
+        0, output_field=IntegerField(),
+    )
+
+
+def _cards_query(user_id, now):
+    memberships = TeamMembership.objects.filter(team=OuterRef("pk"))
+    open_assignments = Assignment.objects.filter(team=OuterRef("pk"), is_closed=False, due_at__gt=now)
+
+    def cards(qs, pending):
+        return qs.order_by().annotate(
+            member_count=_count(memberships.filter(status="APPROVED")),
+            open_assignments=_count(open_assignments),
+            next_due=Subquery(open_assignments.order_by("due_at").values("due_at")[:1]),
+            pending_requests=pending,
+        ).values(
+            *FIELDS, "member_count", "open_assignments", "next_due", "pending_requests",
+            owner_username=F("owner__username"),
+            owner_first_name=F("owner__first_name"),
+            owner_last_name=F("owner__last_name"),
+        )
+
+    owned = cards(Team.objects.filter(owner_id=user_id), _count(memberships.filter(status="PENDING")))
+    # 대기 요청 수는 팀장에게만 보이므로 멤버로 속한 팀은 계산하지 않는다
+    joined = cards(
+        Team.objects.filter(memberships__student_id=user_id, memberships__status="APPROVED").exclude(owner_id=user_id),
+        Value(0, output_field=IntegerField()),
+    )
+    return owned.union(joined, all=True).order_by("name", "id")
+
+
+def _cache_key(user_id):
+    return f"home:{user_id}"
+
+
+def team_cards(user_id):
+    now = timezone.now()
+    user_gen = generations.current("user", [user_id])[user_id]
+    entry = cache.get(_cache_key(user_id))
+    if entry is not None:
+        gen, team_gens, expires, cards = entry
+        if gen == user_gen and (expires is None or now < expires) and generations.current("team", team_gens) == team_gens:
+            return cards
+
+    cards = []
+    for card in _cards_query(user_id, now):
+        # User.get_full_name() 과 같은 규칙, 없으면 아이디
+        first, last, username = card.pop("owner_first_name"), card.pop("owner_last_name"), card.pop("owner_username")
+        card["owner_name"] = f"{first} {last}".strip() or username
+        # 대표 이미지 srcset(변형이 없으면 None → 원본)
+        card["cover_image"] = covers.picture(card["id"], card["cover"], card.pop("cover_variants"))
+        cards.append(card)
+    team_gens = generations.current("team", [c["id"] for c in cards])
+    expires = min((c["next_due"] for c in cards if c["next_due"]), default=None)
+    cache.set(
+        _cache_key(user_id), (user_gen, team_gens, expires, cards),
+        getattr(settings, "HOME_CACHE_TIMEOUT", 300),
+    )
+    return cards
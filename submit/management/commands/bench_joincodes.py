@@ -0,0 +1,90 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from submit import joincodes
+from submit.models import Team, User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "팀코드 점유율을 단계별로 채우며 이전 방식(무작위 + exists 반복)과 할당기의 코드 1개당 비용을 비교합니다. "
+        "모든 변경은 마지막에 롤백됩니다(90% 까지 채우면 팀 90만 행을 넣으므로 몇 분 걸림)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--levels", default="0,25,50,75,90", help="점유율(%%) 목록")
+        parser.add_argument("--samples", type=int, default=300, help="단계마다 측정할 코드 수")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opt):
+        levels = sorted(int(x) for x in opt["levels"].split(","))
+        self.rng = random.Random(opt["seed"])
+        self.stdout.write(
+            f"{'점유율':>6} {'팀 수':>9} | {'이전: 탐색/코드':>14} {'쿼리/코드':>9} {'ms/코드':>8} | "
+            f"{'할당기: 쿼리/코드':>16} {'ms/코드':>8}"
+        )
+        try:
+            with transaction.atomic():
+                owner = User.objects.create(username="bench-joincodes-owner")
+                for level in levels:
+                    self._fill(owner, level * joincodes.CODE_SPACE // 100, opt["batch_size"])
+                    occupied = Team.objects.count()
+                    legacy = self._legacy(opt["samples"])
+                    allocator = self._allocator(opt["samples"])
+                    self.stdout.write(
+                        f"{level:>5}% {occupied:>9,} | {legacy[0]:>14.2f} {legacy[1]:>9.2f} {legacy[2]:>8.3f} | "
+                        f"{allocator[1]:>16.2f} {allocator[2]:>8.3f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _fill(self, owner, target, batch):
+        missing = target - Team.objects.count()
+        while missing > 0:
+            n = min(batch, missing)
+            Team.objects.bulk_create([
+                Team(owner=owner, name=f"bench {code}", join_code=code) for code in joincodes.allocate_many(n)
+            ])
+            missing -= n
+
+    def _legacy(self, samples):
+        """이전 Team.regen_join_code 와 같은 방식: 안 쓰인 코드가 나올 때까지 무작위 + exists()"""
+        probes = 0
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            for _ in range(samples):
+                while True:
+                    probes += 1
+                    code = "".join(self.rng.choices("0123456789", k=6))
+                    if not Team.objects.filter(join_code=code).exists():
+                        break
+            elapsed = time.perf_counter() - start
+        return probes / samples, counter.count / samples, elapsed * 1000 / samples
+
+    def _allocator(self, samples):
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            for _ in range(samples):
+                joincodes.allocate()
+            elapsed = time.perf_counter() - start
+        return 1.0, counter.count / samples, elapsed * 1000 / samples
@@ -0,0 +1,155 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+# 비교할 설정: (이름, ENGINE, OPTIONS)
+PROFILES = (
+    ("기본 sqlite3", "django.db.backends.sqlite3", {}),
+    ("submit.sqlite", "submit.sqlite", {}),
+)
+
+READ_SQL = "SELECT COUNT(*), SUM(n), MAX(updated_at) FROM bench_item WHERE grp = %s"
+
+
+def _pct(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+class Command(BaseCommand):
+    help = (
+        "임시 SQLite 파일에서 읽기/쓰기 스레드를 동시에 돌려 기본 sqlite3 백엔드와 submit.sqlite"
+        "(WAL, PRAGMA, BEGIN IMMEDIATE, 잠금 재시도)의 처리량과 실패 수를 비교합니다. 실제 DB 는 건드리지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0, help="프로필마다 측정 시간")
+        parser.add_argument("--rows", type=int, default=20000, help="읽기 대상 행 수")
+        parser.add_argument("--hold-ms", type=float, default=2.0,
+                            help="쓰기 트랜잭션 안에서 머무는 시간(파일 저장 등 앱 작업 흉내)")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opt):
+        workdir = tempfile.mkdtemp(prefix="bench_sqlite_")
+        self.stdout.write(
+            f"읽기 {opt['readers']} / 쓰기 {opt['writers']} 스레드, {opt['seconds']:.0f}초, "
+            f"행 {opt['rows']:,}, 쓰기 트랜잭션 {opt['hold_ms']}ms"
+        )
+        self.stdout.write(
+            f"{'프로필':<14} {'읽기/s':>8} {'쓰기/s':>8} {'쓰기 실패':>8} {'읽기 실패':>8} "
+            f"{'쓰기 p50':>9} {'p95':>8} {'max':>8}"
+        )
+        try:
+            for i, (label, engine, options) in enumerate(PROFILES):
+                alias = f"bench_{i}"
+                connections.settings[alias] = {
+                    **connections.settings["default"],
+                    "ENGINE": engine,
+                    "NAME": os.path.join(workdir, f"{alias}.sqlite3"),
+                    "OPTIONS": options,
+                    "CONN_MAX_AGE": 0,
+                }
+                try:
+                    self._setup(alias, opt["rows"])
+                    result = self._run(alias, opt)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+                lat = result["write_latency"]
+                self.stdout.write(
+                    f"{label:<14} {result['reads'] / opt['seconds']:>8.0f} {result['writes'] / opt['seconds']:>8.0f} "
+                    f"{result['write_errors']:>8} {result['read_errors']:>8} "
+                    f"{_pct(lat, 0.5) * 1000:>7.1f}ms {_pct(lat, 0.95) * 1000:>6.1f}ms {max(lat, default=0) * 1000:>6.0f}ms"
+                )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _setup(self, alias, rows):
+        now = timezone.now().isoformat()
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE bench_item (id INTEGER PRIMARY KEY, grp INTEGER NOT NULL, n INTEGER NOT NULL, "
+                "updated_at TEXT NOT NULL)"
+            )
+            cursor.execute("CREATE TABLE bench_log (id INTEGER PRIMARY KEY, item_id INTEGER NOT NULL, at TEXT NOT NULL)")
+            cursor.executemany(
+                "INSERT INTO bench_item (grp, n, updated_at) VALUES (%s, 0, %s)",
+                [(i % 50, now) for i in range(rows)],
+            )
+
+    def _run(self, alias, opt):
+        rows, hold = opt["rows"], opt["hold_ms"] / 1000
+        result = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0, "write_latency": []}
+        lock = threading.Lock()
+        start = threading.Barrier(opt["readers"] + opt["writers"])
+        deadline = []
+
+        def reader(seed):
+            rng = random.Random(seed)
+            conn = connections[alias]
+            done = failed = 0
+            start.wait()
+            try:
+                while time.monotonic() < deadline[0]:
+                    try:
+                        with conn.cursor() as cursor:
+                            cursor.execute(READ_SQL, [rng.randrange(50)])
+                            cursor.fetchall()
+                        done += 1
+                    except OperationalError:
+                        failed += 1
+            finally:
+                conn.close()
+            with lock:
+                result["reads"] += done
+                result["read_errors"] += failed
+
+        def writer(seed):
+            # 제출과 같은 모양: 트랜잭션 안에서 읽고 → 고치고 → 기록 추가
+            rng = random.Random(seed)
+            conn = connections[alias]
+            done = failed = 0
+            latency = []
+            start.wait()
+            try:
+                while time.monotonic() < deadline[0]:
+                    t0 = time.perf_counter()
+                    try:
+                        with transaction.atomic(using=alias), conn.cursor() as cursor:
+                            pk = rng.randrange(1, rows + 1)
+                            cursor.execute("SELECT n FROM bench_item WHERE id = %s", [pk])
+                            n = cursor.fetchone()[0]
+                            time.sleep(hold)
+                            now = timezone.now().isoformat()
+                            cursor.execute("UPDATE bench_item SET n = %s, updated_at = %s WHERE id = %s", [n + 1, now, pk])
+                            cursor.execute("INSERT INTO bench_log (item_id, at) VALUES (%s, %s)", [pk, now])
+                        done += 1
+                        latency.append(time.perf_counter() - t0)
+                    except OperationalError:
+                        failed += 1
+            finally:
+                conn.close()
+            with lock:
+                result["writes"] += done
+                result["write_errors"] += failed
+                result["write_latency"].extend(latency)
+
+        deadline.append(time.monotonic() + opt["seconds"])
+        threads = [threading.Thread(target=reader, args=(opt["seed"] + i,)) for i in range(opt["readers"])]
+        threads += [threading.Thread(target=writer, args=(opt["seed"] + 1000 + i,)) for i in range(opt["writers"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return result
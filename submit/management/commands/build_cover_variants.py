@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from submit import covers
+from submit.models import Team
+
+
+class Command(BaseCommand):
+    help = (
+        "대표 이미지가 있지만 변형(폭별 WebP/JPEG)이 없거나 지금 원본의 것이 아닌 팀의 변형을 만듭니다. "
+        "이 기능 이전에 올린 이미지나 관리자 화면에서 바꾼 이미지에 한 번 돌립니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="변형이 있어도 모두 다시 만들기")
+
+    def handle(self, *args, **opt):
+        built = skipped = failed = 0
+        for team in Team.objects.exclude(cover="").exclude(cover__isnull=True).iterator(chunk_size=200):
+            if not opt["force"] and covers.current(team.cover.name, team.cover_variants):
+                skipped += 1
+                continue
+            try:
+                with transaction.atomic():
+                    n = covers.rebuild(team)
+            except FileNotFoundError:
+                self.stderr.write(f"팀 {team.pk}: 원본 파일이 없습니다 ({team.cover.name})")
+                failed += 1
+                continue
+            built += 1 if n else 0
+            failed += 0 if n else 1
+        self.stdout.write(f"변형 생성 {built}팀, 이미 있음 {skipped}팀, 실패 {failed}팀")
@@ -0,0 +1,56 @@
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HEADER = "/* build_css 로 생성됨 — 직접 고치지 말고 templates/ 를 바꾼 뒤 python manage.py build_css */\n"
+
+
+class Command(BaseCommand):
+    help = (
+        "Tailwind CLI(pip install tailwindcss-bin)로 templates/ 와 submit/*.py 에 쓰인 클래스만 모아 "
+        "static/css/style.css 를 만듭니다. 템플릿의 class 를 바꾸면 다시 돌리고 결과 파일도 함께 커밋합니다"
+        "(배포 때 collectstatic 이 해시·압축)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="파일을 쓰지 않고 지금 결과와 다르면 실패")
+
+    def handle(self, *args, **opt):
+        path = Path(settings.TAILWIND_OUTPUT)
+        css = HEADER + self._run_cli()
+        old = path.read_text(encoding="utf-8") if path.exists() else ""
+        if opt["check"]:
+            if old != css:
+                raise CommandError(f"{path} 가 템플릿과 맞지 않습니다. python manage.py build_css 로 다시 만드세요.")
+            self.stdout.write(f"{path}: 최신")
+            return
+        if old != css:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(css, encoding="utf-8")
+        self.stdout.write(f"{path}: {len(css.encode()):,} bytes")
+
+    @staticmethod
+    def _run_cli():
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "style.css"
+            # 찾을 파일(@source)은 입력 CSS 에 적혀 있다
+            command = [settings.TAILWIND_CLI, "--input", str(settings.TAILWIND_INPUT), "--output", str(out), "--minify"]
+            try:
+                subprocess.run(command, cwd=settings.BASE_DIR, check=True, capture_output=True, text=True)
+            except FileNotFoundError:
+                raise CommandError(
+                    f"Tailwind CLI({settings.TAILWIND_CLI})가 없습니다. pip install tailwindcss-bin=={settings.TAILWIND_VERSION}"
+                )
+            except subprocess.CalledProcessError as e:
+                raise CommandError(f"Tailwind CLI 실패:\n{e.stderr.strip()}")
+            css = out.read_text(encoding="utf-8")
+        # 버전마다 결과가 다르다 → 커밋된 파일과 같은 버전의 CLI 로만 만든다(결과 첫 줄의 배너)
+        banner = css.partition("\n")[0]
+        if f"tailwindcss v{settings.TAILWIND_VERSION} " not in banner:
+            raise CommandError(
+                f"Tailwind CLI 버전이 다릅니다({banner.strip()!r}). pip install tailwindcss-bin=={settings.TAILWIND_VERSION}"
+            )
+        return css
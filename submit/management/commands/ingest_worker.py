@@ -0,0 +1,44 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from submit import ingest
+
+
+class Command(BaseCommand):
+    help = (
+        "제출 접수 큐(SUBMISSION_INGEST_QUEUE)의 접수를 접수 시각 순으로 묶어 DB 에 반영합니다. "
+        "쓰기를 한 곳으로 모으는 것이 목적이므로 반드시 한 프로세스만 띄웁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=100, help="트랜잭션 하나로 반영할 최대 접수 수")
+        parser.add_argument("--interval", type=float, default=0.5, help="큐가 비었을 때 다시 볼 때까지 쉬는 시간(초)")
+        parser.add_argument("--once", action="store_true", help="지금 쌓인 접수만 반영하고 종료")
+
+    def handle(self, *args, **opt):
+        stopping = []
+        # 처리 중인 묶음은 끝까지 반영하고 멈춘다
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        self.stdout.write(f"접수 큐 감시: {ingest.spool_root()} (묶음 {opt['batch']}건)")
+        while not stopping:
+            records = ingest.pending(opt["batch"])
+            if not records:
+                if opt["once"]:
+                    break
+                time.sleep(opt["interval"])
+                continue
+            start = time.perf_counter()
+            counts = ingest.process(records)
+            self.stdout.write(
+                f"{len(records)}건 {(time.perf_counter() - start) * 1000:.0f}ms: "
+                + ", ".join(f"{k} {v}" for k, v in sorted(counts.items()) if v)
+            )
+            if counts["retry"] == len(records):
+                # 모두 다음 회차로 미뤘다(DB 잠김 등) → 같은 묶음을 곧바로 다시 돌리지 않는다
+                if opt["once"]:
+                    break
+                time.sleep(opt["interval"])
@@ -0,0 +1,419 @@
+import io
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, OperationalError
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+
+from submit.models import Assignment, TeamMembership
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "BEGIN", "SAVEPOINT", "RELEASE")
+
+
+# =========================
+# 통계
+# =========================
+class Stats:
+    """스레드 간 공유되는 라우트별 지연/오류 + SQLite 잠금 대기 집계"""
+
+    def __init__(self, lock_threshold):
+        self.lock = threading.Lock()
+        self.latency = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.lock_threshold = lock_threshold
+        self.lock_waits = []       # 임계값 이상 걸린 쓰기 문장/커밋 소요(초)
+        self.locked_errors = 0     # "database is locked" 로 실패한 횟수
+
+    def record(self, route, elapsed, status, ok):
+        with self.lock:
+            self.latency[route].append(elapsed)
+            self.statuses[route][status] += 1
+            if not ok:
+                self.errors[route] += 1
+
+    def record_db(self, elapsed, locked=False):
+        with self.lock:
+            if locked:
+                self.locked_errors += 1
+            if elapsed >= self.lock_threshold:
+                self.lock_waits.append(elapsed)
+
+
+class LockProbe:
+    """
+    스레드별 DB 연결에 거는 execute_wrapper.
+    SQLite 는 잠금을 만나면 busy timeout 동안 문장 안에서 기다리므로,
+    쓰기 문장이 임계값 이상 걸리면 잠금 대기로 본다(읽기는 WAL 이 아니면 커밋 쪽에서 막힘).
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        locked = False
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as e:
+            locked = "locked" in str(e)
+            raise
+        finally:
+            if locked or sql.lstrip()[:9].upper().startswith(WRITE_PREFIXES):
+                self.stats.record_db(time.perf_counter() - start, locked)
+
+    def wrap_commit(self, db):
+        # COMMIT 은 execute 를 거치지 않으므로 연결 객체의 _commit 을 감싼다
+        original = db._commit
+        stats = self.stats
+
+        def _commit():
+            start = time.perf_counter()
+            locked = False
+            try:
+                return original()
+            except OperationalError as e:
+                locked = "locked" in str(e)
+                raise
+            finally:
+                stats.record_db(time.perf_counter() - start, locked)
+
+        db._commit = _commit
+        return original
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+# =========================
+# 가상 브라우저 (WSGI 직접 호출)
+# =========================
+class Browser:
+    """쿠키/CSRF 를 유지하며 WSGI application 을 직접 호출하는 최소 클라이언트"""
+
+    def __init__(self, app, stats):
+        self.app = app
+        self.stats = stats
+        self.cookies = {}
+
+    def _environ(self, method, path, body=b"", content_type=""):
+        parts = urlsplit(path)
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": "localhost",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "CONTENT_LENGTH": str(len(body)),
+        }
+        if content_type:
+            environ["CONTENT_TYPE"] = content_type
+        if self.cookies:
+            environ["HTTP_COOKIE"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        if method != "GET" and "csrftoken" in self.cookies:
+            environ["HTTP_X_CSRFTOKEN"] = self.cookies["csrftoken"]
+        return environ
+
+    def request(self, route, method, path, data=None, expect=(200,)):
+        body, content_type = b"", ""
+        if data is not None:
+            body, content_type = encode_multipart(BOUNDARY, data), MULTIPART_CONTENT
+
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured["status"] = int(status.split(" ", 1)[0])
+            captured["headers"] = headers
+
+        start = time.perf_counter()
+        status = 0
+        try:
+            result = self.app(self._environ(method, path, body, content_type), start_response)
+            try:
+                for _ in result:
+                    pass
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+            status = captured["status"]
+        except Exception:
+            status = 0
+        elapsed = time.perf_counter() - start
+
+        for name, value in captured.get("headers", []):
+            if name.lower() == "set-cookie":
+                for key, morsel in SimpleCookie(value).items():
+                    if morsel["max-age"] == "0" or not morsel.value:
+                        self.cookies.pop(key, None)
+                    else:
+                        self.cookies[key] = morsel.value
+
+        self.stats.record(route, elapsed, status, status in expect)
+        return status
+
+
+# =========================
+# 명령
+# =========================
+class Command(BaseCommand):
+    help = (
+        "config.wsgi.application 을 여러 스레드에서 직접 호출해 마감 직전 부하를 재현하고 "
+        "라우트별 p50/p95/p99, 처리량, 오류율, SQLite 잠금 대기를 보고합니다. "
+        "seed_load 로 만든 계정을 사용하며 제출 데이터가 실제로 바뀝니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="제출하는 학생(가상 사용자) 수")
+        parser.add_argument("--concurrency", type=int, default=32, help="학생 동시 실행 스레드 수")
+        parser.add_argument("--professors", type=int, default=4, help="제출 목록을 새로 고치는 교수 수")
+        parser.add_argument("--rounds", type=int, default=1, help="학생 1명이 제출을 반복하는 횟수")
+        parser.add_argument("--files", type=int, default=1, help="제출 1회당 파일 수")
+        parser.add_argument("--file-kb", type=int, default=256, help="파일 1개 크기(KB)")
+        parser.add_argument("--think-ms", type=int, default=0, help="단계 사이 대기(ms)")
+        parser.add_argument("--lock-threshold-ms", type=float, default=10.0,
+                            help="쓰기 문장/커밋이 이 시간 이상 걸리면 잠금 대기로 집계")
+        parser.add_argument("--prefix", default="load", help="seed_load 의 --prefix")
+        parser.add_argument("--password", default="load-pass-1234", help="seed_load 의 --password")
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장할 경로")
+
+    def handle(self, *args, **opt):
+        from config.wsgi import application
+
+        rng = random.Random(opt["seed"])
+        students, professors = self._targets(opt["prefix"], opt["users"], opt["professors"], rng)
+        if not students:
+            raise CommandError(
+                f"'{opt['prefix']}-' 학생 중 열린 과제가 있는 승인 멤버가 없습니다. 먼저 seed_load 를 실행하세요."
+            )
+
+        stats = Stats(opt["lock_threshold_ms"] / 1000)
+        think = opt["think_ms"] / 1000
+        work = queue.Queue()
+        for target in students:
+            work.put(target)
+
+        n_threads = min(opt["concurrency"], len(students))
+        barrier = threading.Barrier(n_threads + len(professors))
+        students_done = threading.Event()
+
+        def run_students(seed):
+            local_rng = random.Random(seed)
+            barrier.wait()
+            while True:
+                try:
+                    target = work.get_nowait()
+                except queue.Empty:
+                    return
+                self._student_flow(Browser(application, stats), target, opt, think, local_rng)
+
+        def run_professor(target):
+            barrier.wait()
+            browser = Browser(application, stats)
+            if not self._login(browser, target[0], opt["password"]):
+                return
+            path = reverse("assignment_submissions", args=[target[1], target[2]])
+            while not students_done.is_set():
+                browser.request("assignment_submissions", "GET", path)
+                time.sleep(max(think, 0.05))
+
+        threads = [
+            threading.Thread(target=self._with_probe, args=(stats, run_students, rng.random()))
+            for _ in range(n_threads)
+        ] + [
+            threading.Thread(target=self._with_probe, args=(stats, run_professor, p))
+            for p in professors
+        ]
+
+        self.stdout.write(
+            f"학생 {len(students)}명(스레드 {n_threads}) · 교수 {len(professors)}명 · "
+            f"제출 {opt['rounds']}회 × 파일 {opt['files']}개 × {opt['file_kb']}KB"
+        )
+        # 500 응답마다 찍히는 traceback 대신 표의 오류 수로 본다
+        request_logger = logging.getLogger("django.request")
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        started = time.perf_counter()
+        try:
+            for t in threads:
+                t.start()
+            for t in threads[:n_threads]:
+                t.join()
+            students_done.set()
+            for t in threads[n_threads:]:
+                t.join()
+        finally:
+            request_logger.setLevel(previous_level)
+        elapsed = time.perf_counter() - started
+
+        self._report(stats, elapsed, opt.get("json_path"))
+
+    # ---------- 대상 선정 ----------
+    def _targets(self, prefix, n_users, n_professors, rng):
+        open_by_team = defaultdict(list)
+        for a_id, team_id, owner in (
+            Assignment.objects.filter(is_closed=False, team__owner__username__startswith=f"{prefix}-")
+            .values_list("id", "team_id", "team__owner__username")
+        ):
+            open_by_team[team_id].append((a_id, owner))
+
+        by_student = {}
+        for username, team_id in (
+            TeamMembership.objects.filter(
+                status="APPROVED", student__username__startswith=f"{prefix}-", team_id__in=open_by_team,
+            ).values_list("student__username", "team_id").order_by("id")
+        ):
+            by_student.setdefault(username, team_id)
+
+        usernames = sorted(by_student)
+        picked = rng.sample(usernames, min(n_users, len(usernames)))
+        students = []
+        for username in picked:
+            team_id = by_student[username]
+            a_id, _ = rng.choice(open_by_team[team_id])
+            students.append((username, team_id, a_id))
+
+        # 교수는 학생들이 몰린 과제를 본다
+        professors, seen = [], set()
+        for _, team_id, a_id in students:
+            if len(professors) >= n_professors:
+                break
+            if team_id in seen:
+                continue
+            seen.add(team_id)
+            owner = next(o for i, o in open_by_team[team_id] if i == a_id)
+            professors.append((owner, team_id, a_id))
+        return students, professors
+
+    # ---------- 시나리오 ----------
+    def _with_probe(self, stats, fn, arg):
+        db = connections["default"]
+        probe = LockProbe(stats)
+        original_commit = probe.wrap_commit(db)
+        try:
+            with db.execute_wrapper(probe):
+                fn(arg)
+        finally:
+            db._commit = original_commit
+            db.close()
+
+    def _login(self, browser, username, password):
+        path = reverse("login")
+        browser.request("login", "GET", path)
+        status = browser.request(
+            "login:post", "POST", path, {"username": username, "password": password}, expect=(302,)
+        )
+        return status == 302
+
+    def _student_flow(self, browser, target, opt, think, rng):
+        username, team_id, assignment_id = target
+        if not self._login(browser, username, opt["password"]):
+            return
+        steps = [
+            ("teacher_team_list", reverse("teacher_team_list")),
+            ("team_detail", reverse("team_detail", args=[team_id])),
+            ("assignment_detail", reverse("assignment_detail", args=[team_id, assignment_id])),
+        ]
+        for route, path in steps:
+            time.sleep(think)
+            browser.request(route, "GET", path)
+
+        submit = reverse("assignment_submit", args=[team_id, assignment_id])
+        for r in range(opt["rounds"]):
+            time.sleep(think)
+            browser.request("assignment_submit", "GET", submit)
+            files = []
+            for i in range(opt["files"]):
+                f = io.BytesIO(rng.randbytes(opt["file_kb"] * 1024))
+                f.name = f"report_{r}_{i}.bin"
+                files.append(f)
+            browser.request(
+                "assignment_submit:post", "POST", submit,
+                {"comment": f"loadtest {username}", "files": files}, expect=(302,),
+            )
+
+    # ---------- 보고 ----------
+    def _report(self, stats, elapsed, json_path):
+        total = sum(len(v) for v in stats.latency.values())
+        total_err = sum(stats.errors.values())
+        rows = {}
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'route':<24}{'req':>7}{'err':>6}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'req/s':>8}"
+        )
+        for route in sorted(stats.latency):
+            values = sorted(stats.latency[route])
+            err = stats.errors[route]
+            row = {
+                "requests": len(values),
+                "errors": err,
+                "error_rate": err / len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+                "rps": len(values) / elapsed,
+                "statuses": dict(stats.statuses[route]),
+            }
+            rows[route] = row
+            self.stdout.write(
+                f"{route:<24}{row['requests']:>7}{err:>6}{row['error_rate']:>7.1%}"
+                f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}"
+                f"{row['rps']:>8.1f}"
+            )
+
+        waits = sorted(stats.lock_waits)
+        lock = {
+            "threshold_ms": stats.lock_threshold * 1000,
+            "waits": len(waits),
+            "total_ms": sum(waits) * 1000,
+            "p95_ms": percentile(waits, 95) * 1000,
+            "max_ms": (waits[-1] if waits else 0) * 1000,
+            "locked_errors": stats.locked_errors,
+        }
+        summary = {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "errors": total_err,
+            "rps": total / elapsed if elapsed else 0,
+            "routes": rows,
+            "sqlite_lock": lock,
+        }
+        self.stdout.write("")
+        self.stdout.write(
+            f"전체 {total}건 / {elapsed:.1f}초 = {summary['rps']:.1f} req/s · 오류 {total_err}건"
+        )
+        self.stdout.write(
+            f"SQLite 잠금 대기(≥{lock['threshold_ms']:.0f}ms 쓰기/커밋): {lock['waits']}회, "
+            f"합계 {lock['total_ms']:.0f}ms, p95 {lock['p95_ms']:.1f}ms, 최대 {lock['max_ms']:.1f}ms · "
+            f"'database is locked' 오류 {lock['locked_errors']}회"
+        )
+        if json_path:
+            with open(json_path, "w", encoding="utf-8") as fh:
+                json.dump(summary, fh, ensure_ascii=False, indent=2)
+            self.stdout.write(f"JSON 저장: {json_path}")
@@ -0,0 +1,187 @@
+import datetime
+import itertools
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from submit import joincodes
+from submit.models import (
+    StudentProfile, Team, TeamMembership,
+    Assignment, Submission, SubmissionFile, StoredBlob,
+    Grade, User,
+)
+
+MEMBERSHIP_WEIGHTS = (("APPROVED", 70), ("PENDING", 15), ("REJECTED", 10), ("LEFT", 5))
+
+
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = "부하 재현용 합성 데이터(사용자/팀/멤버십/과제/제출/파일/성적)를 bulk_create 로 빠르게 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000, help="학생 수")
+        parser.add_argument("--teams", type=int, default=50, help="팀 수")
+        parser.add_argument("--teams-per-professor", type=int, default=5, help="교수 1명당 팀 수")
+        parser.add_argument("--members-per-team", type=int, default=40, help="팀당 멤버십(모든 상태 포함) 수")
+        parser.add_argument("--assignments-per-team", type=int, default=5, help="팀당 과제 수")
+        parser.add_argument("--submit-rate", type=float, default=0.8, help="승인 멤버 중 제출 비율")
+        parser.add_argument("--grade-rate", type=float, default=0.5, help="제출 중 채점 완료 비율")
+        parser.add_argument("--files-per-submission", type=int, default=1)
+        parser.add_argument("--placeholder-files", type=int, default=16, help="서로 다른 placeholder 파일 수")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="load", help="생성할 사용자 아이디 접두어")
+        parser.add_argument("--password", default="load-pass-1234", help="생성되는 모든 계정의 비밀번호")
+        parser.add_argument("--flush", action="store_true", help="같은 접두어로 만든 기존 데이터를 먼저 삭제")
+
+    def handle(self, *args, **opt):
+        rng = random.Random(opt["seed"])
+        self.batch = opt["batch_size"]
+        prefix = opt["prefix"]
+        started = time.perf_counter()
+
+        existing = User.objects.filter(username__startswith=f"{prefix}-")
+        if existing.exists():
+            if not opt["flush"]:
+                raise CommandError(f"'{prefix}-' 사용자가 이미 있습니다. --flush 또는 다른 --prefix 를 사용하세요.")
+            existing.delete()
+
+        if opt["members_per_team"] > opt["students"]:
+            raise CommandError("--members-per-team 는 --students 보다 클 수 없습니다.")
+
+        # 비밀번호 해시는 한 번만 계산(PBKDF2 는 건당 수십 ms)
+        password = make_password(opt["password"])
+        now = timezone.now().replace(microsecond=0)
+        counts = Counter()
+
+        with transaction.atomic():
+            n_prof = max(1, -(-opt["teams"] // opt["teams_per_professor"]))
+            professors = self._bulk(User, (
+                User(username=f"{prefix}-p{i:05d}", first_name=f"교수{i}", password=password, is_staff=True)
+                for i in range(n_prof)
+            ), counts)
+            students = self._bulk(User, (
+                User(username=f"{prefix}-s{i:07d}", first_name=f"학생{i}", password=password)
+                for i in range(opt["students"])
+            ), counts)
+            self._bulk(StudentProfile, (
+                StudentProfile(user=u, student_id=f"{prefix}{i:09d}") for i, u in enumerate(students)
+            ), counts)
+
+            # 팀코드: 할당기에서 한 번에 구간을 받는다(기존 팀과 겹치지 않음)
+            codes = iter(joincodes.allocate_many(opt["teams"]))
+            teams = self._bulk(Team, (
+                Team(owner=professors[i // opt["teams_per_professor"]], name=f"{prefix} 팀 {i:05d}",
+                     description="seed_load", join_code=next(codes))
+                for i in range(opt["teams"])
+            ), counts)
+
+            statuses, weights = zip(*MEMBERSHIP_WEIGHTS)
+            approved = {}
+            memberships = []
+            for t in teams:
+                picked = rng.sample(students, opt["members_per_team"])
+                for u, st in zip(picked, rng.choices(statuses, weights, k=len(picked))):
+                    requested = now - datetime.timedelta(days=rng.randint(1, 60), minutes=rng.randint(0, 1439))
+                    decided = requested + datetime.timedelta(hours=rng.randint(1, 48)) if st != "PENDING" else None
+                    memberships.append(TeamMembership(
+                        team=t, student=u, status=st, requested_at=requested, decided_at=decided,
+                        decided_by=t.owner if decided else None,
+                        joined_at=decided if st == "APPROVED" else None,
+                    ))
+                    if st == "APPROVED":
+                        approved.setdefault(t.id, []).append(u)
+            self._bulk(TeamMembership, memberships, counts)
+            del memberships
+
+            assignments = self._bulk(Assignment, (
+                Assignment(
+                    team=t, title=f"과제 {k + 1}", description="seed_load",
+                    due_at=now + datetime.timedelta(days=rng.randint(-14, 14), hours=rng.randint(0, 23)),
+                    max_score=100, created_by=t.owner,
+                )
+                for t in teams for k in range(opt["assignments_per_team"])
+            ), counts)
+            Assignment.objects.filter(pk__in=[a.pk for a in assignments if a.due_at < now - datetime.timedelta(days=7)]) \
+                .update(is_closed=True)
+
+            blobs = self._placeholder_blobs(opt["placeholder_files"], prefix)
+
+            # 제출/파일/성적은 과제 묶음 단위로 만들어 메모리를 일정하게 유지
+            for chunk in batched(assignments, max(1, self.batch // max(1, opt["members_per_team"]))):
+                subs = []
+                for a in chunk:
+                    for u in approved.get(a.team_id, []):
+                        if rng.random() >= opt["submit_rate"]:
+                            continue
+                        submitted = a.due_at - datetime.timedelta(hours=rng.uniform(-6, 72))
+                        subs.append(Submission(
+                            assignment=a, student=u, comment="",
+                            status="late" if submitted > a.due_at else "submitted",
+                            submitted_at=submitted,
+                        ))
+                subs = self._bulk(Submission, subs, counts)
+
+                files = []
+                for s in subs:
+                    for v in range(1, opt["files_per_submission"] + 1):
+                        digest, name, size = blobs[rng.randrange(len(blobs))]
+                        files.append(SubmissionFile(
+                            submission=s, file=name, version=v, size=size, sha256=digest,
+                            original_name=f"report_v{v}.txt",
+                        ))
+                self._bulk(SubmissionFile, files, counts)
+
+                graded = [s for s in subs if rng.random() < opt["grade_rate"]]
+                self._bulk(Grade, (
+                    Grade(submission=s, score=rng.randint(40, 100), feedback_text="", grader=s.assignment.team.owner)
+                    for s in graded
+                ), counts)
+                Submission.objects.filter(pk__in=[s.pk for s in graded]).update(status="graded")
+
+            # placeholder 참조 수는 실제 행 수로 다시 맞춘다(--flush 로 지운 이전 실행분 포함)
+            for digest, _, _ in blobs:
+                StoredBlob.objects.filter(pk=digest).update(
+                    refcount=SubmissionFile.objects.filter(sha256=digest).count()
+                )
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        for model, n in counts.items():
+            self.stdout.write(f"  {model:<16} {n:>9,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total:,} 행 생성 ({elapsed:.1f}초, {total / max(elapsed, 1e-9):,.0f} 행/초) · 비밀번호: {opt['password']}"
+        ))
+
+    def _bulk(self, model, objs, counts):
+        created = []
+        for chunk in batched(objs, self.batch):
+            created.extend(model.objects.bulk_create(chunk, batch_size=self.batch))
+        counts[model.__name__] += len(created)
+        return created
+
+    def _placeholder_blobs(self, n, prefix):
+        """내용 주소 저장소에 작은 placeholder 파일 n개를 올리고 (digest, 저장 이름, 크기) 목록 반환"""
+        field = SubmissionFile._meta.get_field("file")
+        blobs = []
+        for i in range(max(1, n)):
+            data = f"{prefix} placeholder #{i}\n".encode()
+            name = field.storage.save(field.generate_filename(None, f"placeholder{i}.txt"), ContentFile(data))
+            digest = field.storage.digest_of(name)
+            StoredBlob.objects.get_or_create(sha256=digest, defaults={"name": name, "size": len(data)})
+            blobs.append((digest, name, len(data)))
+        return blobs
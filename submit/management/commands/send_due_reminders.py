@@ -0,0 +1,126 @@
+import datetime
+import itertools
+import re
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from submit import notifications
+from submit.models import Assignment, Notification, ScheduleMark, Submission, TeamMembership
+
+_WINDOW = re.compile(r"(\d+)([dhm])")
+_UNITS = {"d": "days", "h": "hours", "m": "minutes"}
+# 지난 실행 이후 만들어졌거나 고쳐진 과제(updated_at)를 다시 볼 때의 여유.
+# updated_at 은 저장 직전(쓰기 잠금을 얻기 전)에 정해지므로, 지난 실행 시각보다 이른 값으로 늦게 커밋될 수 있다.
+UPDATE_SLACK = datetime.timedelta(minutes=5)
+
+
+def parse_window(text):
+    match = _WINDOW.fullmatch(text.strip())
+    if not match:
+        raise CommandError(f"구간 형식이 올바르지 않습니다: {text!r} (예: 24h, 90m, 2d)")
+    return datetime.timedelta(**{_UNITS[match[2]]: int(match[1])})
+
+
+def window_label(window):
+    minutes = int(window.total_seconds()) // 60
+    if minutes % 60:
+        return f"{minutes}분"
+    return f"{minutes // 60}시간"
+
+
+class Command(BaseCommand):
+    help = (
+        "마감이 DUE_REMINDER_WINDOWS(기본 24시간·1시간) 안으로 들어온 열린 과제의 미제출 승인 멤버에게 "
+        "due_soon 알림을 한 번씩 보냅니다. 구간마다 지난번에 본 마감 시각(high-water mark) 이후와 "
+        "그 뒤에 만들어졌거나 고쳐진(재개·마감 변경) 과제만 봅니다. "
+        "cron 으로 주기 실행하거나 --loop 로 계속 띄웁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--windows", help="쉼표로 구분한 구간(예: 24h,1h). 기본은 DUE_REMINDER_WINDOWS")
+        parser.add_argument("--batch", type=int, default=200, help="미제출자를 한 번에 찾을 과제 수")
+        parser.add_argument("--loop", action="store_true", help="끝나지 않고 --interval 마다 반복")
+        parser.add_argument("--interval", type=float, default=300.0, help="--loop 반복 간격(초)")
+
+    def handle(self, *args, **opt):
+        if opt["windows"]:
+            windows = [parse_window(w) for w in opt["windows"].split(",") if w.strip()]
+        else:
+            windows = list(getattr(settings, "DUE_REMINDER_WINDOWS", ()))
+        if not windows:
+            raise CommandError("알림 구간이 없습니다.")
+        windows.sort()
+
+        while True:
+            now = timezone.now()
+            # 짧은 구간부터: 더 짧은 구간에 들어간 과제는 그쪽 알림 하나만 보낸다
+            floor = now
+            for window in windows:
+                started = time.perf_counter()
+                assignments, sent = self._run_window(now, floor, window, opt["batch"])
+                self.stdout.write(
+                    f"{window_label(window)}: 과제 {assignments}개, 알림 {sent}건 "
+                    f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+                )
+                floor = now + window
+            if not opt["loop"]:
+                break
+            time.sleep(opt["interval"])
+
+    def _run_window(self, now, floor, window, batch_size):
+        """
+        마감이 (floor, now + window] 인 열린 과제 중 지난 위치 이후로 들어온 것, 그리고 지난 실행 뒤에
+        만들어졌거나 고쳐진 것(이미 지나간 구간에 새로 생기거나, 다시 열리거나, 마감이 옮겨진 과제)을 처리하고
+        위치를 옮긴다(한 트랜잭션). 이미 알림을 받은 학생은 _missing 이 거른다.
+        """
+        name = f"due_soon:{int(window.total_seconds())}"
+        label = window_label(window)
+        upper = now + window
+        sent = 0
+        with transaction.atomic():
+            mark = ScheduleMark.objects.filter(pk=name).first()
+            # (is_closed, due_at) 인덱스 범위 검색
+            assignments = Assignment.objects.filter(is_closed=False, due_at__gt=floor, due_at__lte=upper)
+            if mark:
+                assignments = assignments.filter(
+                    Q(due_at__gt=mark.high_water) | Q(updated_at__gt=mark.updated_at - UPDATE_SLACK)
+                )
+            assignments = list(assignments.order_by("due_at", "id"))
+            it = iter(assignments)
+            while batch := list(itertools.islice(it, batch_size)):
+                for assignment, student_ids in self._missing(batch, label):
+                    sent += notifications.due_soon(assignment, student_ids, label)
+            ScheduleMark.objects.update_or_create(pk=name, defaults={"high_water": upper})
+        return len(assignments), sent
+
+    @staticmethod
+    def _missing(batch, label):
+        """
+        과제 묶음의 (과제, [미제출 승인 멤버]) — 쿼리 한 번(멤버십 × 과제 조인에 제출/기존 알림 anti-join).
+        제출이 없거나 not_submitted 이면 미제출. 같은 과제·구간 알림을 이미 받은 학생은 뺀다.
+        """
+        by_id = {a.pk: a for a in batch}
+        submitted = Submission.objects.filter(
+            assignment_id=OuterRef("assignment_id"), student_id=OuterRef("student_id"),
+        ).exclude(status="not_submitted")
+        reminded = Notification.objects.filter(
+            user_id=OuterRef("student_id"), type=notifications.DUE_SOON,
+            payload__assignment=OuterRef("assignment_id"), payload__window=label,
+        )
+        rows = (
+            TeamMembership.objects
+            .filter(status="APPROVED", team__assignments__in=list(by_id))
+            .annotate(assignment_id=F("team__assignments__id"))
+            .filter(~Exists(submitted), ~Exists(reminded))
+            .values_list("assignment_id", "student_id")
+        )
+        missing = defaultdict(list)
+        for assignment_id, student_id in rows:
+            missing[assignment_id].append(student_id)
+        return [(by_id[a_id], ids) for a_id, ids in missing.items()]
@@ -0,0 +1,264 @@
+import contextvars
+import datetime
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+from django.utils import timezone
+
+logger = logging.getLogger("submit.profile")
+
+# 지금 측정 중인 요청의 프로파일(샘플링되지 않은 요청이면 None)
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+class _Profile:
+    __slots__ = ("started", "sql_count", "sql_time", "tpl_time", "tpl_depth", "bytes_in", "bytes_out")
+
+    def __init__(self, bytes_in):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.tpl_time = 0.0
+        self.tpl_depth = 0
+        self.bytes_in = bytes_in
+        self.bytes_out = None
+
+
+# =========================
+# 템플릿 렌더 시간
+# =========================
+_original_render = DjangoTemplate.render
+
+
+def _timed_render(self, context=None, request=None):
+    profile = _current.get()
+    if profile is None:
+        return _original_render(self, context, request)
+    # render_to_string 안에서 또 render 를 부르는 경우 바깥 것만 센다
+    profile.tpl_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        profile.tpl_depth -= 1
+        if profile.tpl_depth == 0:
+            profile.tpl_time += time.perf_counter() - start
+
+
+def _install_template_timer():
+    """처음으로 샘플링된 요청에서 건다 → REQUEST_PROFILE_SAMPLE_RATE=0 이면 Template.render 를 건드리지 않는다"""
+    if DjangoTemplate.render is not _timed_render:
+        DjangoTemplate.render = _timed_render
+
+
+# =========================
+# 미들웨어
+# =========================
+class RequestProfileMiddleware:
+    """
+    요청별 총 시간, SQL 수/시간, 템플릿 렌더 시간, 요청/응답 바이트를 측정해
+    Server-Timing 헤더와 'submit.profile' 로그 한 줄(JSON)로 남긴다.
+    REQUEST_PROFILE_SAMPLE_RATE 비율만 측정하고, 나머지 요청은 난수 하나만 뽑고 그대로 통과시킨다.
+    ASGI 에서는 async 로 동작한다(동기 미들웨어가 하나라도 있으면 모든 요청이 동기 스레드를 거친다).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = self._sample(request)
+        if profile is None:
+            return self.get_response(request)
+
+        token = _current.set(profile)
+        try:
+            with self._probe(profile):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = self._sample(request)
+        if profile is None:
+            return await self.get_response(request)
+
+        # DB 연결은 스레드마다 따로 → ORM 이 도는 스레드(이 요청의 thread_sensitive 스레드)에서 걸고 푼다
+        token = _current.set(profile)
+        probe = await sync_to_async(self._probe)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(probe.close)()
+            _current.reset(token)
+        return self._finish(request, response, profile)
+
+    @staticmethod
+    def _sample(request):
+        rate = getattr(settings, "REQUEST_PROFILE_SAMPLE_RATE", 0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return None
+        _install_template_timer()
+        return _Profile(int(request.META.get("CONTENT_LENGTH") or 0))
+
+    def _probe(self, profile):
+        """지금 스레드의 DB 연결마다 쿼리 측정을 건다(닫으면 풀림)"""
+        stack = ExitStack()
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(self._sql_probe(profile)))
+        return stack
+
+    def _finish(self, request, response, profile):
+        total = time.perf_counter() - profile.started
+        if getattr(settings, "REQUEST_PROFILE_SERVER_TIMING", True):
+            response["Server-Timing"] = self._server_timing(profile, total)
+
+        if not response.streaming:
+            profile.bytes_out = len(response.content)
+        elif response.has_header("Content-Length"):
+            # FileResponse 등: 감싸면 wsgi.file_wrapper(sendfile)를 못 쓰게 되므로 헤더 값을 쓴다
+            profile.bytes_out = int(response["Content-Length"])
+        else:
+            # 길이를 모르는 스트리밍(ZIP 등)은 다 보낸 뒤에 기록
+            count = self._acount_stream if response.is_async else self._count_stream
+            response.streaming_content = count(response.streaming_content, request, response, profile, total)
+            return response
+        self._log(request, response, profile, total)
+        return response
+
+    @staticmethod
+    def _sql_probe(profile):
+        def probe(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                profile.sql_count += 1
+                profile.sql_time += time.perf_counter() - start
+        return probe
+
+    @staticmethod
+    def _server_timing(profile, total):
+        return ", ".join([
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={profile.sql_time * 1000:.1f};desc="{profile.sql_count} queries"',
+            f"tpl;dur={profile.tpl_time * 1000:.1f}",
+            f'in;desc="{profile.bytes_in} B"',
+        ])
+
+    def _count_stream(self, chunks, request, response, profile, total):
+        sent = 0
+        try:
+            for chunk in chunks:
+                sent += len(chunk)
+                yield chunk
+        finally:
+            profile.bytes_out = sent
+            self._log(request, response, profile, total)
+
+    async def _acount_stream(self, chunks, request, response, profile, total):
+        sent = 0
+        try:
+            async for chunk in chunks:
+                sent += len(chunk)
+                yield chunk
+        finally:
+            profile.bytes_out = sent
+            self._log(request, response, profile, total)
+
+    @staticmethod
+    def _log(request, response, profile, total):
+        match = request.resolver_match
+        record = {
+            "route": match.url_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "sql_count": profile.sql_count,
+            "sql_ms": round(profile.sql_time * 1000, 2),
+            "tpl_ms": round(profile.tpl_time * 1000, 2),
+            "bytes_in": profile.bytes_in,
+            "bytes_out": profile.bytes_out,
+        }
+        logger.info(json.dumps(record, ensure_ascii=False), extra={"profile": record})
+
+
+# =========================
+# 요청 도착 시각
+# =========================
+# ASGI scope 에 남기는 도착 시각 키(stamp_arrival)
+ARRIVAL_SCOPE_KEY = "submit.arrived_at"
+
+
+def arrival_time(request):
+    """ArrivalTimeMiddleware 가 찍은 도착 시각(미들웨어 밖에서 만든 요청이면 지금)."""
+    return getattr(request, "arrived_at", None) or timezone.now()
+
+
+def stamp_arrival(app):
+    """
+    ASGI 앱 래퍼(config/asgi.py). Django 의 ASGIHandler 는 요청 본문을 끝까지 받은 뒤에 요청 객체를 만들고
+    미들웨어를 부르므로, 미들웨어에서 찍은 시각은 큰 업로드일수록 업로드 시간만큼 늦다.
+    서버가 앱을 부르는 순간(헤더 도착)의 시각을 scope 에 남겨 ArrivalTimeMiddleware 가 그 값을 쓰게 한다.
+    """
+    async def application(scope, receive, send):
+        if scope["type"] == "http":
+            scope = {**scope, ARRIVAL_SCOPE_KEY: timezone.now()}
+        return await app(scope, receive, send)
+    return application
+
+
+class ArrivalTimeMiddleware:
+    """
+    request.arrived_at 에 요청 도착 시각을 남긴다. 제출 접수 시각(지각 판단 기준)으로 쓰므로
+    본문을 읽거나 DB 를 기다리기 전에 찍도록 MIDDLEWARE 맨 앞에 둔다.
+    WSGI 는 본문을 읽기 전에 미들웨어가 돌지만, ASGI 는 본문을 다 받은 뒤에 돈다 → stamp_arrival 이 scope 에 남긴 시각을 쓴다.
+    TRUST_X_REQUEST_START 면 프록시가 붙인 X-Request-Start 가 더 이를 때 그 값을 쓴다(지금보다 늦은 값은 무시).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        now = getattr(request, "scope", {}).get(ARRIVAL_SCOPE_KEY) or timezone.now()
+        if getattr(settings, "TRUST_X_REQUEST_START", False):
+            now = min(now, self._proxy_start(request.META.get("HTTP_X_REQUEST_START", "")) or now)
+        request.arrived_at = now
+        # async 체인이면 get_response 가 코루틴을 돌려주고 그대로 await 된다
+        return self.get_response(request)
+
+    @staticmethod
+    def _proxy_start(value):
+        # nginx: "t=${msec}" (초.밀리초), 일부 프록시는 마이크로초 정수
+        value = value.strip().removeprefix("t=")
+        try:
+            seconds = float(value)
+        except ValueError:
+            return None
+        if seconds > 1e14:
+            seconds /= 1e6
+        try:
+            return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
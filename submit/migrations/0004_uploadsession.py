@@ -0,0 +1,88 @@
+# Generated by Django 5.0.6 on 2026-10-17 23:44
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0003_team_cover"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="submissionfile",
+            options={},
+        ),
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255, verbose_name="파일명")),
+                (
+                    "total_size",
+                    models.PositiveBigIntegerField(verbose_name="전체 크기(Byte)"),
+                ),
+                (
+                    "received",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="수신 오프셋(Byte)"
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="누적 체크섬(CRC32)"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일시"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정일시"),
+                ),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to="submit.assignment",
+                        verbose_name="과제",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="학생",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "업로드 세션",
+                "verbose_name_plural": "업로드 세션",
+                "indexes": [
+                    models.Index(
+                        fields=["assignment", "student"],
+                        name="submit_uplo_assignm_2bfd92_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.6 on 2026-10-17 23:45
+
+import submit.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0004_uploadsession"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                (
+                    "sha256",
+                    models.CharField(
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="SHA-256",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="저장 경로")),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="크기(Byte)"
+                    ),
+                ),
+                (
+                    "refcount",
+                    models.PositiveIntegerField(default=0, verbose_name="참조 수"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일시"),
+                ),
+            ],
+            options={
+                "verbose_name": "저장 파일(blob)",
+                "verbose_name_plural": "저장 파일(blob)",
+            },
+        ),
+        migrations.AddField(
+            model_name="submissionfile",
+            name="original_name",
+            field=models.CharField(
+                blank=True, max_length=255, verbose_name="원본 파일명"
+            ),
+        ),
+        migrations.AddField(
+            model_name="submissionfile",
+            name="sha256",
+            field=models.CharField(
+                blank=True, db_index=True, max_length=64, verbose_name="SHA-256"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="submissionfile",
+            name="file",
+            field=models.FileField(
+                storage=submit.storage.submission_storage,
+                upload_to="submissions/",
+                verbose_name="파일",
+            ),
+        ),
+    ]
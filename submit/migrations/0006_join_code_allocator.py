@@ -0,0 +1,57 @@
+# Generated by Django 5.0.6 on 2026-10-18 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0005_content_addressed_storage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JoinCodeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "next_index",
+                    models.BigIntegerField(default=0, verbose_name="다음 인덱스"),
+                ),
+            ],
+            options={
+                "verbose_name": "팀코드 카운터",
+                "verbose_name_plural": "팀코드 카운터",
+            },
+        ),
+        migrations.CreateModel(
+            name="RetiredJoinCode",
+            fields=[
+                (
+                    "code",
+                    models.CharField(
+                        max_length=6,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="팀코드",
+                    ),
+                ),
+                (
+                    "retired_at",
+                    models.DateTimeField(db_index=True, verbose_name="반납일시"),
+                ),
+            ],
+            options={
+                "verbose_name": "반납된 팀코드",
+                "verbose_name_plural": "반납된 팀코드",
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-18 00:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0006_join_code_allocator"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionReceipt",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(editable=False, primary_key=True, serialize=False),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("accepted", "반영됨"),
+                            ("superseded", "이후 제출로 대체됨"),
+                            ("failed", "반영 실패"),
+                        ],
+                        max_length=20,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("accepted_at", models.DateTimeField(verbose_name="접수일시")),
+                (
+                    "processed_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="반영일시"),
+                ),
+                (
+                    "file_count",
+                    models.PositiveIntegerField(default=0, verbose_name="파일 수"),
+                ),
+                (
+                    "error",
+                    models.CharField(blank=True, max_length=255, verbose_name="오류"),
+                ),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="receipts",
+                        to="submit.assignment",
+                        verbose_name="과제",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_receipts",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="학생",
+                    ),
+                ),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="receipts",
+                        to="submit.submission",
+                        verbose_name="제출",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "제출 접수증",
+                "verbose_name_plural": "제출 접수증",
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-18 00:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0007_submissionreceipt"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleMark",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="이름",
+                    ),
+                ),
+                ("high_water", models.DateTimeField(verbose_name="처리한 위치")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정일시"),
+                ),
+            ],
+            options={
+                "verbose_name": "주기 작업 진행 위치",
+                "verbose_name_plural": "주기 작업 진행 위치",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["is_closed", "due_at"], name="assignment_open_due_idx"
+            ),
+        ),
+    ]
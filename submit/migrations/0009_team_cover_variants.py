@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0008_due_reminders"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="cover_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="대표 이미지 변형",
+            ),
+        ),
+    ]
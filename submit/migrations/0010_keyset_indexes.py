@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-18 01:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submit", "0009_team_cover_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="teammembership",
+            name="submit_team_team_id_ea86aa_idx",
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["assignment", "submitted_at"],
+                name="submit_subm_assignm_ba9652_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["assignment", "status", "submitted_at"],
+                name="submit_subm_assignm_404bec_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teammembership",
+            index=models.Index(
+                fields=["team", "status", "requested_at"],
+                name="submit_team_team_id_47a9ce_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teammembership",
+            index=models.Index(
+                fields=["student", "requested_at"],
+                name="submit_team_student_c48739_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,16 @@
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.utils import timezone
-import random, string
+from collections import Counter
+from pathlib import Path
+import os, uuid
+
+from .storage import submission_storage
 
 
 # ===== 학생 프로필(선택) =====
@@ -32,6 +41,8 @@ class Team(models.Model):
     updated_at = models.DateTimeField("수정일시", auto_now=True)
 
     cover = models.ImageField("대표 이미지", upload_to="team_covers/", blank=True, null=True)  
+    # 폭별 WebP/JPEG 변형의 이름·크기(submit.covers)
+    cover_variants = models.JSONField("대표 이미지 변형", default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name = "팀"
@@ -44,25 +55,85 @@ class Team(models.Model):
     def __str__(self):
         return f"{self.name}"
 
-    @staticmethod
-    def _generate_code():
-        return ''.join(random.choices(string.digits, k=6))
+    # 할당기 밖에서 만들어진(이전 방식의 무작위) 코드와 겹칠 때 다시 받는 최대 횟수
+    JOIN_CODE_ATTEMPTS = 8
 
     def regen_join_code(self, save=True):
-        # 유니크 보장 루프
-        while True:
-            code = self._generate_code()
-            if not Team.objects.filter(join_code=code).exists():
-                self.join_code = code
-                self.join_code_generated_at = timezone.now()
-                if save:
-                    self.save(update_fields=["join_code", "join_code_generated_at"])
-                return self.join_code
+        from . import generations, joincodes
+        old = self.join_code
+        if not save:
+            self.join_code = joincodes.allocate()
+            self.join_code_generated_at = timezone.now()
+            return self.join_code
+        self.join_code = ""
+        self.join_code_generated_at = timezone.now()
+        # save() 를 거치지 않으므로 세대(첫 화면 팀 카드·팀 화면 캐시)를 여기서 올린다
+        self._save_with_new_code(update_fields=["join_code", "join_code_generated_at", "updated_at"])
+        generations.bump_team(self.pk)
+        joincodes.retire(old)
+        return self.join_code
+
+    def _save_with_new_code(self, *args, **kwargs):
+        """
+        할당기에서 코드를 받아 저장. 코드는 DB 를 찾아보지 않고 받으므로, 할당기 이전에
+        무작위로 만든 코드와 겹친 경우에만 유니크 제약 위반 → 다음 코드로 다시 시도한다.
+        """
+        from . import joincodes
+        for _ in range(self.JOIN_CODE_ATTEMPTS):
+            self.join_code = joincodes.allocate()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if not Team.objects.filter(join_code=self.join_code).exclude(pk=self.pk).exists():
+                    # 팀코드가 아닌 다른 제약(팀명 중복 등) → 받은 코드는 바로 돌려주고 그대로 실패
+                    joincodes.retire(self.join_code, reusable_now=True)
+                    self.join_code = ""
+                    raise
+        raise IntegrityError("팀코드를 할당하지 못했습니다.")
 
     def save(self, *args, **kwargs):
+        from . import generations
+        adding = self._state.adding
         if not self.join_code:
-            self.regen_join_code(save=False)
-        super().save(*args, **kwargs)
+            self._save_with_new_code(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        generations.bump_team(self.pk)
+        if adding:
+            generations.bump_user(self.owner_id)
+
+    def delete(self, *args, **kwargs):
+        from . import generations, joincodes
+        from .access import invalidate_team
+        # 멤버십은 CASCADE 로 SQL 삭제되어 TeamMembership.delete() 를 거치지 않는다
+        invalidate_team(self.pk)
+        generations.bump_team(self.pk)
+        code = self.join_code
+        result = super().delete(*args, **kwargs)
+        joincodes.retire(code)
+        return result
+
+
+# ===== 팀코드 할당 상태 (submit.joincodes) =====
+class JoinCodeSequence(models.Model):
+    """지금까지 나눠 준 순열 인덱스(행 하나만 사용)"""
+    next_index = models.BigIntegerField("다음 인덱스", default=0)
+
+    class Meta:
+        verbose_name = "팀코드 카운터"
+        verbose_name_plural = "팀코드 카운터"
+
+
+class RetiredJoinCode(models.Model):
+    """삭제/재발급으로 반납된 팀코드. 쿨다운 후 새 팀에 다시 나간다."""
+    code = models.CharField("팀코드", max_length=6, primary_key=True)
+    retired_at = models.DateTimeField("반납일시", db_index=True)
+
+    class Meta:
+        verbose_name = "반납된 팀코드"
+        verbose_name_plural = "반납된 팀코드"
 
 
 # ===== 팀 멤버십(가입 요청/승인/참가) =====
@@ -93,13 +164,34 @@ class TeamMembership(models.Model):
             models.UniqueConstraint(fields=["team", "student"], name="uq_team_student"),
         ]
         indexes = [
-            models.Index(fields=["team", "status"]),
+            # 팀장 요청 목록(상태별 요청일시 순), 내 참가 요청(요청일시 순) 키셋 페이지
+            models.Index(fields=["team", "status", "requested_at"]),
             models.Index(fields=["student", "status"]),
+            models.Index(fields=["student", "requested_at"]),
         ]
 
     def __str__(self):
         return f"{self.team} - {self.student.username} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        from . import events, generations
+        from .access import invalidate_team
+        super().save(*args, **kwargs)
+        invalidate_team(self.team_id)
+        generations.bump_team(self.team_id)
+        generations.bump_user(self.student_id)
+        events.membership_changed(self)
+
+    def delete(self, *args, **kwargs):
+        from . import generations
+        from .access import invalidate_team
+        team_id = self.team_id
+        result = super().delete(*args, **kwargs)
+        invalidate_team(team_id)
+        generations.bump_team(team_id)
+        generations.bump_user(self.student_id)
+        return result
+
     def approve(self, by_user):
         self.status = "APPROVED"
         now = timezone.now()
@@ -143,10 +235,26 @@ class Assignment(models.Model):
 
     def __str__(self): return f"{self.title} [{self.team.name}]"
 
+    def save(self, *args, **kwargs):
+        from . import generations
+        super().save(*args, **kwargs)
+        generations.bump_team(self.team_id)
+
+    def delete(self, *args, **kwargs):
+        from . import generations
+        team_id = self.team_id
+        result = super().delete(*args, **kwargs)
+        generations.bump_team(team_id)
+        return result
+
     class Meta:
         verbose_name = "과제"
         verbose_name_plural = "과제"
         ordering = ["due_at"]
+        indexes = [
+            # 마감 임박 알림(send_due_reminders): 열린 과제를 마감 구간으로 찾는다
+            models.Index(fields=["is_closed", "due_at"], name="assignment_open_due_idx"),
+        ]
 
 
 # ===== 제출/파일/성적 =====
@@ -169,22 +277,197 @@ class Submission(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["assignment", "student"], name="uq_assignment_student"),
         ]
+        indexes = [
+            # 제출 현황 키셋 페이지(제출일시 순, 상태 필터)
+            models.Index(fields=["assignment", "submitted_at"]),
+            models.Index(fields=["assignment", "status", "submitted_at"]),
+        ]
     def __str__(self): return f"{self.assignment} / {self.student.username}"
 
+    def save(self, *args, **kwargs):
+        from . import events
+        super().save(*args, **kwargs)
+        events.submissions_changed(self.assignment_id)
+
+
+# ===== 내용 주소 저장 blob (SHA-256, 참조 카운트) =====
+class StoredBlob(models.Model):
+    sha256 = models.CharField("SHA-256", max_length=64, primary_key=True)
+    name = models.CharField("저장 경로", max_length=255)
+    size = models.PositiveBigIntegerField("크기(Byte)", default=0)
+    refcount = models.PositiveIntegerField("참조 수", default=0)
+    created_at = models.DateTimeField("생성일시", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "저장 파일(blob)"
+        verbose_name_plural = "저장 파일(blob)"
+
+    def __str__(self): return f"{self.sha256[:12]} x{self.refcount}"
+
+    @classmethod
+    def acquire(cls, digest, name, size):
+        """참조 +1 (없으면 refcount=1 로 생성)"""
+        with transaction.atomic():
+            if not cls.objects.filter(pk=digest).update(refcount=F("refcount") + 1):
+                cls.objects.create(sha256=digest, name=name, size=size, refcount=1)
+
+    @classmethod
+    def release(cls, digest, storage):
+        """참조 -1. 마지막 참조가 사라지면 커밋 후 실제 파일 삭제"""
+        cls.release_many([digest], storage)
+
+    @classmethod
+    def release_many(cls, digests, storage):
+        """여러 참조를 한 번에 놓는다(파일 수와 무관하게 UPDATE/SELECT/DELETE 각 1회)"""
+        counts = Counter(d for d in digests if d)
+        if not counts:
+            return
+        with transaction.atomic():
+            cls.objects.filter(pk__in=counts).update(refcount=Greatest(
+                F("refcount") - Case(*[When(pk=d, then=Value(n)) for d, n in counts.items()], default=Value(0)),
+                Value(0),
+            ))
+            orphans = dict(cls.objects.filter(pk__in=counts, refcount=0).values_list("sha256", "name"))
+            if not orphans:
+                return
+            cls.objects.filter(pk__in=orphans, refcount=0).delete()
+
+        transaction.on_commit(lambda: cls.drop_unreferenced(orphans, storage))
+
+    @classmethod
+    def drop_unreferenced(cls, blobs, storage):
+        """
+        blobs: {digest: 저장 이름}. 그 사이 같은 내용이 다시 저장돼 참조(행)가 생긴 것은 남기고 나머지 파일을 지운다.
+        확인과 삭제를 쓰기 트랜잭션(submit.sqlite: BEGIN IMMEDIATE → 쓰기 잠금) 안에서 한다
+        → 참조를 잡는 쪽(acquire 후 SubmissionFile.save 의 재확인)과 엇갈리지 않는다.
+        """
+        with transaction.atomic():
+            alive = set(cls.objects.filter(pk__in=blobs).values_list("sha256", flat=True))
+            for digest, name in blobs.items():
+                if digest not in alive and storage.exists(name):
+                    storage.delete(name)
+
 
 class SubmissionFile(models.Model):
     submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="files", verbose_name="제출")
-    file = models.FileField("파일", upload_to="submissions/")
+    file = models.FileField("파일", upload_to="submissions/", storage=submission_storage)
     version = models.PositiveIntegerField("버전", default=1)
     size = models.PositiveIntegerField("크기(Byte)", default=0)
+    sha256 = models.CharField("SHA-256", max_length=64, blank=True, db_index=True)
+    original_name = models.CharField("원본 파일명", max_length=255, blank=True)
+
+    def __str__(self): return self.display_name
+
+    @property
+    def display_name(self):
+        return self.original_name or os.path.basename(self.file.name)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        content = None
+        if adding and self.file and not self.file._committed:
+            # 내용 주소 저장소에 먼저 저장(같은 내용이면 쓰기 생략) → 저장 이름이 곧 digest
+            content = self.file.file
+            self.original_name = self.original_name or os.path.basename(self.file.name)
+            self.file.save(self.file.name, content, save=False)
+            self.sha256 = self.file.storage.digest_of(self.file.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.sha256:
+                StoredBlob.acquire(self.sha256, self.file.name, self.size)
+                if content is not None:
+                    # 저장(쓰기 생략)과 참조 사이에 마지막 참조가 놓여 blob 이 지워졌을 수 있다 → 참조를 잡은 뒤 다시 확인
+                    self.file.storage.ensure(self.file.name, content)
+
+
+# ===== 제출 파일 삭제 → blob 참조 반납 =====
+# 팀/과제/제출/사용자를 지우면 제출 파일은 CASCADE 로 함께 지워져 SubmissionFile.delete() 를 거치지 않는다.
+# 삭제 신호로 모든 경로(인스턴스·QuerySet·CASCADE·관리자 화면)를 잡고, 반납은 삭제 한 번에 한 번(release_many)만 한다:
+#   Collector 는 pre_delete 를 모두 보낸 뒤 행을 지우고 post_delete 를 보낸다
+#   → pre_delete 에서 모아 두었다가 첫 post_delete 에서 삭제와 같은 트랜잭션 안에서 한꺼번에 반납.
+# 모으는 곳은 delete() 를 부른 객체(origin: 인스턴스 또는 QuerySet).
+_BLOB_BATCH = "_released_blobs"
+
+
+@receiver(pre_delete, sender=SubmissionFile)
+def _collect_released_blob(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        origin.__dict__.setdefault(_BLOB_BATCH, {})[instance.pk] = (instance.sha256, instance.file.name)
+
+
+@receiver(post_delete, sender=SubmissionFile)
+def _release_blobs(sender, instance, origin=None, **kwargs):
+    if origin is None:
+        batch = {instance.pk: (instance.sha256, instance.file.name)}
+    else:
+        batch = origin.__dict__.pop(_BLOB_BATCH, None)
+    if not batch:
+        return
+    storage = sender._meta.get_field("file").storage
+    StoredBlob.release_many([digest for digest, _ in batch.values()], storage)
+    # 내용 주소 저장 이전에 올라온 파일은 참조 수가 없으므로 커밋 후 바로 삭제
+    legacy = [name for digest, name in batch.values() if not digest and name]
+    if legacy:
+        transaction.on_commit(lambda: [storage.delete(name) for name in legacy if storage.exists(name)])
+
+
+# ===== 이어받기(청크) 업로드 세션 =====
+class UploadSession(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name="upload_sessions", verbose_name="과제")
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="upload_sessions", verbose_name="학생")
+    filename = models.CharField("파일명", max_length=255)
+    total_size = models.PositiveBigIntegerField("전체 크기(Byte)")
+    # 지금까지 이어붙인 바이트 수(= 다음 청크가 시작해야 할 오프셋)
+    received = models.PositiveBigIntegerField("수신 오프셋(Byte)", default=0)
+    # 수신한 바이트 전체의 누적 CRC32 (zlib.crc32 이어 계산)
+    checksum = models.PositiveBigIntegerField("누적 체크섬(CRC32)", default=0)
+    created_at = models.DateTimeField("생성일시", auto_now_add=True)
+    updated_at = models.DateTimeField("수정일시", auto_now=True)
+
+    class Meta:
+        verbose_name = "업로드 세션"
+        verbose_name_plural = "업로드 세션"
+        indexes = [
+            models.Index(fields=["assignment", "student"]),
+        ]
+
+    def __str__(self): return f"{self.filename} ({self.received}/{self.total_size})"
+
+    @property
+    def staging_path(self):
+        return Path(settings.UPLOAD_STAGING_ROOT) / f"{self.id}.part"
 
-    def delete(self, using=None, keep_parents=False):
-        # 저장소에서 실제 파일 삭제
-        storage = self.file.storage
-        name = self.file.name
-        super().delete(using=using, keep_parents=keep_parents)
-        if name and storage.exists(name):
-            storage.delete(name)
+    @property
+    def is_complete(self):
+        return self.received >= self.total_size
+
+
+# ===== 제출 접수증 (접수 큐 → ingest_worker 반영 결과) =====
+# 접수 직후에는 스풀(SUBMISSION_INGEST_ROOT)에만 있고, 워커가 반영할 때 이 행이 생긴다.
+class SubmissionReceipt(models.Model):
+    STATUS = (
+        ("accepted", "반영됨"),
+        ("superseded", "이후 제출로 대체됨"),
+        ("failed", "반영 실패"),
+    )
+    id = models.UUIDField(primary_key=True, editable=False)
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name="receipts", verbose_name="과제")
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="submission_receipts", verbose_name="학생")
+    submission = models.ForeignKey(Submission, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name="receipts", verbose_name="제출")
+    status = models.CharField("상태", max_length=20, choices=STATUS)
+    # 요청이 도착한 서버 시각 = 제출일시(지각 판단 기준). 반영 시각과 무관
+    accepted_at = models.DateTimeField("접수일시")
+    processed_at = models.DateTimeField("반영일시", auto_now_add=True)
+    file_count = models.PositiveIntegerField("파일 수", default=0)
+    error = models.CharField("오류", max_length=255, blank=True)
+
+    class Meta:
+        verbose_name = "제출 접수증"
+        verbose_name_plural = "제출 접수증"
+
+    def __str__(self): return f"{self.id} ({self.get_status_display()})"
 
 
 class Grade(models.Model):
@@ -218,3 +501,16 @@ class Notification(models.Model):
             models.Index(fields=["user", "type"]),
             models.Index(fields=["created_at"]),
         ]
+
+
+# ===== 주기 작업 진행 위치(high-water mark) =====
+class ScheduleMark(models.Model):
+    name = models.CharField("이름", max_length=50, primary_key=True)  # 예: "due_soon:86400"
+    high_water = models.DateTimeField("처리한 위치")
+    updated_at = models.DateTimeField("수정일시", auto_now=True)
+
+    class Meta:
+        verbose_name = "주기 작업 진행 위치"
+        verbose_name_plural = "주기 작업 진행 위치"
+
+    def __str__(self): return f"{self.name} @ {self.high_water}"
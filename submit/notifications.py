@@ -0,0 +1,150 @@
+import itertools
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Notification, TeamMembership
+
+# =========================
+# 알림
+# =========================
+# 만드는 곳: 참가 요청/승인/거절, 새 과제(팀 전체), 채점(개별·일괄), 마감 임박(send_due_reminders).
+# 팀 전체에 보내는 알림도 수신자마다 save() 하지 않고 BATCH_SIZE 씩 bulk_create 한다.
+#
+# 안 읽은 알림 수는 사용자별 캐시 카운터(notif:unread:{id})로 보여 준다(base.html 배지 → 페이지마다 COUNT(*) 없음).
+#   - 처음 볼 때 한 번 COUNT 해서 채우고, 이후에는 만들 때 +n, 읽음 처리할 때 -n 으로 고친다(커밋 후).
+#   - 카운터가 없는 사용자는 건드리지 않는다(다음에 볼 때 COUNT).
+#   - 이 모듈을 거치지 않은 변경(관리자 화면 등)은 NOTIFICATION_COUNT_TIMEOUT 이 지나면 바로잡힌다.
+
+JOIN_REQUEST = "team_join_request"
+JOIN_APPROVED = "team_join_approved"
+JOIN_REJECTED = "team_join_rejected"
+ASSIGNMENT_CREATED = "assignment_created"
+GRADED = "graded"
+DUE_SOON = "due_soon"
+
+BATCH_SIZE = 500
+
+
+def _key(user_id):
+    return f"notif:unread:{user_id}"
+
+
+def _adjust(counts):
+    """{user_id: 증감} 을 있는 카운터에만 반영"""
+    keys = {_key(uid): n for uid, n in counts.items() if n}
+    for key in cache.get_many(keys):
+        try:
+            if cache.incr(key, keys[key]) < 0:
+                cache.delete(key)
+        except ValueError:
+            # 그 사이 만료됨 → 다음 조회 때 다시 센다
+            pass
+
+
+def bulk_send(type, items):
+    """
+    items: [(user_id, payload), ...] 를 BATCH_SIZE 씩 bulk_create. 반환: 만든 수
+    payload 에는 화면에 보일 "message" 와 이동할 "url" 을 넣는다.
+    """
+    counts = {}
+    # 부르는 쪽 트랜잭션(채점 일괄 반영 등)에 그대로 합류
+    with transaction.atomic(savepoint=False):
+        it = iter(items)
+        while batch := list(itertools.islice(it, BATCH_SIZE)):
+            Notification.objects.bulk_create([
+                Notification(user_id=user_id, type=type, payload=payload) for user_id, payload in batch
+            ])
+            for user_id, _ in batch:
+                counts[user_id] = counts.get(user_id, 0) + 1
+    transaction.on_commit(lambda: _adjust(counts))
+    return sum(counts.values())
+
+
+def send(type, user_ids, payload):
+    """같은 내용을 여러 사용자에게"""
+    return bulk_send(type, ((user_id, payload) for user_id in user_ids))
+
+
+def unread_count(user_id):
+    key = _key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, read_at__isnull=True).count()
+        # 동시에 센 값이 먼저 들어갔으면 그것을 따른다
+        cache.add(key, count, getattr(settings, "NOTIFICATION_COUNT_TIMEOUT", 3600))
+    return max(count, 0)
+
+
+def mark_read(user_id, ids=None):
+    """안 읽은 알림을 읽음 처리(ids 가 없으면 전부). 반환: 처리한 수"""
+    qs = Notification.objects.filter(user_id=user_id, read_at__isnull=True)
+    if ids is not None:
+        qs = qs.filter(pk__in=ids)
+    n = qs.update(read_at=timezone.now())
+    if n:
+        transaction.on_commit(lambda: _adjust({user_id: -n}))
+    return n
+
+
+# ===== 이벤트별 알림 =====
+def _assignment_payload(assignment, message):
+    return {
+        "team": assignment.team_id,
+        "assignment": assignment.pk,
+        "message": message,
+        "url": reverse("assignment_detail", kwargs={"team_id": assignment.team_id, "assignment_id": assignment.pk}),
+    }
+
+
+def join_requested(membership, team, student):
+    """팀장에게: 참가 요청(재요청 포함)"""
+    name = student.get_full_name() or student.username
+    send(JOIN_REQUEST, [team.owner_id], {
+        "team": team.pk, "membership": membership.pk,
+        "message": f"{name}님이 '{team.name}' 팀에 참가를 요청했습니다.",
+        "url": reverse("team_requests", kwargs={"team_id": team.pk}),
+    })
+
+
+def join_decided(membership, team):
+    """학생에게: 승인/거절 결과"""
+    approved = membership.status == "APPROVED"
+    send(JOIN_APPROVED if approved else JOIN_REJECTED, [membership.student_id], {
+        "team": team.pk, "membership": membership.pk,
+        "message": f"'{team.name}' 팀 참가 요청이 {'승인' if approved else '거절'}되었습니다.",
+        "url": reverse("team_detail", kwargs={"team_id": team.pk}) if approved else reverse("team_join_page"),
+    })
+
+
+def assignment_created(assignment):
+    """팀 승인 멤버 전체에게: 새 과제"""
+    members = TeamMembership.objects.filter(team_id=assignment.team_id, status="APPROVED").values_list(
+        "student_id", flat=True
+    )
+    due = timezone.localtime(assignment.due_at).strftime("%m/%d %H:%M")
+    return send(ASSIGNMENT_CREATED, members, _assignment_payload(
+        assignment, f"새 과제 '{assignment.title}' (마감 {due})",
+    ))
+
+
+def graded(assignment, scores):
+    """학생별 채점 결과. scores: [(student_id, score), ...]"""
+    return bulk_send(GRADED, (
+        (student_id, {**_assignment_payload(
+            assignment, f"'{assignment.title}' 채점 결과: {score}/{assignment.max_score}점",
+        ), "score": score})
+        for student_id, score in scores
+    ))
+
+
+def due_soon(assignment, student_ids, window):
+    """마감 임박(window: "24시간" 같은 표시용 이름). 같은 과제·구간으로 두 번 보내지 않도록 payload 에 남긴다."""
+    due = timezone.localtime(assignment.due_at).strftime("%m/%d %H:%M")
+    return send(DUE_SOON, student_ids, {
+        **_assignment_payload(assignment, f"'{assignment.title}' 마감이 {window} 이내입니다(마감 {due}). 아직 제출하지 않았습니다."),
+        "window": window,
+    })
@@ -0,0 +1,102 @@
+import datetime
+
+from django.db.models import Q
+
+# =========================
+# 키셋(seek) 페이지 나누기
+# =========================
+# OFFSET 대신 "마지막으로 본 행의 (정렬 값, id) 다음부터" 를 조건으로 읽는다 → 몇 페이지를 넘기든
+# 인덱스(… 정렬 값) 에서 바로 그 자리를 찾아 size+1 행만 읽는다(+1 은 다음 페이지가 있는지 확인용).
+#   조건은 key <= v AND (key < v OR id < pk) 모양으로 만든다: 앞쪽 범위가 인덱스 탐색에 그대로 쓰이고,
+#   뒤쪽은 같은 값(v)인 몇 행에만 걸린다(OR 하나로 쓰면 SQLite 가 처음부터 훑는다).
+# 정렬 값이 NULL 인 행(제출 기록만 있고 제출일시가 없는 것 등)은 맨 뒤 묶음으로 보고 id 순으로 이어 간다.
+#
+# 커서 문자열: "<마이크로초>-<id>" (NULL 묶음은 "x-<id>"). 잘못된 값이면 첫 페이지로 본다.
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICRO = datetime.timedelta(microseconds=1)
+
+
+def encode(value, pk):
+    if value is None:
+        return f"x-{pk}"
+    return f"{(value - _EPOCH) // _MICRO}-{pk}"
+
+
+def decode(cursor):
+    """(값, id) | None"""
+    head, sep, pk = (cursor or "").partition("-")
+    if not sep or not pk.isdigit():
+        return None
+    if head == "x":
+        return None, int(pk)
+    if not head.isdigit():
+        return None
+    return _EPOCH + int(head) * _MICRO, int(pk)
+
+
+class Page:
+    def __init__(self, items, next_cursor, request, param):
+        self.items = items
+        self.next_cursor = next_cursor
+        self._query = request.GET.copy()
+        self._param = param
+        self.is_first = param not in request.GET
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def _url(self, cursor):
+        query = self._query.copy()
+        query.pop(self._param, None)
+        if cursor:
+            query[self._param] = cursor
+        return f"?{query.urlencode()}" if query else "?"
+
+    @property
+    def next_url(self):
+        """지금 필터를 유지한 다음 페이지 주소(?…)"""
+        return self._url(self.next_cursor)
+
+    @property
+    def first_url(self):
+        return self._url(None)
+
+
+def _after(field, value, pk, descending):
+    lt = "lt" if descending else "gt"
+    return Q(**{f"{field}__{lt}e": value}) & (Q(**{f"{field}__{lt}": value}) | Q(**{f"pk__{lt}": pk}))
+
+
+def seek(request, queryset, field, size, descending=False, nullable=False, param="after"):
+    """
+    queryset 을 (field, id) 순서로 request.GET[param] 커서 다음부터 size 개 → Page.
+    nullable 이면 field 가 NULL 인 행을 맨 뒤에 이어 붙인다(경계 페이지에서만 쿼리 한 번 더).
+    """
+    position = decode(request.GET.get(param))
+    sign = "-" if descending else ""
+    items = []
+    if position is None or position[0] is not None:
+        part = queryset.filter(**{f"{field}__isnull": False}) if nullable else queryset
+        if position is not None:
+            part = part.filter(_after(field, *position, descending))
+        items = list(part.order_by(f"{sign}{field}", f"{sign}pk")[: size + 1])
+    if nullable and len(items) <= size:
+        rest = queryset.filter(**{f"{field}__isnull": True})
+        if position is not None and position[0] is None:
+            rest = rest.filter(**{f"pk__{'lt' if descending else 'gt'}": position[1]})
+        items += list(rest.order_by(f"{sign}pk")[: size + 1 - len(items)])
+
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        last = items[-1]
+        next_cursor = encode(getattr(last, field), last.pk)
+    return Page(items, next_cursor, request, param)
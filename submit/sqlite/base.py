@@ -0,0 +1,95 @@
+import random
+import time
+
+from django.db.backends.sqlite3 import base as sqlite3_base
+
+# =========================
+# 운영용 SQLite 백엔드 (ENGINE = "submit.sqlite")
+# =========================
+# 기본 sqlite3 백엔드와 같고 다음만 다르다.
+#  - 연결할 때 PRAGMA 적용: WAL(읽기가 쓰기를 막지 않음), busy_timeout, synchronous=NORMAL,
+#    mmap_size, cache_size. CONN_MAX_AGE 로 연결을 유지하면 요청마다 다시 실행하지 않는다.
+#  - 트랜잭션을 BEGIN IMMEDIATE 로 시작: 읽다가 쓰기로 올라가는 순간의 SQLITE_BUSY(busy_timeout 을
+#    기다리지 않고 바로 "database is locked")를 없애고, 쓰기 잠금을 처음부터 잡은 채 기다린다.
+#  - 잠금 때문에 실패한 BEGIN 과 트랜잭션 밖(autocommit) 문장은 지수 백오프로 몇 번 더 시도한다.
+#    트랜잭션 안의 문장은 앞선 문장과 함께 다시 해야 하므로 재시도하지 않는다.
+#
+# OPTIONS (모두 선택, 나머지 키는 sqlite3.connect 로 그대로 전달)
+#   "pragmas"          : {이름: 값} — DEFAULT_PRAGMAS 에 덮어씀, 값이 None 이면 생략
+#   "transaction_mode" : "IMMEDIATE"(기본) | "DEFERRED" | "EXCLUSIVE"
+#   "lock_retries"     : 잠금 실패 시 추가 시도 횟수(기본 3)
+#   "lock_backoff"     : 첫 대기 시간(초, 기본 0.05). 시도마다 2배, 최대 1초, 0.5~1배 지터
+
+DEFAULT_PRAGMAS = {
+    "busy_timeout": 5000,           # ms, 아래 journal_mode 전환도 이 시간만큼 기다린다
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",        # WAL 에서는 커밋마다 fsync 하지 않아도 DB 가 깨지지 않음(체크포인트 때 fsync)
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -32000,           # 음수 = KiB → 약 32MB
+}
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+_BACKOFF_CAP = 1.0
+
+
+def _is_locked(exc):
+    message = str(exc)
+    return "database is locked" in message or "database is busy" in message
+
+
+def _with_retry(func, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except sqlite3_base.Database.OperationalError as e:
+            if attempt == retries or not _is_locked(e):
+                raise
+            time.sleep(min(_BACKOFF_CAP, backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+class RetryingCursorWrapper(sqlite3_base.SQLiteCursorWrapper):
+    lock_retries = 0
+    lock_backoff = 0.0
+
+    def execute(self, query, params=None):
+        if self.connection.in_transaction or not self.lock_retries:
+            return super().execute(query, params)
+        # autocommit 문장은 실패하면 아무것도 바뀌지 않았으므로 그대로 다시 실행해도 안전
+        return _with_retry(lambda: super(RetryingCursorWrapper, self).execute(query, params),
+                           self.lock_retries, self.lock_backoff)
+
+
+class DatabaseWrapper(sqlite3_base.DatabaseWrapper):
+    def __init__(self, settings_dict, alias="default"):
+        super().__init__(settings_dict, alias)
+        options = dict(settings_dict.get("OPTIONS") or {})
+        self.pragmas = {**DEFAULT_PRAGMAS, **options.get("pragmas", {})}
+        self.transaction_mode = options.get("transaction_mode", "IMMEDIATE").upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ValueError(f"transaction_mode 는 {TRANSACTION_MODES} 중 하나여야 합니다.")
+        self.lock_retries = int(options.get("lock_retries", 3))
+        self.lock_backoff = float(options.get("lock_backoff", 0.05))
+        self.cursor_class = type("RetryingCursor", (RetryingCursorWrapper,), {
+            "lock_retries": self.lock_retries, "lock_backoff": self.lock_backoff,
+        })
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        for key in ("pragmas", "transaction_mode", "lock_retries", "lock_backoff"):
+            kwargs.pop(key, None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if value is not None:
+                # journal_mode 전환은 다른 연결이 쓰는 중이면 잠금에 걸릴 수 있다
+                _with_retry(lambda: conn.execute(f"PRAGMA {name} = {value}").fetchall(),
+                            self.lock_retries, self.lock_backoff)
+        return conn
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=self.cursor_class)
+
+    def _start_transaction_under_autocommit(self):
+        # 트랜잭션 밖에서 실행되므로 커서가 잠금 재시도를 한다
+        self.cursor().execute(f"BEGIN {self.transaction_mode}")
@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+import os
+import posixpath
+import shutil
+import uuid
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage, storages
+
+try:
+    import brotli
+except ImportError:  # 선택: pip install brotli 가 있으면 .br 도 만든다
+    brotli = None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    SHA-256 내용 주소 저장소.
+    - 파일 이름은 업로드 이름과 무관하게 <upload_to>/sha256/ab/cd/<digest> 로 정해진다.
+    - 같은 내용이 이미 있으면 디스크에 다시 쓰지 않는다(중복 제거).
+    - 참조 카운트는 StoredBlob 모델이 관리하고, 실제 삭제도 그쪽에서 결정한다.
+    """
+    dirname = "sha256"
+
+    @staticmethod
+    def file_digest(content):
+        h = hashlib.sha256()
+        for chunk in content.chunks():
+            h.update(chunk)
+        return h.hexdigest()
+
+    @classmethod
+    def blob_name(cls, digest, prefix=""):
+        return posixpath.join(prefix, cls.dirname, digest[:2], digest[2:4], digest)
+
+    @staticmethod
+    def digest_of(name):
+        return posixpath.basename(name)
+
+    def get_available_name(self, name, max_length=None):
+        # 같은 이름 = 같은 내용이므로 충돌 접미사(_yDUB1I6 등)를 붙이지 않는다
+        return name
+
+    def _save(self, name, content):
+        digest = self.file_digest(content)
+        return self.ensure(self.blob_name(digest, prefix=posixpath.dirname(name)), content)
+
+    def ensure(self, name, content):
+        """
+        blob 이름 name 이 없으면 content 로 쓴다(있으면 같은 내용이므로 생략).
+        원본(임시/스테이징 파일)은 옮기지 않고 남겨 둔다 → 참조를 잡은 뒤 blob 이 사라졌으면 다시 쓸 수 있다(SubmissionFile.save).
+        """
+        if self.exists(name):
+            return name
+
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # 임시 이름에 다 쓴 뒤 교체 → 동시에 같은 내용을 저장해도 반쯤 쓴 파일이 보이지 않음
+        tmp_path = f"{full_path}.{uuid.uuid4().hex}.tmp"
+        if hasattr(content, "temporary_file_path"):
+            # 임시/스테이징 파일은 복사 없이 하드 링크(다른 파일 시스템이면 복사)
+            try:
+                os.link(content.temporary_file_path(), tmp_path)
+            except OSError:
+                shutil.copyfile(content.temporary_file_path(), tmp_path)
+        else:
+            with open(tmp_path, "wb") as fh:
+                for chunk in content.chunks():
+                    fh.write(chunk)
+        os.replace(tmp_path, full_path)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+
+def submission_storage():
+    return storages["submissions"]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    배포용 정적 파일 저장소(collectstatic).
+    - ManifestStaticFilesStorage: 내용 해시가 붙은 이름(style.3f2a….css) + staticfiles.json, {% static %} 이 그 이름을 쓴다.
+    - 글자 파일(css/js/svg …)은 옆에 미리 압축한 .gz(와 brotli 가 있으면 .br)을 둔다 → nginx gzip_static/brotli_static
+      또는 fileserve.serve_static 이 요청마다 압축하지 않고 그대로 보낸다.
+    해시 이름은 내용이 바뀌면 이름도 바뀌므로 1년 immutable 로 캐시해도 된다(STATIC_MAX_AGE).
+    """
+    compress_extensions = (".css", ".js", ".mjs", ".map", ".svg", ".txt", ".json", ".xml", ".html", ".ico")
+    # 이만큼도 줄지 않으면 압축본을 두지 않는다(원본을 보낸다)
+    min_saving = 0.05
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get("dry_run"):
+            return
+        for name, hashed_name in self.hashed_files.items():
+            for target in {name, hashed_name}:
+                if target.endswith(self.compress_extensions):
+                    self.compress(target)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        encoders = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.append((".br", lambda d: brotli.compress(d, quality=11)))
+        for ext, encode in encoders:
+            packed = encode(data)
+            if len(packed) > len(data) * (1 - self.min_saving):
+                if os.path.exists(path + ext):
+                    os.remove(path + ext)
+                continue
+            tmp_path = f"{path}{ext}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(packed)
+            os.replace(tmp_path, path + ext)
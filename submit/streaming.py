@@ -0,0 +1,128 @@
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# 스트리밍 응답에서 한 번에 읽고 내보내는 단위
+CHUNK_SIZE = 256 * 1024
+
+_DONE = object()
+
+
+class _ZipSink:
+    """ZipFile 이 쓰는 바이트를 잠깐 모아 두는 쓰기 전용 버퍼(seek 불가 → 데이터 디스크립터 방식으로 기록됨)"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class IterReader:
+    """bytes 조각을 내는 generator 를 read() 가능한 파일처럼 감싼다(zip_stream 의 항목으로 사용)"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = b""
+
+    def read(self, size=-1):
+        parts, have = [self._buf], len(self._buf)
+        while size < 0 or have < size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                break
+            parts.append(chunk)
+            have += len(chunk)
+        data = b"".join(parts)
+        if size < 0 or have <= size:
+            self._buf = b""
+            return data
+        self._buf = data[size:]
+        return data[:size]
+
+    def close(self):
+        close = getattr(self._chunks, "close", None)
+        if close:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def zip_stream(entries, chunk_size=CHUNK_SIZE, compression=zipfile.ZIP_STORED):
+    """
+    entries: (압축 안의 경로, 파일을 여는 함수, (Y, M, D, h, m, s)) 의 iterable
+    임시 아카이브 없이 ZIP 바이트를 조각 단위로 yield 한다.
+    기본은 무압축 저장(제출 파일은 이미 압축된 경우가 많아 CPU 만 씀), XML 등 텍스트는 ZIP_DEFLATED.
+    여는 함수가 None 을 돌려주면(파일 유실 등) 그 항목은 건너뛴다.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=compression, allowZip64=True) as zf:
+        for arcname, opener, date_time in entries:
+            src = opener()
+            if src is None:
+                continue
+            info = zipfile.ZipInfo(arcname, date_time=date_time)
+            info.compress_type = compression
+            with src, zf.open(info, mode="w", force_zip64=True) as dst:
+                while True:
+                    block = src.read(chunk_size)
+                    if not block:
+                        break
+                    dst.write(block)
+                    yield from _flush(sink)
+            yield from _flush(sink)
+    yield from _flush(sink)
+
+
+def _flush(sink):
+    data = sink.drain()
+    if data:
+        yield data
+
+
+# =========================
+# ASGI 에서 스트리밍
+# =========================
+# ASGI 는 동기 iterator 를 받으면 전부 list 로 모은 뒤에 보낸다(큰 ZIP/파일이 통째로 메모리에 올라감).
+# ASGI 요청이면 조각마다 next() 만 스레드로 넘기는 async iterator 로 바꿔서 보낸다.
+def is_asgi(request):
+    return isinstance(request, ASGIRequest)
+
+
+async def aiterate(chunks):
+    """
+    동기 iterator → async iterator. ORM 을 쓰는 generator(ZIP 의 파일 목록 등)도 있으므로
+    next()/close() 는 같은 스레드(thread_sensitive)에서 부른다. 조각 사이에는 스레드를 잡지 않는다.
+    """
+    it = iter(chunks)
+    step = sync_to_async(next)
+    try:
+        while (chunk := await step(it, _DONE)) is not _DONE:
+            yield chunk
+    finally:
+        close = getattr(it, "close", None)
+        if close:
+            await sync_to_async(close)()
+
+
+def streaming_response(request, chunks, **kwargs):
+    """StreamingHttpResponse — ASGI 면 aiterate 로 감싼다(WSGI 는 그대로)."""
+    if is_asgi(request):
+        chunks = aiterate(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
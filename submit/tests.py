@@ -1,3 +1,1905 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+import zipfile
+import zlib
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.http import Http404
+from django.template.backends.django import Template as DjangoTemplate
+from django.test import AsyncClient, Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from PIL import Image
+
+from config import urls as root_urls
+from . import (
+    covers, events, exports, generations, gradebook, gradeimport, ingest, joincodes, middleware, notifications, views,
+)
+from .fileserve import serve_static
+from .models import (
+    StudentProfile, Team, TeamMembership,
+    Assignment, Submission, SubmissionFile, StoredBlob, SubmissionReceipt, Grade, Notification, ScheduleMark, User, UploadSession,
+)
+from .sqlite.base import DatabaseWrapper as SqliteDatabaseWrapper
+
+def _consume(response):
+    """스트리밍 응답 본문을 끝까지 읽는다(async 스트림 = SSE 도)"""
+    if response.is_async:
+        async def _read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(_read)()
+    return b"".join(response.streaming_content)
+
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="kp-submit-test-media-")
+STAGING_ROOT = tempfile.mkdtemp(prefix="kp-submit-test-staging-")
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+    shutil.rmtree(STAGING_ROOT, ignore_errors=True)
+
+# 1x1 PNG (팀 대표 이미지용)
+PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\rIDATx\x9cc\xf8\x0f\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def _make_students(prefix, n):
+    users = User.objects.bulk_create([
+        User(username=f"{prefix}{i}", first_name=f"학생{i}", password="!") for i in range(n)
+    ])
+    StudentProfile.objects.bulk_create([
+        StudentProfile(user=u, student_id=f"{prefix}-{i:05d}") for i, u in enumerate(users)
+    ])
+    return users
+
+
+def _populate(team, assignments, prefix, n, blob_name):
+    """승인 멤버 n명 + 과제마다 제출/파일/성적, 대기·거절 요청 n명"""
+    now = timezone.now()
+    members = _make_students(f"{prefix}m", n)
+    TeamMembership.objects.bulk_create([
+        TeamMembership(team=team, student=u, status="APPROVED", decided_at=now, joined_at=now) for u in members
+    ])
+    waiting = _make_students(f"{prefix}p", n)
+    TeamMembership.objects.bulk_create([
+        TeamMembership(team=team, student=u, status="PENDING" if i % 2 else "REJECTED")
+        for i, u in enumerate(waiting)
+    ])
+    for a in assignments:
+        subs = Submission.objects.bulk_create([
+            Submission(assignment=a, student=u, status="submitted", submitted_at=now) for u in members
+        ])
+        SubmissionFile.objects.bulk_create([
+            SubmissionFile(submission=s, file=blob_name, version=v, size=1, original_name=f"f{v}.txt")
+            for s in subs for v in (1, 2)
+        ])
+        Grade.objects.bulk_create([
+            Grade(submission=s, score=50) for s in subs[: n // 2]
+        ])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_STAGING_ROOT=STAGING_ROOT)
+class ChunkedUploadTests(TestCase):
+    DATA = b"0123456789abcdefghij"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.student = User.objects.create_user("stu", password="!")
+        cls.outsider = User.objects.create_user("out", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀")
+        TeamMembership.objects.create(team=cls.team, student=cls.student).approve(by_user=cls.owner)
+        cls.a = Assignment.objects.create(
+            team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(days=1), created_by=cls.owner,
+        )
+        cls.kw = {"team_id": cls.team.id, "assignment_id": cls.a.id}
+
+    def setUp(self):
+        self.client.force_login(self.student)
+
+    def _create(self, filename="report.bin", size=len(DATA)):
+        return self.client.post(reverse("upload_create", kwargs=self.kw), {"filename": filename, "size": str(size)})
+
+    def _put(self, upload_id, offset, data):
+        url = reverse("upload_session", kwargs={**self.kw, "upload_id": upload_id})
+        return self.client.put(url, data, content_type="application/octet-stream", HTTP_UPLOAD_OFFSET=str(offset))
+
+    def _commit(self, *upload_ids):
+        return self.client.post(reverse("upload_commit", kwargs=self.kw), {"upload_id": list(upload_ids), "comment": "c"})
+
+    def test_chunks_resume_and_commit(self):
+        created = self._create()
+        self.assertEqual(created.status_code, 201)
+        upload_id = created.json()["id"]
+
+        self.assertEqual(self._put(upload_id, 0, self.DATA[:6]).json()["offset"], 6)
+        # 세션 ID를 잃어도 같은 파일이면 이어받기
+        again = self._create()
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual((again.json()["id"], again.json()["offset"]), (upload_id, 6))
+        # 빈 구간이 생기는 오프셋 → 409 + 서버 오프셋
+        gap = self._put(upload_id, 10, self.DATA[10:])
+        self.assertEqual((gap.status_code, gap.json()["offset"]), (409, 6))
+        # 겹치는 재전송은 새 바이트만 붙인다
+        self.assertEqual(self._put(upload_id, 3, self.DATA[3:12]).json()["offset"], 12)
+        done = self._put(upload_id, 12, self.DATA[12:]).json()
+        self.assertTrue(done["complete"])
+        self.assertEqual(done["crc32"], f"{zlib.crc32(self.DATA):08x}")
+
+        response = self._commit(upload_id)
+        self.assertEqual(response.status_code, 200)
+        sub = Submission.objects.get(assignment=self.a, student=self.student)
+        self.assertEqual(sub.status, "submitted")
+        f = sub.files.get()
+        with f.file.open("rb") as fh:
+            self.assertEqual(fh.read(), self.DATA)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(Path(STAGING_ROOT, f"{upload_id}.part").exists())
+
+    def test_commit_rejects_incomplete_or_foreign_sessions(self):
+        upload_id = self._create().json()["id"]
+        self._put(upload_id, 0, self.DATA[:4])
+        response = self._commit(upload_id)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["uploads"][0]["offset"], 4)
+        self.assertEqual(self._commit(str(uuid.uuid4())).status_code, 400)
+        self.assertFalse(Submission.objects.filter(assignment=self.a).exists())
+
+    def test_zero_byte_file_commits_without_chunks(self):
+        upload_id = self._create("empty.txt", 0).json()["id"]
+        self.assertEqual(self._commit(upload_id).status_code, 200)
+        f = SubmissionFile.objects.get(submission__student=self.student)
+        self.assertEqual(f.size, 0)
+        with f.file.open("rb") as fh:
+            self.assertEqual(fh.read(), b"")
+
+    def test_outsiders_and_closed_assignments_are_rejected(self):
+        self.client.force_login(self.outsider)
+        self.assertEqual(self._create().status_code, 403)
+        self.client.force_login(self.student)
+        Assignment.objects.filter(pk=self.a.pk).update(is_closed=True)
+        self.assertEqual(self._create().status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user("prof", password="!")
+        team = Team.objects.create(owner=owner, name="팀")
+        a = Assignment.objects.create(team=team, title="과제", due_at=timezone.now(), created_by=owner)
+        cls.subs = [
+            Submission.objects.create(assignment=a, student=User.objects.create_user(f"s{i}", password="!"))
+            for i in range(3)
+        ]
+
+    def _file(self, sub, name, content):
+        return SubmissionFile.objects.create(submission=sub, file=SimpleUploadedFile(name, content), size=len(content))
+
+    def test_same_content_is_stored_once_and_counted(self):
+        first = self._file(self.subs[0], "a.txt", b"same")
+        second = self._file(self.subs[1], "b.txt", b"same")
+        digest = hashlib.sha256(b"same").hexdigest()
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.file.name, f"submissions/sha256/{digest[:2]}/{digest[2:4]}/{digest}")
+        self.assertEqual((first.sha256, first.display_name, second.display_name), (digest, "a.txt", "b.txt"))
+        self.assertEqual(StoredBlob.objects.get(pk=digest).refcount, 2)
+
+    def test_blob_is_removed_with_its_last_reference(self):
+        first = self._file(self.subs[0], "a.txt", b"shared")
+        second = self._file(self.subs[1], "b.txt", b"shared")
+        storage, name = first.file.storage, first.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(StoredBlob.objects.get(pk=second.sha256).refcount, 1)
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(StoredBlob.objects.filter(pk=second.sha256).exists())
+        self.assertFalse(storage.exists(name))
+
+    def test_queryset_delete_releases_references_in_bulk(self):
+        kept = self._file(self.subs[2], "keep.txt", b"x")
+        dropped = [
+            self._file(sub, name, content)
+            for sub in self.subs[:2] for name, content in (("x.txt", b"x"), ("y.txt", sub.student.username.encode()))
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            SubmissionFile.objects.filter(submission__in=self.subs[:2]).delete()
+
+        self.assertEqual(list(StoredBlob.objects.values_list("sha256", "refcount")), [(kept.sha256, 1)])
+        storage = kept.file.storage
+        self.assertTrue(storage.exists(kept.file.name))
+        self.assertEqual([f.file.name for f in dropped if storage.exists(f.file.name)], [kept.file.name] * 2)
+
+    def test_cascade_deletes_release_references(self):
+        kept = self._file(self.subs[0], "keep.txt", b"cascade")
+        other = Team.objects.create(owner=self.subs[0].assignment.team.owner, name="다른 팀")
+        a = Assignment.objects.create(team=other, title="과제", due_at=timezone.now())
+        sub = Submission.objects.create(assignment=a, student=self.subs[1].student)
+        shared, own = self._file(sub, "a.txt", b"cascade"), self._file(sub, "b.txt", b"only-here")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()   # 팀 → 과제 → 제출 → 파일 CASCADE
+        self.assertEqual(StoredBlob.objects.get(pk=shared.sha256).refcount, 1)
+        self.assertFalse(StoredBlob.objects.filter(pk=own.sha256).exists())
+        self.assertTrue(kept.file.storage.exists(kept.file.name))
+        self.assertFalse(own.file.storage.exists(own.file.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Submission.objects.filter(pk=self.subs[0].pk).delete()
+        self.assertFalse(StoredBlob.objects.filter(pk=kept.sha256).exists())
+        self.assertFalse(kept.file.storage.exists(kept.file.name))
+
+    def test_blob_dropped_between_write_and_reference_is_rewritten(self):
+        first = self._file(self.subs[0], "a.txt", b"racy")
+        storage, name = first.file.storage, first.file.name
+        acquire = StoredBlob.acquire
+
+        def release_then_acquire(*args):
+            # 쓰기를 생략한 직전에 다른 요청이 마지막 참조를 놓고 파일을 지운 상황
+            with self.captureOnCommitCallbacks(execute=True):
+                first.delete()
+            self.assertFalse(storage.exists(name))
+            acquire(*args)
+
+        with mock.patch.object(StoredBlob, "acquire", side_effect=release_then_acquire):
+            second = self._file(self.subs[1], "b.txt", b"racy")
+        self.assertEqual(StoredBlob.objects.get(pk=second.sha256).refcount, 1)
+        with storage.open(name, "rb") as fh:
+            self.assertEqual(fh.read(), b"racy")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SubmissionZipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀")
+        cls.a = Assignment.objects.create(
+            team=cls.team, title="1주차 과제", due_at=timezone.now(), created_by=cls.owner,
+        )
+        kim = User.objects.create_user("kim", password="!", first_name="김학생")
+        StudentProfile.objects.create(user=kim, student_id="20250001")
+        lee = User.objects.create_user("lee", password="!")
+        for user, files in ((kim, [("a.txt", b"A"), ("b.txt", b"BB")]), (lee, [("a.txt", b"lee")])):
+            TeamMembership.objects.create(team=cls.team, student=user).approve(by_user=cls.owner)
+            sub = Submission.objects.create(
+                assignment=cls.a, student=user, status="submitted", submitted_at=timezone.now(),
+            )
+            for version, (name, content) in enumerate(files, start=1):
+                SubmissionFile.objects.create(
+                    submission=sub, file=SimpleUploadedFile(name, content), version=version, size=len(content),
+                )
+        cls.kim = kim
+
+    def _download(self, user, assignment=None):
+        self.client.force_login(user)
+        return self.client.get(reverse("assignment_submissions_zip", args=[self.team.id, (assignment or self.a).id]))
+
+    def test_unsafe_titles_and_names_fall_back_to_unique_ids(self):
+        a = Assignment.objects.create(team=self.team, title="???", due_at=timezone.now(), created_by=self.owner)
+        for username, first_name in (("park1", "!!!"), ("park2", "박"), ("park3", "박")):
+            sub = Submission.objects.create(
+                assignment=a, student=User.objects.create_user(username, password="!", first_name=first_name),
+            )
+            SubmissionFile.objects.create(submission=sub, file=SimpleUploadedFile("a.txt", b"p"), size=1)
+
+        response = self._download(self.owner, a)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"assignment{a.pk}_", response["Content-Disposition"])
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as zf:
+            self.assertEqual(sorted(zf.namelist()), ["park1_/v1_a.txt", "park2_박/v1_a.txt", "park3_박/v1_a.txt"])
+
+    def test_owner_gets_every_file_grouped_by_student(self):
+        response = self._download(self.owner)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as zf:
+            self.assertIsNone(zf.testzip())
+            contents = {name: zf.read(name) for name in zf.namelist()}
+        self.assertEqual(contents, {
+            "20250001_김학생/v1_a.txt": b"A",
+            "20250001_김학생/v2_b.txt": b"BB",
+            "lee/v1_a.txt": b"lee",
+        })
+
+    def test_missing_blob_is_skipped(self):
+        f = SubmissionFile.objects.create(
+            submission=Submission.objects.get(student=self.kim), version=3, size=16,
+            file=SimpleUploadedFile("c.txt", uuid.uuid4().bytes),
+        )
+        f.file.storage.delete(f.file.name)
+        with zipfile.ZipFile(io.BytesIO(b"".join(self._download(self.owner).streaming_content))) as zf:
+            self.assertNotIn("20250001_김학생/v3_c.txt", zf.namelist())
+            self.assertEqual(len(zf.namelist()), 3)
+
+    def test_only_the_owner_can_download(self):
+        self.assertEqual(self._download(self.kim).status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, SENDFILE_BACKEND="")
+class ProtectedFileTests(TestCase):
+    DATA = b"0123456789"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.student = User.objects.create_user("stu", password="!")
+        cls.classmate = User.objects.create_user("mate", password="!")
+        cls.outsider = User.objects.create_user("out", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀")
+        cls.team.cover.save("cover.png", SimpleUploadedFile("cover.png", PNG))
+        for user in (cls.student, cls.classmate):
+            TeamMembership.objects.create(team=cls.team, student=user).approve(by_user=cls.owner)
+        a = Assignment.objects.create(team=cls.team, title="과제", due_at=timezone.now(), created_by=cls.owner)
+        sub = Submission.objects.create(assignment=a, student=cls.student, status="submitted")
+        cls.file = SubmissionFile.objects.create(
+            submission=sub, file=SimpleUploadedFile("보고서.txt", cls.DATA), size=len(cls.DATA),
+        )
+        cls.url = reverse("submission_file_download", args=[cls.file.id])
+
+    def setUp(self):
+        self.client.force_login(self.student)
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.DATA)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_single_ranges(self):
+        for header, status, body, content_range in (
+            ("bytes=2-4", 206, b"234", "bytes 2-4/10"),
+            ("bytes=-3", 206, b"789", "bytes 7-9/10"),
+            ("bytes=8-", 206, b"89", "bytes 8-9/10"),
+            ("bytes=20-", 416, b"", "bytes */10"),
+        ):
+            with self.subTest(header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(response["Content-Range"], content_range)
+                content = b"".join(response.streaming_content) if response.streaming else response.content
+                self.assertEqual(content, body)
+        # 여러 구간은 지원하지 않음 → 전체
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1,4-5").status_code, 200)
+
+    def test_conditional_requests(self):
+        first = self.client.get(self.url)
+        etag, last_modified = first["ETag"], first["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        # If-Range 가 맞을 때만 부분 전송, 아니면 전체
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE=last_modified).status_code, 206)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"stale"').status_code, 200)
+        # 날짜는 정확히 같아야 한다: 이후 날짜라도 일치로 보지 않음
+        later = http_date(parse_http_date(last_modified) + 3600)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE=later).status_code, 200)
+
+    def test_only_owner_and_submitter_can_download(self):
+        for user, status in ((self.owner, 200), (self.student, 200), (self.classmate, 403), (self.outsider, 403)):
+            with self.subTest(user=user.username):
+                self.client.force_login(user)
+                self.assertEqual(self.client.get(self.url).status_code, status)
+
+    def test_cover_needs_team_membership(self):
+        url = reverse("team_cover", args=[self.team.id])
+        self.assertEqual(self.client.get(url)["Content-Disposition"].split(";")[0], "inline")
+        self.client.force_login(self.outsider)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_STAGING_ROOT=STAGING_ROOT)
+class QueryBudgetTests(TestCase):
+    """
+    config/urls.py 의 모든 이름 있는 URL 에 대해
+    - 역할(팀장/멤버/외부인)별 최대 SQL 쿼리 수를 고정하고
+    - 데이터(멤버/제출/파일/팀 수)가 늘어나도 쿼리 수가 변하지 않는지 확인한다.
+    새 URL 을 추가하면 BUDGETS 에도 추가해야 test_every_named_route_has_a_budget 가 통과한다.
+    """
+
+    # (URL 이름, 역할) → 최대 쿼리 수
+    BUDGETS = {
+        ("root", "owner"): 4,
+        ("root", "member"): 4,
+        ("root", "outsider"): 4,
+        ("login", "anonymous"): 0,
+        ("logout", "member"): 4,
+        ("signup", "anonymous"): 0,
+        ("teacher_team_list", "owner"): 4,
+        ("teacher_team_list", "member"): 4,
+        ("teacher_team_list", "outsider"): 4,
+        ("create_team", "owner"): 3,
+        ("create_team:post", "owner"): 7,
+        ("team_join_page", "member"): 4,
+        ("team_detail", "owner"): 6,
+        ("team_detail", "member"): 7,
+        ("team_detail", "outsider"): 3,
+        ("regen_team_code", "owner"): 9,
+        ("team_requests", "owner"): 6,
+        ("team_requests", "outsider"): 3,
+        ("team_request_approve", "owner"): 5,
+        ("team_request_reject", "owner"): 5,
+        ("team_request_by_code", "newcomer"): 11,
+        ("team_join", "member"): 3,
+        ("team_delete", "owner"): 6,
+        ("team_edit", "owner"): 4,
+        ("team_cover", "owner"): 3,
+        ("team_cover", "member"): 3,
+        ("team_cover", "outsider"): 3,
+        ("team_cover_variant", "owner"): 3,
+        ("team_cover_variant", "member"): 3,
+        ("team_cover_variant", "outsider"): 3,
+        ("team_gradebook", "owner"): 6,
+        ("team_gradebook", "outsider"): 3,
+        ("team_grades_export", "owner"): 4,
+        ("team_grades_export", "outsider"): 3,
+        ("assignment_create", "owner"): 4,
+        ("assignment_detail", "owner"): 4,
+        ("assignment_detail", "member"): 8,
+        ("assignment_detail", "outsider"): 3,
+        ("assignment_submit", "member"): 7,
+        ("assignment_submit:post", "member"): 30,
+        ("assignment_submissions", "owner"): 9,  # 키셋 페이지 + NULL 묶음(경계 페이지) + 과제 전체 카운터
+        ("assignment_submissions", "outsider"): 3,
+        ("assignment_submissions_zip", "owner"): 4,
+        ("assignment_grades_export", "owner"): 4,
+        ("assignment_grades_export", "outsider"): 3,
+        ("assignment_grades_import", "owner"): 4,
+        ("assignment_grades_import", "outsider"): 3,
+        ("assignment_grades_import:post", "owner"): 11,
+        ("upload_create", "member"): 5,
+        ("upload_session", "member"): 4,
+        ("upload_commit", "member"): 26,
+        ("submission_receipt", "member"): 4,
+        ("submission_receipt", "outsider"): 3,
+        ("assignment_list", "owner"): 6,
+        ("assignment_list", "member"): 6,
+        ("assignment_list", "outsider"): 3,
+        ("grade_submission", "owner"): 7,
+        ("grade_submission:post", "owner"): 13,
+        ("assignment_close", "owner"): 4,
+        ("assignment_reopen", "owner"): 4,
+        ("submission_file_download", "owner"): 3,
+        ("submission_file_download", "member"): 3,
+        ("submission_file_download", "outsider"): 3,
+        ("notification_list", "member"): 4,
+        ("notification_list:post", "member"): 3,
+        ("notification_open", "member"): 4,
+        ("membership_events", "member"): 3,
+        ("assignment_events", "owner"): 4,
+        ("assignment_events", "outsider"): 3,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw", first_name="교수")
+        cls.member = User.objects.create_user("stu", password="pw", first_name="학생")
+        StudentProfile.objects.create(user=cls.member, student_id="20250001")
+        cls.outsider = User.objects.create_user("out", password="pw")
+
+        cls.team = Team.objects.create(owner=cls.owner, name="자료구조", description="월/수")
+        covers.attach(cls.team, SimpleUploadedFile("cover.png", PNG))
+        cls.team.save()
+        TeamMembership.objects.create(team=cls.team, student=cls.member).approve(by_user=cls.owner)
+
+        due = timezone.now() + datetime.timedelta(days=7)
+        cls.assignments = [
+            Assignment.objects.create(team=cls.team, title=f"과제{i}", due_at=due, created_by=cls.owner)
+            for i in range(3)
+        ]
+        cls.assignment = cls.assignments[0]
+
+        cls.submission = Submission.objects.create(
+            assignment=cls.assignment, student=cls.member, status="submitted", submitted_at=timezone.now()
+        )
+        cls.file = SubmissionFile.objects.create(
+            submission=cls.submission, file=SimpleUploadedFile("report.txt", b"report"), size=6
+        )
+        cls.blob_name = cls.file.file.name
+        # 재제출 측정용: 다른 과제에도 이전 제출 파일을 하나 둔다
+        resub = Submission.objects.create(assignment=cls.assignments[1], student=cls.member, status="submitted")
+        SubmissionFile.objects.create(submission=resub, file=SimpleUploadedFile("old.txt", b"old"), size=3)
+        cls.receipt = SubmissionReceipt.objects.create(
+            id=uuid.uuid4(), assignment=cls.assignment, student=cls.member, submission=cls.submission,
+            status="accepted", accepted_at=cls.submission.submitted_at, file_count=1,
+        )
+        _populate(cls.team, cls.assignments, "s", 3, cls.blob_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(STAGING_ROOT, ignore_errors=True)
+
+    def _grow(self):
+        """행 수를 크게 늘린다: 팀 멤버/제출/파일/성적, 멤버가 속한 다른 팀, 과제"""
+        _populate(self.team, self.assignments, "g", 40, self.blob_name)
+        due = timezone.now() + datetime.timedelta(days=3)
+        for i in range(15):
+            other_owner = User.objects.create_user(f"other{i}", password="!")
+            t = Team.objects.create(owner=other_owner, name=f"다른팀{i}")
+            TeamMembership.objects.create(team=t, student=self.member, status="APPROVED",
+                                          decided_at=timezone.now(), joined_at=timezone.now())
+            TeamMembership.objects.create(team=t, student=self.owner, status="APPROVED",
+                                          decided_at=timezone.now(), joined_at=timezone.now())
+            Team.objects.create(owner=self.owner, name=f"내팀{i}")
+        Assignment.objects.bulk_create([
+            Assignment(team=self.team, title=f"추가{i}", due_at=due) for i in range(20)
+        ])
+        Notification.objects.bulk_create([
+            Notification(user=u, type="graded", payload={"message": f"알림{i}"})
+            for u in (self.owner, self.member) for i in range(80)
+        ])
+
+    # ----- 요청 정의 -----
+    def _cases(self):
+        t, a = self.team, self.assignment
+        ta = {"team_id": t.id, "assignment_id": a.id}
+        # 제출을 바꾸는 요청은 다른 과제에 보낸다(다운로드 대상 파일 유지)
+        tb = {"team_id": t.id, "assignment_id": self.assignments[1].id}
+
+        def pending():
+            u = User.objects.create_user(f"req{User.objects.count()}", password="!")
+            return TeamMembership.objects.create(team=t, student=u)
+
+        def new_upload():
+            return UploadSession.objects.create(
+                assignment=self.assignments[1], student=self.member, filename="x.bin", total_size=0
+            )
+
+        rounds = itertools.count(1)
+
+        def grade_table():
+            # 과제3 에 제출 기록이 있는 승인 멤버 전원(채점된/안 된 학생 섞임) → 신규 + 변경이 함께 생긴다
+            score = next(rounds)
+            names = Submission.objects.filter(
+                assignment=self.assignments[2], student__team_memberships__team=t,
+                student__team_memberships__status="APPROVED",
+            ).values_list("student__username", flat=True)
+            return {"data": "\n".join(f"{name}\t{score}\tok" for name in names), "apply": "1"}
+
+        def ungraded():
+            return Submission.objects.filter(assignment=a, grade__isnull=True).exclude(student=self.member).first()
+
+        def notice():
+            return Notification.objects.create(user=self.member, type="graded", payload={"url": "/"})
+
+        def home(name):
+            # 첫 화면은 사용자별 캐시 → 캐시 미스(쿼리가 가장 많은 경우)를 잰다
+            for u in (self.owner, self.member, self.outsider):
+                generations.bump_user(u.id)
+            return reverse(name)
+
+        def fresh(name, **kwargs):
+            # 과제 목록/머리글 조각 캐시 미스를 잰다
+            generations.bump_team(t.id)
+            generations.bump_grades(t.id)
+            return reverse(name, kwargs=kwargs)
+
+        return [
+            ("root", "GET", lambda: home("root"), None),
+            ("login", "GET", lambda: reverse("login"), None),
+            ("logout", "POST", lambda: reverse("logout"), lambda: {}),
+            ("signup", "GET", lambda: reverse("signup"), None),
+            ("teacher_team_list", "GET", lambda: home("teacher_team_list"), None),
+            ("create_team", "GET", lambda: reverse("create_team"), None),
+            ("create_team:post", "POST", lambda: reverse("create_team"),
+             lambda: {"name": f"새팀{Team.objects.count()}", "description": ""}),
+            ("team_join_page", "GET", lambda: reverse("team_join_page"), None),
+            ("team_detail", "GET", lambda: fresh("team_detail", team_id=t.id), None),
+            ("regen_team_code", "GET", lambda: reverse("regen_team_code", kwargs={"team_id": t.id}), None),
+            ("team_requests", "GET", lambda: reverse("team_requests", kwargs={"team_id": t.id}), None),
+            ("team_request_approve", "POST",
+             lambda: reverse("team_request_approve", kwargs={"membership_id": pending().id}), lambda: {}),
+            ("team_request_reject", "POST",
+             lambda: reverse("team_request_reject", kwargs={"membership_id": pending().id}), lambda: {}),
+            ("team_request_by_code", "POST", lambda: reverse("team_request_by_code"),
+             lambda: {"join_code": Team.objects.get(pk=t.id).join_code}),
+            ("team_join", "GET", lambda: reverse("team_join", kwargs={"team_id": t.id}), None),
+            ("team_delete", "GET", lambda: reverse("team_delete", kwargs={"team_id": t.id}), None),
+            ("team_edit", "GET", lambda: reverse("team_edit", kwargs={"team_id": t.id}), None),
+            ("team_cover", "GET", lambda: reverse("team_cover", kwargs={"team_id": t.id}), None),
+            ("team_cover_variant", "GET",
+             lambda: reverse("team_cover_variant", kwargs={"team_id": t.id, "variant": "1w.webp"}), None),
+            ("team_gradebook", "GET", lambda: reverse("team_gradebook", kwargs={"team_id": t.id}), None),
+            ("team_grades_export", "GET", lambda: reverse("team_grades_export", kwargs={"team_id": t.id}), None),
+            ("assignment_create", "GET", lambda: reverse("assignment_create", kwargs={"team_id": t.id}), None),
+            ("assignment_detail", "GET", lambda: fresh("assignment_detail", **ta), None),
+            ("assignment_submit", "GET", lambda: reverse("assignment_submit", kwargs=ta), None),
+            ("assignment_submit:post", "POST", lambda: reverse("assignment_submit", kwargs=tb),
+             lambda: {"comment": "c", "files": [SimpleUploadedFile("a.txt", b"a"), SimpleUploadedFile("b.txt", b"b")]}),
+            ("assignment_submissions", "GET", lambda: reverse("assignment_submissions", kwargs=ta), None),
+            ("assignment_submissions_zip", "GET", lambda: reverse("assignment_submissions_zip", kwargs=ta), None),
+            ("assignment_grades_export", "GET", lambda: reverse("assignment_grades_export", kwargs=ta) + "?format=xlsx", None),
+            ("assignment_grades_import", "GET", lambda: reverse("assignment_grades_import", kwargs=ta), None),
+            ("assignment_grades_import:post", "POST",
+             lambda: reverse("assignment_grades_import", kwargs={"team_id": t.id, "assignment_id": self.assignments[2].id}),
+             grade_table),
+            ("upload_create", "POST", lambda: reverse("upload_create", kwargs=tb),
+             lambda: {"filename": f"big{UploadSession.objects.count()}.bin", "size": "10"}),
+            ("upload_session", "GET",
+             lambda: reverse("upload_session", kwargs={**tb, "upload_id": new_upload().id}), None),
+            ("upload_commit", "POST", lambda: reverse("upload_commit", kwargs=tb),
+             lambda: {"upload_id": [str(new_upload().id)], "comment": ""}),
+            ("submission_receipt", "GET",
+             lambda: reverse("submission_receipt", kwargs={"receipt_id": self.receipt.id}), None),
+            ("assignment_list", "GET", lambda: reverse("assignment_list", kwargs={"team_id": t.id}), None),
+            ("grade_submission", "GET",
+             lambda: reverse("grade_submission", kwargs={**ta, "submission_id": self.submission.id}), None),
+            ("grade_submission:post", "POST",
+             lambda: reverse("grade_submission", kwargs={**ta, "submission_id": ungraded().id}),
+             lambda: {"score": "90", "feedback_text": "good"}),
+            ("assignment_close", "GET", lambda: reverse("assignment_close", kwargs=ta), None),
+            ("assignment_reopen", "GET", lambda: reverse("assignment_reopen", kwargs=ta), None),
+            ("submission_file_download", "GET",
+             lambda: reverse("submission_file_download", kwargs={"file_id": self.file.id}), None),
+            ("notification_list", "GET", lambda: reverse("notification_list"), None),
+            ("notification_list:post", "POST", lambda: notice() and reverse("notification_list"), lambda: {}),
+            ("notification_open", "GET",
+             lambda: reverse("notification_open", kwargs={"notification_id": notice().id}), None),
+            ("membership_events", "GET", lambda: reverse("membership_events"), None),
+            ("assignment_events", "GET", lambda: reverse("assignment_events", kwargs=ta), None),
+        ]
+
+    def setUp(self):
+        # 멤버십 캐시가 테스트 사이에 남지 않도록
+        cache.clear()
+
+    def _client(self, role):
+        c = Client()
+        user = {"owner": self.owner, "member": self.member, "outsider": self.outsider}.get(role)
+        if role == "newcomer":
+            # 매번 처음 참가 요청을 보내는 사용자
+            user = User.objects.create_user(f"new{User.objects.count()}", password="!")
+        if user:
+            c.force_login(user)
+            # 알림 배지 카운터는 사용자마다 처음 한 번만 센다 → 채워진 상태(평소)를 잰다
+            notifications.unread_count(user.id)
+        return c
+
+    def _measure(self, role, method, url_fn, data_fn):
+        client = self._client(role)
+        # URL/데이터 준비(픽스처 생성) 쿼리는 측정에서 제외
+        url = url_fn()
+        data = data_fn() if data_fn else None
+        with CaptureQueriesContext(connection) as ctx:
+            if method == "POST":
+                response = client.post(url, data)
+            else:
+                response = client.get(url)
+            if response.streaming:
+                _consume(response)
+
+        self.assertLess(response.status_code, 500, url)
+        return len(ctx.captured_queries)
+
+    def test_every_named_route_has_a_budget(self):
+        names = {p.name for p in root_urls.urlpatterns if isinstance(p, URLPattern) and p.name}
+        budgeted = {key.split(":")[0] for key, _ in self.BUDGETS}
+        self.assertEqual(names - budgeted, set())
+
+    def test_query_budgets_do_not_grow_with_rows(self):
+        cases = {name: (method, url_fn, data_fn) for name, method, url_fn, data_fn in self._cases()}
+        small = {key: self._measure(key[1], *cases[key[0]]) for key in self.BUDGETS}
+        self._grow()
+        large = {key: self._measure(key[1], *cases[key[0]]) for key in self.BUDGETS}
+
+        for key, budget in self.BUDGETS.items():
+            with self.subTest(route=key[0], role=key[1]):
+                self.assertLessEqual(large[key], budget, f"쿼리 예산 초과: {small[key]} → {large[key]}")
+                self.assertEqual(small[key], large[key], "행 수에 따라 쿼리 수가 늘어남(N+1)")
+
+
+@override_settings(REQUEST_PROFILE_SAMPLE_RATE=1, REQUEST_PROFILE_SERVER_TIMING=True)
+class RequestProfileMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw-12345!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="123456")
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def test_header_and_log_line_match_the_request(self):
+        with self.assertLogs("submit.profile", "INFO") as logs, CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("team_detail", args=[self.team.id]))
+
+        timing = dict(part.strip().split(";", 1) for part in response["Server-Timing"].split(","))
+        self.assertEqual(set(timing), {"total", "db", "tpl", "in"})
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', timing["db"])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "team_detail")
+        self.assertEqual(record["sql_count"], len(ctx.captured_queries))
+        self.assertEqual(record["bytes_out"], len(response.content))
+        self.assertGreater(record["tpl_ms"], 0)
+
+    async def test_async_chain_is_measured_too(self):
+        client = AsyncClient()
+        await client.aforce_login(self.owner)
+        with self.assertLogs("submit.profile", "INFO") as logs:
+            response = await client.get(reverse("team_detail", args=[self.team.id]))
+        self.assertTrue(response.has_header("Server-Timing"))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "team_detail")
+        self.assertGreater(record["sql_count"], 0)
+        self.assertEqual(record["bytes_out"], len(response.content))
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        # 샘플링이 꺼져 있으면 Template.render 도 원래 그대로
+        with mock.patch.object(DjangoTemplate, "render", middleware._original_render):
+            response = self.client.get(reverse("team_detail", args=[self.team.id]))
+            self.assertIs(DjangoTemplate.render, middleware._original_render)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class TeamAccessCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw-12345!")
+        cls.student = User.objects.create_user("stu", password="pw-12345!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="654321")
+        cls.membership = TeamMembership.objects.create(team=cls.team, student=cls.student)
+        cls.membership.approve(by_user=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.student)
+        self.url = reverse("team_detail", args=[self.team.id])
+
+    def _membership_sql(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        return response, [q["sql"] for q in ctx.captured_queries if "submit_teammembership" in q["sql"]]
+
+    def test_membership_is_cached_across_requests(self):
+        response, first = self._membership_sql()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(first), 1)
+
+        response, second = self._membership_sql()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(second, [])
+
+    def test_reject_invalidates_cached_membership(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.membership.reject(by_user=self.owner)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class LandingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("prof", password="pw-12345!")
+        cls.other = User.objects.create_user("other", password="pw-12345!")
+        future = timezone.now() + datetime.timedelta(days=1)
+        cls.mine = Team.objects.create(owner=cls.user, name="00 내 팀")
+        Assignment.objects.create(team=cls.mine, title="진행", due_at=future)
+        Assignment.objects.create(team=cls.mine, title="마감", due_at=future, is_closed=True)
+        Assignment.objects.create(team=cls.mine, title="지남", due_at=timezone.now() - datetime.timedelta(days=1))
+        students = _make_students("ld", 3)
+        for i, u in enumerate(students):
+            TeamMembership.objects.create(team=cls.mine, student=u, status="PENDING" if i else "APPROVED")
+        # 다른 사람의 팀 60개에 승인 멤버로, 1개는 대기 중
+        cls.joined = [Team.objects.create(owner=cls.other, name=f"팀{i:02d}") for i in range(61)]
+        for t in cls.joined[:60]:
+            TeamMembership.objects.create(team=t, student=cls.user, status="APPROVED")
+        TeamMembership.objects.create(team=cls.joined[60], student=cls.user, status="PENDING")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _get(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("teacher_team_list"))
+        return response, [q["sql"] for q in ctx.captured_queries if "submit_team" in q["sql"]]
+
+    def test_one_query_for_many_teams_with_counters(self):
+        response, team_sql = self._get()
+        self.assertEqual(len(team_sql), 1)
+        self.assertIn("UNION ALL", team_sql[0])
+        cards = response.context["teams"]
+        self.assertEqual([c["id"] for c in cards], [self.mine.id] + [t.id for t in self.joined[:60]])
+        mine = cards[0]
+        self.assertEqual((mine["member_count"], mine["open_assignments"], mine["pending_requests"]), (1, 1, 2))
+        self.assertEqual(cards[1]["owner_name"], "other")
+        self.assertContains(response, "대기 요청 2")
+
+    def test_cached_until_a_team_or_membership_changes(self):
+        self._get()
+        self.assertEqual(self._get()[1], [])
+
+        Assignment.objects.create(team=self.joined[5], title="새 과제", due_at=timezone.now() + datetime.timedelta(hours=1))
+        response, team_sql = self._get()
+        self.assertEqual(len(team_sql), 1)
+        self.assertEqual(response.context["teams"][6]["open_assignments"], 1)
+
+        TeamMembership.objects.filter(team=self.joined[60]).get().approve(by_user=self.other)
+        self.assertEqual(len(self._get()[0].context["teams"]), 62)
+
+        Team.objects.create(owner=self.user, name="새 팀")
+        self.assertEqual(len(self._get()[0].context["teams"]), 63)
+
+    def test_regenerated_join_code_replaces_the_cached_card(self):
+        old = self.mine.join_code
+        self.assertContains(self._get()[0], old)
+        self.client.get(reverse("regen_team_code", args=[self.mine.id]))
+        self.mine.refresh_from_db()
+        self.assertNotEqual(self.mine.join_code, old)
+        response = self._get()[0]
+        self.assertContains(response, self.mine.join_code)
+        self.assertNotContains(response, old)
+
+
+class FragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw-12345!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀")
+        cls.a = Assignment.objects.create(team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(days=1))
+        cls.s1, cls.s2 = _make_students("fc", 2)
+        for u in (cls.s1, cls.s2):
+            TeamMembership.objects.create(team=cls.team, student=u, status="APPROVED", joined_at=timezone.now())
+        cls.sub = Submission.objects.create(assignment=cls.a, student=cls.s1, status="submitted", submitted_at=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, user, name, **kwargs):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(name, kwargs=kwargs))
+        return response, [q["sql"] for q in ctx.captured_queries if 'FROM "submit_assignment"' in q["sql"]]
+
+    def test_assignment_list_is_shared_and_my_status_layered(self):
+        response, sql = self._get(self.s1, "team_detail", team_id=self.team.id)
+        self.assertEqual(len(sql), 1)
+        self.assertContains(response, "제출됨")
+
+        # 다른 멤버는 같은 조각을 쓰고(과제 쿼리 없음) 자기 상태만 다르게 보인다
+        response, sql = self._get(self.s2, "team_detail", team_id=self.team.id)
+        self.assertEqual(sql, [])
+        self.assertContains(response, "과제")
+        self.assertNotContains(response, "제출됨")
+
+    def test_close_and_grade_writes_bump_the_fragments(self):
+        ta = {"team_id": self.team.id, "assignment_id": self.a.id}
+        self._get(self.s1, "team_detail", team_id=self.team.id)
+        self._get(self.s1, "assignment_detail", **ta)
+        response, _ = self._get(self.owner, "team_detail", team_id=self.team.id)
+        self.assertContains(response, "채점 0")
+
+        self.client.get(reverse("assignment_close", kwargs=ta))
+        self.client.post(reverse("grade_submission", kwargs={**ta, "submission_id": self.sub.id}), {"score": "5"})
+        self.assertContains(self._get(self.owner, "team_detail", team_id=self.team.id)[0], "채점 1")
+        self.assertContains(self._get(self.s1, "team_detail", team_id=self.team.id)[0], "마감됨")
+        response, _ = self._get(self.s1, "assignment_detail", **ta)
+        self.assertContains(response, "마감됨")
+        self.assertContains(response, "채점 완료")
+
+
+class SqliteBackendTests(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path, ignore_errors=True)
+
+    def _connect(self, **options):
+        db = SqliteDatabaseWrapper({
+            **connection.settings_dict, "NAME": f"{self.path}/t.sqlite3", "OPTIONS": options, "TEST": {},
+        }, alias="sqlite_test")
+        self.addCleanup(db.close)
+        return db
+
+    def test_pragmas_on_connect(self):
+        db = self._connect(pragmas={"cache_size": -1000})
+        with db.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -1000)
+
+    def test_transactions_take_the_write_lock_up_front(self):
+        first = self._connect()
+        second = self._connect(pragmas={"busy_timeout": 0}, lock_retries=1, lock_backoff=0.001)
+        with first.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (x INTEGER)")
+        first._start_transaction_under_autocommit()
+        try:
+            # BEGIN IMMEDIATE 이므로 아직 아무것도 쓰지 않았어도 다른 연결의 쓰기는 잠금에 걸린다
+            with self.assertRaisesMessage(OperationalError, "locked"), second.cursor() as cursor:
+                cursor.execute("INSERT INTO t VALUES (1)")
+        finally:
+            first.connection.execute("ROLLBACK")
+        with second.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+
+
+class JoinCodeAllocatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw-12345!")
+
+    def test_permutation_is_a_bijection(self):
+        codes = {joincodes.permute(i, key="test") for i in range(joincodes.CODE_SPACE)}
+        self.assertEqual(len(codes), joincodes.CODE_SPACE)
+        self.assertEqual(max(codes), joincodes.CODE_SPACE - 1)
+
+    def test_teams_get_distinct_codes_without_probing(self):
+        with CaptureQueriesContext(connection) as ctx:
+            teams = [Team.objects.create(owner=self.owner, name=f"팀{i}") for i in range(20)]
+        self.assertEqual(len({t.join_code for t in teams}), 20)
+        probes = [q for q in ctx.captured_queries if 'FROM "submit_team"' in q["sql"]]
+        self.assertEqual(probes, [])
+
+    def test_legacy_code_collision_takes_the_next_code(self):
+        taken = joincodes.format_code(joincodes.permute(0))
+        Team.objects.create(owner=self.owner, name="예전 팀", join_code=taken)
+        team = Team.objects.create(owner=self.owner, name="새 팀")
+        self.assertNotEqual(team.join_code, taken)
+
+    @override_settings(JOIN_CODE_REUSE_AFTER=datetime.timedelta(0))
+    def test_retired_codes_return_to_the_pool(self):
+        team = Team.objects.create(owner=self.owner, name="팀")
+        old = team.join_code
+        team.regen_join_code()
+        self.assertNotEqual(team.join_code, old)
+        self.assertEqual(Team.objects.create(owner=self.owner, name="다음 팀").join_code, old)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, SUBMISSION_INGEST_ROOT=STAGING_ROOT + "/ingest",
+                   SUBMISSION_INGEST_QUEUE=True)
+class IngestQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.student = User.objects.create_user("stu", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="222222")
+        TeamMembership.objects.create(team=cls.team, student=cls.student).approve(by_user=cls.owner)
+        cls.a = Assignment.objects.create(team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(hours=1),
+                                          created_by=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.student)
+        self.addCleanup(shutil.rmtree, ingest.spool_root(), True)
+
+    def _submit(self, *names, **headers):
+        files = [SimpleUploadedFile(name, name.encode()) for name in names]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("assignment_submit", args=[self.team.id, self.a.id]),
+                                        {"comment": "c", "files": files}, headers=headers)
+        # 접수 요청은 DB 에 쓰지 않는다
+        self.assertFalse([q for q in ctx.captured_queries if not q["sql"].startswith("SELECT")])
+        return response.url.rstrip("/").rsplit("/", 1)[1]
+
+    def _poll(self, receipt_id):
+        return self.client.get(reverse("submission_receipt", args=[receipt_id]),
+                               headers={"accept": "application/json"}).json()
+
+    def test_receipt_is_applied_with_arrival_time(self):
+        before = timezone.now()
+        receipt_id = self._submit("a.txt", "b.txt")
+        self.assertEqual(self._poll(receipt_id)["status"], "queued")
+        self.assertFalse(Submission.objects.exists())
+
+        self.assertEqual(ingest.process(ingest.pending(10))["accepted"], 1)
+        sub = Submission.objects.get(assignment=self.a, student=self.student)
+        receipt = SubmissionReceipt.objects.get(pk=receipt_id)
+        self.assertEqual(sub.submitted_at, receipt.accepted_at)
+        self.assertLess(sub.submitted_at, receipt.processed_at)
+        self.assertGreaterEqual(sub.submitted_at, before)
+        self.assertEqual(sorted(sub.files.values_list("original_name", flat=True)), ["a.txt", "b.txt"])
+        self.assertEqual(self._poll(receipt_id)["status"], "accepted")
+        self.assertEqual(ingest.pending(10), [])
+
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(reverse("submission_receipt", args=[receipt_id])).status_code, 403)
+
+    def test_latest_arrival_wins(self):
+        first, second = self._submit("old.txt"), self._submit("new.txt")
+        ingest.process(ingest.pending(10))
+        self.assertEqual((self._poll(first)["status"], self._poll(second)["status"]), ("superseded", "accepted"))
+
+        # 먼저 도착했지만 늦게 스풀에 들어온 접수(프록시가 본문을 버퍼링한 큰 업로드 등)는 이미 반영된 제출을 덮지 않는다.
+        # X-Request-Start 는 TRUST_X_REQUEST_START 일 때만 쓴다
+        early = timezone.now() - datetime.timedelta(minutes=1)
+        header = {"X-Request-Start": f"t={early.timestamp():.3f}"}
+        current_id = self._submit("slow.txt", **header)
+        with override_settings(TRUST_X_REQUEST_START=True):
+            stale_id = self._submit("stale.txt", **header)
+        accepted_at = datetime.datetime.fromisoformat(self._poll(stale_id)["accepted_at"])
+        self.assertLess(abs(accepted_at - early), datetime.timedelta(milliseconds=1))
+        ingest.process(ingest.pending(10))
+        self.assertEqual((self._poll(current_id)["status"], self._poll(stale_id)["status"]), ("accepted", "superseded"))
+        sub = Submission.objects.get(assignment=self.a, student=self.student)
+        self.assertEqual(list(sub.files.values_list("original_name", flat=True)), ["slow.txt"])
+
+    def test_reprocessing_after_crash_is_idempotent(self):
+        receipt_id = self._submit("a.txt")
+        records = ingest.pending(10)
+        ingest.process(records)
+        # 커밋 후 스풀을 지우기 전에 죽은 경우: 같은 접수를 다시 처리해도 바뀌지 않는다
+        self.assertEqual(ingest.process(records)["duplicate"], 1)
+        self.assertEqual(SubmissionFile.objects.count(), 1)
+        self.assertEqual(self._poll(receipt_id)["status"], "accepted")
+
+    def test_asgi_arrival_is_stamped_before_the_body_is_read(self):
+        seen = {}
+
+        async def app(scope, receive, send):
+            seen.update(scope)
+        before = timezone.now()
+        async_to_sync(middleware.stamp_arrival(app))({"type": "http"}, None, None)
+        self.assertGreaterEqual(seen[middleware.ARRIVAL_SCOPE_KEY], before)
+
+        # 미들웨어는 (본문을 다 받은 뒤의) 지금이 아니라 scope 의 시각을 쓴다
+        request = RequestFactory().post("/")
+        request.scope = {middleware.ARRIVAL_SCOPE_KEY: before - datetime.timedelta(seconds=30)}
+        middleware.ArrivalTimeMiddleware(lambda r: r)(request)
+        self.assertEqual(request.arrived_at, before - datetime.timedelta(seconds=30))
+
+    def test_failed_apply_keeps_the_spool_and_drops_written_blobs(self):
+        receipt_id = self._submit("unique-spool.txt")
+        storage = SubmissionFile._meta.get_field("file").storage
+        blob = storage.blob_name(hashlib.sha256(b"unique-spool.txt").hexdigest(), prefix="submissions")
+
+        # 트랜잭션 안에서 DB 잠김: 스풀은 남고, 써 둔 blob 은 참조가 없으므로 지운다
+        with mock.patch.object(SubmissionReceipt.objects, "bulk_create", side_effect=OperationalError("database is locked")), \
+                self.assertLogs("submit.ingest", "ERROR"):
+            self.assertEqual(ingest.process(ingest.pending(10))["retry"], 1)
+        self.assertTrue((ingest.spool_root() / receipt_id / ingest.RECEIPT_FILE).exists())
+        self.assertFalse(storage.exists(blob))
+        self.assertFalse(SubmissionReceipt.objects.exists())
+        self.assertEqual(self._poll(receipt_id)["status"], "queued")
+
+        # 다음 회차에 그대로 반영되고, 기록이 커밋된 뒤에야 스풀을 지운다
+        self.assertEqual(ingest.process(ingest.pending(10))["accepted"], 1)
+        self.assertTrue(storage.exists(blob))
+        self.assertFalse((ingest.spool_root() / receipt_id).exists())
+
+    def test_unrecordable_failure_is_parked_not_deleted(self):
+        receipt_id = self._submit("a.txt")
+        with mock.patch.object(ingest, "_apply", side_effect=ValueError("boom")), \
+                mock.patch.object(ingest, "_record_failure", return_value=False), \
+                self.assertLogs("submit.ingest", "ERROR"):
+            self.assertEqual(ingest.process(ingest.pending(10))["failed"], 1)
+        self.assertTrue((ingest.spool_root() / f"{receipt_id}{ingest.FAILED_SUFFIX}" / ingest.RECEIPT_FILE).exists())
+        self.assertEqual(ingest.pending(10), [])
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="333333")
+        cls.students = _make_students("nt", 5)
+        for u in cls.students:
+            TeamMembership.objects.create(team=cls.team, student=u, status="APPROVED", joined_at=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+
+    def test_new_assignment_fans_out_in_batches(self):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_create", args=[self.team.id])
+        with mock.patch.object(notifications, "BATCH_SIZE", 2), CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {"title": "과제", "due_at": "2030-01-01T09:00", "max_score": "10"})
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "submit_notification"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(
+            set(Notification.objects.filter(type=notifications.ASSIGNMENT_CREATED).values_list("user_id", flat=True)),
+            {u.id for u in self.students},
+        )
+
+    def test_unread_badge_uses_cached_counter(self):
+        student = self.students[0]
+        self.client.force_login(student)
+        self.assertEqual(notifications.unread_count(student.id), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.send(notifications.GRADED, [student.id, self.owner.id], {"message": "채점", "url": "/"})
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(student.id), 1)
+        # 카운터가 없던 사용자는 다음 조회 때 센다
+        self.assertEqual(notifications.unread_count(self.owner.id), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("notification_list"))
+        self.assertContains(response, "채점")
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(" in q["sql"]])
+
+        n = Notification.objects.get(user=student)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(reverse("notification_open", args=[n.id]))
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(student.id), 0)
+
+    def test_join_request_and_decision_notify(self):
+        newcomer = User.objects.create_user("newbie", password="!")
+        self.client.force_login(newcomer)
+        self.client.post(reverse("team_request_by_code"), {"join_code": self.team.join_code})
+        note = Notification.objects.get(user=self.owner)
+        self.assertEqual(note.type, notifications.JOIN_REQUEST)
+
+        self.client.force_login(self.owner)
+        self.client.post(reverse("team_request_reject", args=[note.payload["membership"]]))
+        self.assertEqual(Notification.objects.get(user=newcomer).type, notifications.JOIN_REJECTED)
+
+
+@override_settings(DUE_REMINDER_WINDOWS=(
+    datetime.timedelta(hours=24), datetime.timedelta(hours=1),
+))
+class DueReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="444444")
+        cls.done, cls.empty, cls.lazy, cls.pending = _make_students("dr", 4)
+        for u in (cls.done, cls.empty, cls.lazy):
+            TeamMembership.objects.create(team=cls.team, student=u, status="APPROVED", joined_at=timezone.now())
+        TeamMembership.objects.create(team=cls.team, student=cls.pending)
+        now = timezone.now()
+        cls.soon = Assignment.objects.create(team=cls.team, title="곧", due_at=now + datetime.timedelta(hours=5))
+        cls.urgent = Assignment.objects.create(team=cls.team, title="급함", due_at=now + datetime.timedelta(minutes=30))
+        Assignment.objects.create(team=cls.team, title="먼", due_at=now + datetime.timedelta(days=3))
+        Assignment.objects.create(team=cls.team, title="닫힘", due_at=now + datetime.timedelta(hours=2), is_closed=True)
+        for a in (cls.soon, cls.urgent):
+            Submission.objects.create(assignment=a, student=cls.done, status="submitted", submitted_at=now)
+            Submission.objects.create(assignment=a, student=cls.empty, status="not_submitted")
+
+    def _reminders(self):
+        return sorted(
+            (n.payload["assignment"], n.user_id, n.payload["window"])
+            for n in Notification.objects.filter(type=notifications.DUE_SOON)
+        )
+
+    def test_reminds_missing_members_once_per_window(self):
+        call_command("send_due_reminders", stdout=io.StringIO())
+        expected = sorted(
+            [(self.soon.id, u.id, "24시간") for u in (self.empty, self.lazy)]
+            + [(self.urgent.id, u.id, "1시간") for u in (self.empty, self.lazy)]
+        )
+        self.assertEqual(self._reminders(), expected)
+
+        # 다시 돌려도 같은 알림은 없고, 지난 위치 이후(와 최근에 고쳐진 과제)만 본다
+        Assignment.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("send_due_reminders", stdout=io.StringIO())
+        self.assertEqual(self._reminders(), expected)
+        self.assertFalse([q for q in ctx.captured_queries if 'FROM "submit_teammembership"' in q["sql"]])
+
+        # 위치가 지워져도(다시 설치 등) 이미 보낸 알림은 다시 보내지 않는다
+        ScheduleMark.objects.all().delete()
+        call_command("send_due_reminders", stdout=io.StringIO())
+        self.assertEqual(self._reminders(), expected)
+
+    def test_assignments_added_reopened_or_moved_into_scanned_range(self):
+        call_command("send_due_reminders", stdout=io.StringIO())
+        first = self._reminders()
+        now = timezone.now()
+        # 이미 지나간 구간에 새로 생긴 과제, 다시 연 과제, 마감을 당긴 과제
+        added = Assignment.objects.create(team=self.team, title="추가", due_at=now + datetime.timedelta(hours=3))
+        closed = Assignment.objects.get(title="닫힘")
+        closed.is_closed = False
+        closed.save(update_fields=["is_closed", "updated_at"])
+        moved = Assignment.objects.get(title="먼")
+        moved.due_at = now + datetime.timedelta(hours=4)
+        moved.save()
+
+        call_command("send_due_reminders", stdout=io.StringIO())
+        new = sorted(set(self._reminders()) - set(first))
+        self.assertEqual(new, sorted(
+            (a.id, u.id, "24시간") for a in (added, closed, moved) for u in (self.done, self.empty, self.lazy)
+        ))
+
+    def test_one_anti_join_per_batch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("send_due_reminders", "--windows", "24h", stdout=io.StringIO())
+        lookups = [q for q in ctx.captured_queries if 'FROM "submit_teammembership"' in q["sql"]]
+        self.assertEqual(len(lookups), 1)
+        self.assertIn("NOT EXISTS", lookups[0]["sql"])
+
+
+@override_settings(EVENTS_HEARTBEAT=5)
+class EventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="555555")
+        cls.student, cls.other = _make_students("ev", 2)
+        cls.membership = TeamMembership.objects.create(team=cls.team, student=cls.student)
+        cls.assignment = Assignment.objects.create(
+            team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        Submission.objects.create(assignment=cls.assignment, student=cls.student, status="graded")
+        Submission.objects.create(assignment=cls.assignment, student=cls.other, status="not_submitted")
+
+    def setUp(self):
+        cache.clear()
+
+    def _decide(self, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.status = status
+            self.membership.save()
+
+    async def test_live_stream_sends_snapshot_then_saved_changes(self):
+        client = AsyncClient()
+        await client.aforce_login(self.student)
+        response = await client.get(reverse("membership_events"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        first = (await anext(chunks)).decode()
+        self.assertTrue(first.startswith("event: memberships\n"))
+        self.assertIn('"status": "PENDING"', first)
+
+        # 승인(커밋 후 발행) → 같은 연결로 바로 온다
+        await sync_to_async(self._decide)("APPROVED")
+        update = (await asyncio.wait_for(anext(chunks), 2)).decode()
+        self.assertTrue(update.startswith("event: membership\n"))
+        self.assertIn('"status": "APPROVED"', update)
+        await chunks.aclose()
+
+    def test_no_subscribers_no_work(self):
+        sub = Submission.objects.get(student=self.other)
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            sub.save()
+        self.assertEqual(len(ctx.captured_queries), 1)  # UPDATE 만(카운트 집계 없음)
+
+    def test_wsgi_sends_counts_once_with_retry(self):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_events", args=[self.team.id, self.assignment.id])
+        body = _consume(self.client.get(url)).decode()
+        self.assertIn('event: counts\ndata: {"submitted": 1, "graded": 1}', body)
+        self.assertIn("retry: ", body)
+
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_STAGING_ROOT=STAGING_ROOT)
+class AsyncTransferTests(TestCase):
+    DATA = bytes(range(256)) * 2048  # 512KB → 여러 조각
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.student = User.objects.create_user("stu", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="666666")
+        TeamMembership.objects.create(team=cls.team, student=cls.student).approve(by_user=cls.owner)
+        cls.a = Assignment.objects.create(team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(hours=1))
+        sub = Submission.objects.create(assignment=cls.a, student=cls.student, status="submitted")
+        cls.file = SubmissionFile.objects.create(
+            submission=sub, file=SimpleUploadedFile("big.bin", cls.DATA), size=len(cls.DATA),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    async def _client(self, user):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        return client
+
+    async def test_download_is_an_async_stream_on_asgi(self):
+        client = await self._client(self.student)
+        url = reverse("submission_file_download", args=[self.file.id])
+        response = await client.get(url)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Length"], str(len(self.DATA)))
+        self.assertEqual(b"".join([c async for c in response.streaming_content]), self.DATA)
+
+        response = await client.get(url, headers={"range": "bytes=1000-1999"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join([c async for c in response.streaming_content]), self.DATA[1000:2000])
+
+        outsider = await self._client(await User.objects.acreate(username="out"))
+        self.assertEqual((await outsider.get(url)).status_code, 403)
+
+    async def test_zip_is_an_async_stream_on_asgi(self):
+        client = await self._client(self.owner)
+        response = await client.get(reverse("assignment_submissions_zip", args=[self.team.id, self.a.id]))
+        self.assertTrue(response.is_async)
+        body = b"".join([c async for c in response.streaming_content])
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            self.assertEqual(zf.read(zf.namelist()[0]), self.DATA)
+
+    def test_wsgi_keeps_file_response(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse("submission_file_download", args=[self.file.id]))
+        self.assertFalse(response.is_async)
+        self.assertEqual(b"".join(response.streaming_content), self.DATA)
+
+    async def test_chunks_are_appended_without_the_sync_view_path(self):
+        session = await UploadSession.objects.acreate(
+            assignment=self.a, student=self.student, filename="up.bin", total_size=len(self.DATA),
+        )
+        client = await self._client(self.student)
+        url = reverse("upload_session", args=[self.team.id, self.a.id, session.id])
+        half = len(self.DATA) // 2
+        for offset in (0, half):
+            response = await client.put(url, self.DATA[offset:offset + half], content_type="application/octet-stream",
+                                        headers={"upload-offset": str(offset)})
+            self.assertEqual(response.json()["offset"], offset + half)
+        await session.arefresh_from_db()
+        self.assertTrue(session.is_complete)
+        self.assertEqual(session.staging_path.read_bytes(), self.DATA)
+
+    async def test_form_submission_stores_files_off_the_sync_thread(self):
+        threads = {}
+
+        def spy(name):
+            original = getattr(views, name)
+
+            def wrapper(*args, **kwargs):
+                threads[name] = threading.get_ident()
+                return original(*args, **kwargs)
+            return mock.patch.object(views, name, wrapper)
+
+        client = await self._client(self.student)
+        url = reverse("assignment_submit", args=[self.team.id, self.a.id])
+        with spy("_store_submission_files"), spy("_replace_submission_files"):
+            response = await client.post(url, {"comment": "제출", "files": SimpleUploadedFile("new.bin", self.DATA[::-1])})
+        self.assertEqual(response.status_code, 302)
+        # 해시·복사는 스레드 풀, DB 반영만 동기 스레드
+        self.assertNotEqual(threads["_store_submission_files"], threads["_replace_submission_files"])
+        f = await SubmissionFile.objects.aget(submission__student=self.student)
+        self.assertEqual((f.original_name, f.size), ("new.bin", len(self.DATA)))
+        with f.file.open("rb") as fh:
+            self.assertEqual(fh.read(), self.DATA[::-1])
+
+    async def test_form_submission_still_checks_csrf(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        await client.aforce_login(self.student)
+        url = reverse("assignment_submit", args=[self.team.id, self.a.id])
+        response = await client.post(url, {"files": SimpleUploadedFile("new.bin", b"x")})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(await SubmissionFile.objects.acount(), 1)
+
+
+def _jpeg(width, height, color="red"):
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, "JPEG")
+    return SimpleUploadedFile("photo.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CoverVariantTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="777777")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.owner)
+
+    def _edit(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("team_edit", args=[self.team.id]), {"name": "팀", "cover": upload})
+        self.team.refresh_from_db()
+        return self.team.cover_variants
+
+    def test_upload_builds_variants_and_cards_use_srcset(self):
+        variants = self._edit(_jpeg(1200, 800))
+        self.assertEqual(variants["source"], self.team.cover.name)
+        self.assertEqual(
+            sorted((i["width"], i["height"], i["format"]) for i in variants["items"]),
+            sorted((w, h, f) for w, h in ((320, 213), (640, 427), (960, 640)) for f in ("jpeg", "webp")),
+        )
+
+        page = self.client.get(reverse("teacher_team_list")).content.decode()
+        webp = reverse("team_cover_variant", args=[self.team.id, "640w.webp"])
+        self.assertIn(f"{webp} 640w", page)
+        self.assertIn('loading="lazy"', page)
+        self.assertIn('width="640" height="427"', page)
+
+        response = self.client.get(webp)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertIn("max-age=2592000", response["Cache-Control"])
+        with Image.open(io.BytesIO(b"".join(response.streaming_content))) as im:
+            self.assertEqual(im.size, (640, 427))
+
+    def test_replacing_the_cover_removes_old_variants(self):
+        storage = self.team.cover.storage
+        old = [i["name"] for i in self._edit(_jpeg(400, 300))["items"]]
+        self.assertEqual(sorted({i["width"] for i in self.team.cover_variants["items"]}), [320, 400])
+        new = [i["name"] for i in self._edit(_jpeg(500, 500, "blue"))["items"]]
+        self.assertFalse(any(storage.exists(n) for n in old))
+        self.assertTrue(all(storage.exists(n) for n in new))
+        self.assertEqual(
+            self.client.get(reverse("team_cover_variant", args=[self.team.id, "400w.webp"])).status_code, 404,
+        )
+
+    def test_non_image_covers_are_rejected_and_never_served_inline(self):
+        for name, body in (("cover.html", b"<script>alert(1)</script>"),
+                           ("cover.svg", b'<svg xmlns="http://www.w3.org/2000/svg" onload="alert(1)"/>')):
+            with self.subTest(name=name):
+                response = self.client.post(reverse("team_edit", args=[self.team.id]),
+                                            {"name": "팀", "cover": SimpleUploadedFile(name, body)})
+                self.assertContains(response, "JPEG, PNG, GIF, WebP")
+                self.team.refresh_from_db()
+                self.assertFalse(self.team.cover)
+
+        # 이미지면 이름과 상관없이 실제 형식의 확장자로 저장하고 이미지 Content-Type 으로 보낸다
+        upload = _jpeg(100, 50)
+        upload.name = "cover.html"
+        self._edit(upload)
+        self.assertTrue(self.team.cover.name.endswith(".jpg"))
+        response = self.client.get(reverse("team_cover", args=[self.team.id]))
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+
+        # 검사 이전에 올라온 이미지 아닌 원본은 내려받기로만
+        self.team.cover.save("old.html", ContentFile(b"<script>alert(1)</script>"))
+        response = self.client.get(reverse("team_cover", args=[self.team.id]))
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment"))
+
+    def test_backfill_command_builds_missing_variants(self):
+        self.team.cover.save("old.jpg", _jpeg(100, 50))  # 이 기능 이전 방식
+        self.assertEqual(self.team.cover_variants, {})
+        call_command("build_cover_variants", stdout=io.StringIO())
+        self.team.refresh_from_db()
+        self.assertEqual([(i["width"], i["height"]) for i in self.team.cover_variants["items"]], [(100, 50)] * 2)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="555555")
+        cls.a = Assignment.objects.create(
+            team=cls.team, title="과제", due_at=timezone.now() + datetime.timedelta(days=1), created_by=cls.owner,
+        )
+        cls.s1, cls.s2 = _make_students("cg", 2)
+        for u in (cls.s1, cls.s2):
+            TeamMembership.objects.create(team=cls.team, student=u, status="APPROVED", joined_at=timezone.now())
+        cls.outsider = User.objects.create_user("out", password="!")
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, url, etag=None):
+        return self.client.get(url, **({"HTTP_IF_NONE_MATCH": etag} if etag else {}))
+
+    def test_unchanged_pages_get_304_without_rendering(self):
+        urls = [
+            (self.s1, reverse("team_detail", args=[self.team.id])),
+            (self.s1, reverse("assignment_detail", args=[self.team.id, self.a.id])),
+            (self.s1, reverse("assignment_list", args=[self.team.id])),
+            (self.owner, reverse("assignment_submissions", args=[self.team.id, self.a.id])),
+        ]
+        for user, url in urls:
+            with self.subTest(url=url):
+                self.client.force_login(user)
+                first = self._get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertIn("no-cache", first["Cache-Control"])
+                self.assertIn("private", first["Cache-Control"])
+                with CaptureQueriesContext(connection) as queries:
+                    again = self._get(url, first["ETag"])
+                self.assertEqual(again.status_code, 304)
+                self.assertEqual(again.content, b"")
+                self.assertEqual(again.templates, [])
+                # 세션, 사용자, 권한(팀/과제), 검증값 집계 — 화면 쿼리·템플릿 없음
+                self.assertLessEqual(len(queries), 4, [q["sql"] for q in queries])
+                # If-Modified-Since 만 보내도
+                since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+                self.assertEqual(since.status_code, 304)
+
+    def test_submission_and_grade_change_the_validator(self):
+        self.client.force_login(self.s1)
+        url = reverse("assignment_detail", args=[self.team.id, self.a.id])
+        etag = self._get(url)["ETag"]
+
+        sub = Submission.objects.create(assignment=self.a, student=self.s1, status="submitted", submitted_at=timezone.now())
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        Grade.objects.create(submission=sub, score=90, grader=self.owner)
+        self.assertEqual(self._get(url, etag).status_code, 200)
+
+        # 다른 학생의 제출은 내 화면을 바꾸지 않는다
+        etag = self._get(url)["ETag"]
+        Submission.objects.create(assignment=self.a, student=self.s2, status="submitted", submitted_at=timezone.now())
+        self.assertEqual(self._get(url, etag).status_code, 304)
+
+    def test_owner_team_page_validator_sees_submissions_without_a_generation_bump(self):
+        # 다른 워커가 올린 세대를 못 보는 경우(프로세스별 캐시): 세대는 그대로여도 DB 집계로 바뀐다
+        self.client.force_login(self.owner)
+        url = reverse("team_detail", args=[self.team.id])
+        etag = self._get(url)["ETag"]
+        self.assertEqual(self._get(url, etag).status_code, 304)
+
+        with mock.patch.object(generations, "bump"):
+            sub = Submission.objects.create(
+                assignment=self.a, student=self.s1, status="submitted", submitted_at=timezone.now(),
+            )
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        with mock.patch.object(generations, "bump"):
+            Grade.objects.create(submission=sub, score=90, grader=self.owner)
+        self.assertEqual(self._get(url, etag).status_code, 200)
+
+    def test_validator_is_per_viewer_and_checked_after_access(self):
+        url = reverse("team_detail", args=[self.team.id])
+        self.client.force_login(self.s1)
+        etag = self._get(url)["ETag"]
+
+        self.client.force_login(self.s2)
+        self.assertEqual(self._get(url, etag).status_code, 200)
+        self.client.force_login(self.outsider)
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_pending_messages_force_a_full_render(self):
+        self.client.force_login(self.s1)
+        url = reverse("team_detail", args=[self.team.id])
+        etag = self._get(url)["ETag"]
+        self.client.get(reverse("team_join", args=[self.team.id]))  # "이미 참가 완료된 팀입니다." 후 팀 상세로
+        response = self._get(url, etag)
+        self.assertContains(response, "이미 참가 완료된 팀입니다.")
+        self.assertEqual(self._get(url, etag).status_code, 304)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="444444")
+        now = timezone.now()
+        cls.a = Assignment.objects.create(team=cls.team, title="과제", due_at=now, created_by=cls.owner)
+        cls.students = _make_students("kp", 8)
+        # 같은 시각(동점) 둘, 마감 후 둘, 제출일시 없는 기록 둘
+        times = [
+            now - datetime.timedelta(hours=3), now - datetime.timedelta(hours=2), now - datetime.timedelta(hours=2),
+            now - datetime.timedelta(hours=1), now + datetime.timedelta(hours=1), now + datetime.timedelta(hours=2),
+            None, None,
+        ]
+        cls.subs = [
+            Submission.objects.create(
+                assignment=cls.a, student=u, submitted_at=t, status="submitted" if t else "not_submitted",
+            )
+            for u, t in zip(cls.students, times)
+        ]
+        Grade.objects.create(submission=cls.subs[0], score=80, grader=cls.owner)
+
+    def setUp(self):
+        cache.clear()
+
+    def _walk(self, url, key):
+        """다음 링크를 따라가며 모든 페이지의 행 → (행 목록, 페이지 수)"""
+        rows, pages, query = [], 0, ""
+        while True:
+            response = self.client.get(url + query)
+            self.assertEqual(response.status_code, 200)
+            page = response.context[key]
+            rows += page.items
+            pages += 1
+            if not page.has_next:
+                return rows, pages
+            query = page.next_url
+
+    def _submissions(self, query=""):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_submissions", args=[self.team.id, self.a.id])
+        return self.client.get(url + query).context["subs"].items
+
+    def test_submission_pages_cover_every_row_once(self):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_submissions", args=[self.team.id, self.a.id])
+        with mock.patch("submit.views.SUBMISSIONS_PAGE_SIZE", 3):
+            rows, pages = self._walk(url, "subs")
+        self.assertEqual(pages, 3)
+        # 최근 제출부터(동점은 id 역순), 제출일시 없는 기록은 맨 뒤
+        dated = sorted(self.subs[:6], key=lambda s: (s.submitted_at, s.pk), reverse=True)
+        undated = sorted(self.subs[6:], key=lambda s: s.pk, reverse=True)
+        self.assertEqual([s.pk for s in rows], [s.pk for s in dated + undated])
+
+    def test_later_pages_cost_the_same(self):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_submissions", args=[self.team.id, self.a.id])
+        self.client.get(url)  # 권한 캐시 채우기
+        counts, query = [], ""
+        with mock.patch("submit.views.SUBMISSIONS_PAGE_SIZE", 2):
+            for _ in range(4):
+                with CaptureQueriesContext(connection) as queries:
+                    query = self.client.get(url + query).context["subs"].next_url
+                counts.append(len(queries))
+        # 몇 번째 페이지든 QueryBudgetTests 와 같은 예산(NULL 묶음과 만나는 경계 페이지만 +1)
+        self.assertLessEqual(max(counts), QueryBudgetTests.BUDGETS[("assignment_submissions", "owner")], counts)
+        self.assertLessEqual(max(counts) - min(counts), 1, counts)
+
+    def test_submission_filters(self):
+        self.assertEqual([s.pk for s in self._submissions("?graded=yes")], [self.subs[0].pk])
+        self.assertEqual(len(self._submissions("?graded=no")), 7)
+        self.assertEqual({s.pk for s in self._submissions("?late=1")}, {self.subs[4].pk, self.subs[5].pk})
+        self.assertEqual({s.pk for s in self._submissions("?status=not_submitted")}, {self.subs[6].pk, self.subs[7].pk})
+        self.assertEqual([s.pk for s in self._submissions("?q=kp-00003")], [self.subs[3].pk])
+        self.assertEqual(len(self._submissions("?status=bogus&after=garbage")), 8)  # 모르는 값은 무시
+
+    def test_filters_are_kept_in_page_links_and_etag(self):
+        self.client.force_login(self.owner)
+        url = reverse("assignment_submissions", args=[self.team.id, self.a.id])
+        with mock.patch("submit.views.SUBMISSIONS_PAGE_SIZE", 1):
+            first = self.client.get(url + "?late=1")
+        self.assertIn("late=1", first.context["subs"].next_url)
+        self.assertIn("after=", first.context["subs"].next_url)
+        plain = self.client.get(url)
+        self.assertNotEqual(first["ETag"], plain["ETag"])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=plain["ETag"]).status_code, 304)
+
+    def test_pending_requests_are_paged_and_searchable(self):
+        for u in self.students:
+            TeamMembership.objects.create(team=self.team, student=u)
+        self.client.force_login(self.owner)
+        url = reverse("team_requests", args=[self.team.id])
+        with mock.patch("submit.views.REQUESTS_PAGE_SIZE", 3):
+            rows, pages = self._walk(url, "pending")
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(m.student_id for m in rows), sorted(u.pk for u in self.students))
+        found = self.client.get(url + "?q=kp-00005").context["pending"].items
+        self.assertEqual([m.student_id for m in found], [self.students[5].pk])
+
+    def test_join_page_status_filter(self):
+        s = self.students[0]
+        TeamMembership.objects.create(team=self.team, student=s, status="REJECTED")
+        other = Team.objects.create(owner=self.owner, name="다른 팀", join_code="333333")
+        TeamMembership.objects.create(team=other, student=s)
+        self.client.force_login(s)
+        url = reverse("team_join_page")
+        self.assertEqual(len(self.client.get(url).context["my_requests"]), 2)
+        pending = self.client.get(url + "?status=PENDING").context["my_requests"].items
+        self.assertEqual([m.team_id for m in pending], [other.pk])
+
+
+class StaticAssetTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="kp-submit-test-static-")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def _collect(self):
+        storages = {
+            **settings.STORAGES,
+            "staticfiles": {"BACKEND": "submit.storage.CompressedManifestStaticFilesStorage"},
+        }
+        override = override_settings(STATIC_ROOT=self.root, STORAGES=storages)
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        return staticfiles_storage.stored_name("css/style.css")
+
+    def test_stylesheet_is_prebuilt_from_templates(self):
+        page = self.client.get(reverse("login")).content.decode()
+        self.assertIn("/static/css/style.css", page)
+        self.assertNotIn("cdn.tailwindcss.com", page)
+
+        # 템플릿 class 에 쓰인 클래스는 모두 들어 있고(build_css 를 안 돌렸으면 실패), 안 쓰는 클래스는 빠져 있다
+        css = Path(settings.TAILWIND_OUTPUT).read_text(encoding="utf-8")
+        used = set()
+        for path in Path(settings.BASE_DIR, "templates").rglob("*.html"):
+            text = re.sub(r"\{%.*?%\}|\{\{.*?\}\}", " ", path.read_text(encoding="utf-8"), flags=re.S)
+            for value in re.findall(r'class="([^"]*)"', text):
+                used.update(value.split())
+        missing = sorted(c for c in used if "." + re.sub(r"([^\w-])", r"\\\1", c) not in css)
+        self.assertEqual(missing, [])
+        self.assertNotIn(".bg-fuchsia-900", css)
+        self.assertLess(len(css.encode()), 40_000)
+
+    @skipUnless(shutil.which(settings.TAILWIND_CLI), "Tailwind CLI 없음(pip install tailwindcss-bin)")
+    def test_stylesheet_matches_tailwind_build(self):
+        call_command("build_css", "--check", stdout=io.StringIO(), stderr=io.StringIO())
+
+    def test_collectstatic_writes_hashed_and_compressed_copies(self):
+        name = self._collect()
+        self.assertRegex(name, r"^css/style\.[0-9a-f]{12}\.css$")
+        with open(f"{self.root}/{name}", "rb") as fh, gzip.open(f"{self.root}/{name}.gz") as gz:
+            self.assertEqual(gz.read(), fh.read())
+        # 이미지는 압축본을 만들지 않는다
+        self.assertFalse(staticfiles_storage.exists(staticfiles_storage.stored_name("img/polytech.png") + ".gz"))
+
+    def test_serve_static_negotiates_encoding_and_caches_forever(self):
+        name = self._collect()
+        factory = RequestFactory()
+
+        response = serve_static(factory.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate, br;q=0"), name)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn(f"max-age={settings.STATIC_MAX_AGE}", response["Cache-Control"])
+        css = gzip.decompress(_consume(response)).decode()
+        self.assertIn(".bg-gray-50{", css)
+
+        plain = serve_static(factory.get("/"), name)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(_consume(plain).decode(), css)
+        self.assertNotEqual(plain["ETag"], response["ETag"])
+
+        again = serve_static(factory.get("/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]), name)
+        self.assertEqual(again.status_code, 304)
+
+        # 해시 없는 이름은 매번 확인
+        self.assertIn("no-cache", serve_static(factory.get("/"), "css/style.css")["Cache-Control"])
+        with self.assertRaises(Http404):
+            serve_static(factory.get("/"), "../manage.py")
+
+
+class GradebookTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("prof", password="pw-12345!")
+        cls.team = Team.objects.create(owner=cls.owner, name="팀", join_code="111111")
+        now = timezone.now()
+        cls.a1 = Assignment.objects.create(team=cls.team, title="과제1", due_at=now, max_score=10, created_by=cls.owner)
+        cls.a2 = Assignment.objects.create(
+            team=cls.team, title="과제2", due_at=now + datetime.timedelta(days=1), max_score=20, created_by=cls.owner
+        )
+        cls.s1, cls.s2, cls.gone = _make_students("gb", 3)
+        for u in (cls.s1, cls.s2, cls.gone):
+            TeamMembership.objects.create(team=cls.team, student=u, status="APPROVED", joined_at=now)
+        TeamMembership.objects.filter(student=cls.gone).update(status="LEFT")
+
+        def submit(a, u, status, when, score=None):
+            sub = Submission.objects.create(assignment=a, student=u, status=status, submitted_at=when)
+            if score is not None:
+                Grade.objects.create(submission=sub, score=score, grader=cls.owner)
+
+        # s1: 과제1 마감 후 제출 후 채점(graded 여도 지연 표시), 과제2 제출
+        submit(cls.a1, cls.s1, "graded", now + datetime.timedelta(hours=1), score=7)
+        submit(cls.a2, cls.s1, "submitted", now)
+        # s2: 과제1 정시 채점
+        submit(cls.a1, cls.s2, "graded", now - datetime.timedelta(hours=1), score=9)
+        # 탈퇴한 학생의 제출은 제외
+        submit(cls.a1, cls.gone, "graded", now, score=1)
+
+    def test_matrix_and_totals(self):
+        book = gradebook.build(self.team)
+        rows = {sid: (cells, total, submitted, late) for sid, _, cells, total, submitted, late in book.rows()}
+        self.assertEqual(set(rows), {self.s1.id, self.s2.id})
+
+        cells, total, submitted, late = rows[self.s1.id]
+        self.assertEqual([c[:3] for c in cells], [(gradebook.GRADED, True, 7), (gradebook.SUBMITTED, False, None)])
+        self.assertEqual((total, submitted, late), (7, 2, 1))
+
+        columns = list(book.columns())
+        self.assertEqual([c[4:] for c in columns], [(2, 1, 2, 8.0), (1, 0, 0, None)])
+        self.assertEqual(book.max_total, 30)
+
+    def test_exports_stream_approved_members_only(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("team_grades_export", args=[self.team.id]))
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual(rows[0], list(exports.HEADER))
+        self.assertEqual(sorted(r[2] for r in rows[1:]), ["gb0", "gb0", "gb1"])
+        self.assertIn(["gb-00000", "학생0", "gb0", "과제1", "채점완료", rows[1][5], "7", "10", ""], rows)
+
+        response = self.client.get(
+            reverse("assignment_grades_export", args=[self.team.id, self.a1.id]) + "?format=xlsx"
+        )
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        self.assertEqual(sheet.count("<row>"), 3)
+        self.assertIn("<c><v>9</v></c>", sheet)
+
+    def test_exports_neutralize_formulas_and_import_round_trips(self):
+        Grade.objects.filter(submission__student=self.s2).update(feedback_text="=HYPERLINK(\"http://x\")")
+        User.objects.filter(pk=self.s2.pk).update(first_name="@SUM(A1)")
+        self.client.force_login(self.owner)
+        url = reverse("assignment_grades_export", args=[self.team.id, self.a1.id])
+
+        exported = b"".join(self.client.get(url).streaming_content).decode("utf-8-sig")
+        row = next(r for r in csv.reader(io.StringIO(exported)) if r[2] == "gb1")
+        self.assertEqual((row[1], row[8]), ("'@SUM(A1)", "'=HYPERLINK(\"http://x\")"))
+        sheet = zipfile.ZipFile(io.BytesIO(b"".join(self.client.get(url + "?format=xlsx").streaming_content)))
+        self.assertIn("'=HYPERLINK", sheet.read("xl/worksheets/sheet1.xml").decode())
+
+        # 내보낸 파일을 그대로 올리면 ' 없이 원래 피드백으로 읽힌다
+        parsed = {r.keys[-1]: r.feedback for r in gradeimport.parse(exported)}
+        self.assertEqual(parsed["gb1"], '=HYPERLINK("http://x")')
+        for value in ("-3", "'-3", "'plain", "plain", "\tx"):
+            with self.subTest(value=value):
+                self.assertEqual(exports.unescape_formula(exports.escape_formula(value)), value)
+        self.assertEqual(exports.escape_formula(-3), -3)
+
+    def test_owner_only(self):
+        url = reverse("team_gradebook", args=[self.team.id])
+        self.client.force_login(self.s1)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.owner)
+        response = self.client.get(url)
+        self.assertContains(response, "과제2")
+        self.assertContains(response, '<td class="px-3 py-1 text-center text-red-600">7</td>', html=False)
+
+
+    # ----- 성적 일괄 입력 -----
+    def test_import_parses_export_file_and_pasted_table(self):
+        # 내보내기 파일 형식(헤더 이름으로 열 찾기, 점수 빈 행 건너뜀)
+        exported = "\ufeff" + ",".join(exports.HEADER) + "\r\ngb-00000,학생0,gb0,과제2,제출됨,,15,20,수고\r\n,,gb1,과제2,,,,20,\r\n"
+        rows = gradeimport.parse(exported)
+        self.assertEqual([(r.line, r.keys, r.score, r.feedback) for r in rows], [(2, ["gb-00000", "gb0"], "15", "수고")])
+        # 엑셀에서 복사한 표(헤더 없음, 탭 구분, 피드백 열 없음)
+        rows = gradeimport.parse("gb1\t18\n\ngb0\t3\n")
+        self.assertEqual([(r.line, r.keys, r.score, r.feedback) for r in rows], [(1, ["gb1"], "18", None), (3, ["gb0"], "3", None)])
+        with self.assertRaises(gradeimport.GradeImportError):
+            gradeimport.parse("이름,점수\n학생0,3\n")
+
+    def test_import_plan_validates_rows(self):
+        text = "학번,점수,피드백\ngb-00000,8,\ngb1,9,\ngb-00002,5,\ngb0,1,\ngb1,11,\nnobody,x,\n"
+        plan = gradeimport.plan(self.a1, self.team, gradeimport.parse(text))
+        self.assertEqual([(c.line, c.kind, c.old_score, c.score) for c in plan.changes],
+                         [(2, gradeimport.UPDATE, 7, 8), (3, gradeimport.SAME, 9, 9)])
+        # 탈퇴 멤버, 중복, 만점 초과, 정수 아님(멤버 아님이 먼저)
+        self.assertEqual([line for line, _ in plan.errors], [4, 5, 6, 7])
+
+    def test_import_previews_then_applies_in_one_go(self):
+        url = reverse("assignment_grades_import", args=[self.team.id, self.a2.id])
+        self.client.force_login(self.s1)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(self.owner)
+        data = "gb0\t15\t좋음\ngb1\t0\t미제출"
+        response = self.client.post(url, {"data": data})
+        self.assertContains(response, "2명 반영")
+        self.assertFalse(Grade.objects.filter(submission__assignment=self.a2).exists())
+
+        response = self.client.post(url, {"data": data, "apply": "1"})
+        self.assertRedirects(response, reverse("assignment_submissions", args=[self.team.id, self.a2.id]))
+        subs = {s.student_id: s for s in Submission.objects.filter(assignment=self.a2).select_related("grade")}
+        self.assertEqual((subs[self.s1.id].status, subs[self.s1.id].grade.score), ("graded", 15))
+        # 제출 기록이 없던 학생은 채점완료 제출 기록이 새로 생긴다
+        self.assertEqual((subs[self.s2.id].status, subs[self.s2.id].grade.feedback_text), ("graded", "미제출"))
+
+        # 오류가 한 줄이라도 있으면 아무것도 바꾸지 않는다
+        response = self.client.post(url, {"data": "gb0\t20\ngb1\t21", "apply": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Grade.objects.get(submission=subs[self.s1.id]).score, 15)
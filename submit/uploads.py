@@ -0,0 +1,103 @@
+import os
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.files import File
+from django.utils import timezone
+
+from .models import UploadSession
+
+# 요청 본문을 읽어 디스크에 쓰는 단위
+READ_BLOCK = 64 * 1024
+
+
+class StagedFile(File):
+    """스테이징에 모인 파일. temporary_file_path()가 있으면 FileSystemStorage가 복사 대신 이동(rename)한다."""
+
+    def __init__(self, path, name):
+        self._path = str(path)
+        super().__init__(open(self._path, "rb"), name=name)
+
+    def temporary_file_path(self):
+        return self._path
+
+
+async def append_chunk(session: UploadSession, offset: int, stream, length: int):
+    """
+    offset 위치부터 stream의 length 바이트를 스테이징 파일에 이어 쓴다(async 뷰에서 await).
+    - 본문 → 스테이징 파일 복사는 스레드 풀에서, 오프셋 갱신(DB)만 sync_to_async → 느린 전송이 동기 스레드를 잡지 않는다.
+    - 이미 받은 구간(offset < received)은 버리고 새 바이트만 쓴다(재전송 청크).
+    - 오프셋/체크섬은 compare-and-swap 으로 갱신 → 같은 청크가 동시에 들어와도 한 번만 반영.
+    반환: 갱신된 received 오프셋
+    """
+    written = await sync_to_async(_write_chunk, thread_sensitive=False)(session, offset, stream, length)
+    if written is None:
+        return await sync_to_async(_restart)(session)
+    return await sync_to_async(_record_chunk)(session, *written)
+
+
+def _restart(session):
+    # 스테이징 파일이 유실됨 → 처음부터 다시 받도록 초기화
+    UploadSession.objects.filter(pk=session.pk).update(received=0, checksum=0)
+    session.received, session.checksum = 0, 0
+    return 0
+
+
+def _write_chunk(session, offset, stream, length):
+    """디스크 쓰기만(DB 없음). 반환: (시작 오프셋, 쓴 끝 오프셋, crc) | None(스테이징 파일 유실)"""
+    path = session.staging_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    start = session.received
+    if start and (not path.exists() or path.stat().st_size < start):
+        return None
+
+    skip = start - offset
+    crc = session.checksum
+    remaining = min(length, session.total_size - offset)
+    # 덮어쓰기 모드: 같은 구간을 두 요청이 써도 내용이 같으므로 안전(뒤쪽 잔여 바이트는 커밋 때 잘라냄)
+    with open(path, "r+b" if path.exists() else "wb") as fh:
+        fh.seek(start)
+        while remaining > 0:
+            block = stream.read(min(READ_BLOCK, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            if skip > 0:
+                if len(block) <= skip:
+                    skip -= len(block)
+                    continue
+                block = block[skip:]
+                skip = 0
+            fh.write(block)
+            crc = zlib.crc32(block, crc)
+        written_to = max(fh.tell(), start)
+    return start, written_to, crc
+
+
+def _record_chunk(session, start, written_to, crc):
+    updated = UploadSession.objects.filter(pk=session.pk, received=start).update(
+        received=written_to, checksum=crc, updated_at=timezone.now(),
+    )
+    if updated:
+        session.received, session.checksum = written_to, crc
+    else:
+        session.refresh_from_db(fields=["received", "checksum"])
+    return session.received
+
+
+def open_staged(session: UploadSession):
+    """완료된 세션의 스테이징 파일을 정확한 크기로 맞춘 뒤 StagedFile 로 연다."""
+    path = session.staging_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as fh:  # 0바이트 파일은 청크 없이 바로 커밋되므로 없으면 만든다
+        fh.truncate(session.total_size)
+    return StagedFile(session.staging_path, name=os.path.basename(session.filename))
+
+
+def discard(session: UploadSession):
+    try:
+        os.remove(session.staging_path)
+    except FileNotFoundError:
+        pass
+    session.delete()
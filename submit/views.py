@@ -4,28 +4,45 @@ from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
+from django.middleware.csrf import CsrfViewMiddleware
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.views import LoginView, LogoutView
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponseForbidden, HttpResponseBadRequest
+from django.contrib.auth.views import LoginView, LogoutView, redirect_to_login
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.http import Http404, HttpResponseForbidden, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.text import get_valid_filename
 from django.utils import timezone
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.core.files.base import ContentFile
-from django.db.models import Q, Count
+from django.db.models.fields.files import FieldFile
+from django.db.models import Q, Count, prefetch_related_objects
 from django.utils.dateparse import parse_datetime
 from django.db import transaction
 from django.db import IntegrityError
 from django.contrib.auth.password_validation import validate_password
-from django.core.exceptions import ValidationError
+from django.core.exceptions import SuspiciousFileOperation, ValidationError
+from django.conf import settings
 import datetime
+import functools
+import os
 import re
 
+from asgiref.sync import sync_to_async
+
+from . import (
+    access, covers, events, exports, fragments, generations, gradebook, gradeimport, ingest, landing, notifications,
+    pagination, uploads,
+)
+from .conditional import assignment_list_page, assignment_page, conditional_page, submissions_page, team_page
+from .fileserve import serve_file
+from .middleware import arrival_time
+from .streaming import is_asgi, streaming_response, zip_stream
 from .models import (
     Team, TeamMembership,
     Assignment, Submission, SubmissionFile,
-    Grade,User,
-    # 과제/제출 뷰 추가 예정이면 사용
-    # Grade, Notification
+    Grade,User, UploadSession, SubmissionReceipt, Notification, StoredBlob,
 )
 
 def root(request):
@@ -50,6 +67,37 @@ def logout_view(request):
     messages.info(request, "로그아웃되었습니다.")
     return redirect("login")
 
+def alogin_required(view):
+    """async 뷰용 login_required(Django 5.0 의 login_required 는 async 뷰를 감싸지 못함)"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        request.user = user  # 뷰 안의 동기 코드(access.resolve 등)가 사용자를 다시 불러오지 않도록
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+_csrf = CsrfViewMiddleware(lambda request: None)
+
+
+def aform_body(view):
+    """
+    multipart 폼을 받는 async 뷰용: 본문 파싱(업로드 파일을 임시 파일로 쓰기)을 스레드 풀에서 한 뒤 CSRF 를 확인한다.
+    CsrfViewMiddleware 는 동기 스레드에서 request.POST 를 읽으므로 뷰는 csrf_exempt 로 두고 여기서 직접 검사한다.
+    @alogin_required 아래에 둔다(로그인하지 않은 요청의 본문은 읽지 않음).
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method == "POST":
+            await sync_to_async(lambda: request.FILES, thread_sensitive=False)()
+        denied = _csrf.process_view(request, None, (), {})
+        if denied is not None:
+            return denied
+        return await view(request, *args, **kwargs)
+    wrapper.csrf_exempt = True
+    return wrapper
+
 # ====== (내장) 회원가입 폼: forms.py 없이 views.py 안에 선언 ======
 class SimpleSignupForm(UserCreationForm):
     email = forms.EmailField(required=False, label="이메일")
@@ -136,15 +184,8 @@ def signup(request):
 # ===== 교수: 내 팀 목록 =====
 @login_required
 def teacher_team_list(request):
-    # 내가 소유한 팀 OR 내가 승인된 멤버인 팀
-    teams = (
-        Team.objects.filter(
-            Q(owner=request.user) |
-            Q(memberships__student=request.user, memberships__status="APPROVED")
-        )
-        .distinct()
-        .order_by("name")
-    )
+    # 내가 소유한 팀 UNION 내가 승인된 멤버인 팀 + 카드 카운터 (사용자별 캐시, 쿼리 최대 1번)
+    teams = landing.team_cards(request.user.id)
     return render(request, "teams/teacher_team_list.html", {"teams": teams})
 
 # ===== 팀 생성 =====
@@ -156,11 +197,14 @@ def create_team(request):
         cover = request.FILES.get("cover")  # ← 추가
 
         if not name:
-            return render(request, "teams/create.html", {"error": "팀명을 입력하세요."})
+            return render(request, "teams/create_team.html", {"error": "팀명을 입력하세요."})
 
         t = Team(owner=request.user, name=name, description=desc)
         if cover:
-            t.cover = cover
+            try:
+                covers.attach(t, cover)  # 원본 + 폭별 변형 저장
+            except covers.InvalidCover as e:
+                return render(request, "teams/create_team.html", {"error": str(e)})
         t.save()
         return redirect("team_detail", team_id=t.id)
     return render(request, "teams/create_team.html")
@@ -169,48 +213,43 @@ def create_team(request):
 # 팀 참가(코드 입력 화면 + 내 요청 목록)
 @login_required
 def join_page(request):
-    my_requests = TeamMembership.objects.filter(student=request.user).select_related("team").order_by("-requested_at")
-    return render(request, "teams/join.html", {"my_requests": my_requests})
+    return render(request, "teams/join.html", _join_context(request))
+
+
+# 내 참가 요청: 요청일시 최신순 키셋 페이지(?status= 필터, ?after= 다음 페이지)
+JOIN_PAGE_SIZE = 30
+
+
+def _join_context(request, **extra):
+    status = request.GET.get("status") or ""
+    my_requests = TeamMembership.objects.filter(student=request.user).select_related("team")
+    if status in dict(TeamMembership.STATUS):
+        my_requests = my_requests.filter(status=status)
+    else:
+        status = ""
+    page = pagination.seek(request, my_requests, "requested_at", JOIN_PAGE_SIZE, descending=True)
+    return {"my_requests": page, "status": status, "statuses": TeamMembership.STATUS, **extra}
+
+
+def _student_prefix(q, path="student__"):
+    """학번/이름/아이디 앞부분 일치"""
+    return (
+        Q(**{f"{path}studentprofile__student_id__startswith": q})
+        | Q(**{f"{path}first_name__startswith": q})
+        | Q(**{f"{path}username__startswith": q})
+    )
 
 # ===== 교수: 팀 코드 재발급 =====
 @login_required
 def regen_team_code(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    if request.user != team.owner:
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
     team.regen_join_code()
     messages.success(request, f"새 팀코드: {team.join_code}")
     return redirect('team_detail', team_id=team.id)
 
 
-# ===== 공통: 팀 상세 =====
-@login_required
-def team_detail(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    is_owner = (team.owner_id == request.user.id)
-    is_member = TeamMembership.objects.filter(
-        team=team, student=request.user, status="APPROVED"
-    ).exists()
-
-    if not (is_owner or is_member):
-        return HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
-
-    assigns = Assignment.objects.filter(team=team).order_by('-due_at')
-    my_submissions = {}
-    if not is_owner:
-        my_submissions = {
-            s.assignment_id: s
-            for s in Submission.objects.filter(assignment__team=team, student=request.user)
-        }
-
-    return render(request, "teams/team_detail.html", {
-        "team": team,
-        "assignments": assigns,
-        "my_submissions": my_submissions,
-        "is_owner": is_owner,
-    })
-
-
 # 팀 코드로 참가 요청(POST)
 @login_required
 @require_POST
@@ -219,9 +258,7 @@ def request_join_by_code(request):
 
     # 공통: 내 요청 목록(재렌더용)
     def _render_join(error=None, info=None):
-        my_requests = TeamMembership.objects.filter(student=request.user)\
-                         .select_related("team").order_by("-requested_at")
-        ctx = {"my_requests": my_requests, "error": error, "info": info, "join_code": join_code}
+        ctx = _join_context(request, error=error, info=info, join_code=join_code)
         return render(request, "teams/join.html", ctx)
 
     # 1) 빈 값
@@ -262,27 +299,37 @@ def request_join_by_code(request):
             mship.decided_by = None
             mship.joined_at = None
             mship.save(update_fields=["status", "requested_at", "decided_at", "decided_by", "joined_at"])
+            notifications.join_requested(mship, team, request.user)
             return _render_join(info=f"'{team.name}' 팀에 재요청을 보냈습니다.")
 
     # 새 요청 생성됨
+    notifications.join_requested(mship, team, request.user)
     return _render_join(info=f"'{team.name}' 팀에 참가 요청을 보냈습니다.")
 
 # ===== 팀장 가입요청 목록 =====
+REQUESTS_PAGE_SIZE = 50
+
+
 @login_required
 def team_requests(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    if request.user != team.owner:
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
-    pending = TeamMembership.objects.filter(team=team, status="PENDING").select_related("student").order_by("requested_at")
-    recent  = TeamMembership.objects.filter(team=team).exclude(status="PENDING").select_related("student").order_by("-requested_at")[:50]
-    return render(request, "teams/requests.html", {"team": team, "pending": pending, "recent": recent})
+    q = (request.GET.get("q") or "").strip()
+    memberships = TeamMembership.objects.filter(team=team).select_related("student")
+    if q:
+        memberships = memberships.filter(_student_prefix(q))
+    # 대기 중은 오래된 요청부터 키셋 페이지로(몇 명이 밀려 있어도 한 페이지씩)
+    pending = pagination.seek(request, memberships.filter(status="PENDING"), "requested_at", REQUESTS_PAGE_SIZE)
+    recent  = memberships.exclude(status="PENDING").order_by("-requested_at")[:50]
+    return render(request, "teams/requests.html", {"team": team, "pending": pending, "recent": recent, "q": q})
 
 @login_required
 @require_POST
 def approve_team_request(request, membership_id):
-    m = get_object_or_404(TeamMembership, pk=membership_id)
+    m = get_object_or_404(TeamMembership.objects.select_related("team"), pk=membership_id)
     team = m.team
-    if request.user != team.owner:
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
     try:
         m.approve(by_user=request.user)   # models.py의 approve()가 joined_at도 찍도록 구성
@@ -293,14 +340,15 @@ def approve_team_request(request, membership_id):
         m.decided_by = request.user
         m.joined_at  = now
         m.save(update_fields=["status","decided_at","decided_by","joined_at"])
+    notifications.join_decided(m, team)
     return redirect("team_requests", team_id=team.id)
 
 @login_required
 @require_POST
 def reject_team_request(request, membership_id):
-    m = get_object_or_404(TeamMembership, pk=membership_id)
+    m = get_object_or_404(TeamMembership.objects.select_related("team"), pk=membership_id)
     team = m.team
-    if request.user != team.owner:
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
     try:
         m.reject(by_user=request.user)
@@ -309,13 +357,14 @@ def reject_team_request(request, membership_id):
         m.decided_at = timezone.now()
         m.decided_by = request.user
         m.save(update_fields=["status","decided_at","decided_by"])
+    notifications.join_decided(m, team)
     return redirect("team_requests", team_id=team.id)
 
 # ===== 학생: 승인 후 최종 참가 =====
 @login_required
 def join_team(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    membership = get_object_or_404(TeamMembership, team=team, student=request.user)
+    membership = get_object_or_404(TeamMembership.objects.select_related("team"), team_id=team_id, student=request.user)
+    team = membership.team
     if membership.status != "APPROVED":
         return HttpResponseForbidden("승인된 요청만 참가할 수 있습니다.")
     if membership.joined_at:
@@ -325,33 +374,30 @@ def join_team(request, team_id):
     messages.success(request, f"'{team.name}' 팀에 참가 완료!")
     return redirect('team_detail', team_id=team.id)
 
-def _is_team_member(user, team: Team):
-    if user == team.owner:
-        return True
-    return TeamMembership.objects.filter(
-        team=team, student=user, status="APPROVED", joined_at__isnull=False
-    ).exists()
-
+# ===== 공통: 팀 상세 =====
 @login_required
+@conditional_page(team_page)
 def team_detail(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
+    acc = access.resolve(request, team_id)
+    team = acc.team
 
     # ✅ 팀장 여부
-    is_owner = (team.owner_id == request.user.id)
+    is_owner = acc.is_owner
 
-    # ✅ 승인 + 참가완료 멤버 여부
-    is_member = TeamMembership.objects.filter(
-        team=team,
-        student=request.user,
-        status="APPROVED"
-    ).exists()
-
-    # ✅ 팀장 또는 멤버만 접근 허용
-    if not (is_owner or is_member):
+    # ✅ 팀장 또는 승인된 멤버만 접근 허용
+    if not acc.can_view:
         return HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
 
-    # 이하 기존 로직 유지
-    assigns = Assignment.objects.filter(team=team).order_by('-due_at')
+    # 과제 목록은 역할별로 한 번 그린 행 조각(블록별)을 캐시에서 쓰고(팀장은 제출/채점 수 포함),
+    # 내 제출 상태만 요청마다 읽어서 team_detail.html 이 조각 사이에 그린다
+    role = "owner" if is_owner else "member"
+    shared = fragments.get_or_render(
+        f"team_assignments:{role}", fragments.team_version(team, grades=is_owner),
+        lambda: fragments.render_rows(
+            "teams/_assignment_rows.html", {"team": team, "is_owner": is_owner},
+            _team_assignments(team, is_owner), name="a",
+        ),
+    )
     my_submissions = {}
     if not is_owner:
         my_submissions = {
@@ -361,16 +407,25 @@ def team_detail(request, team_id):
 
     ctx = {
         "team": team,
-        "assignments": assigns,
-        "my_submissions": my_submissions,
+        "rows": [(a_id, row, my_submissions.get(a_id)) for a_id, row in shared],
         "is_owner": is_owner,
     }
     return render(request, 'teams/team_detail.html', ctx)
 
+
+def _team_assignments(team, with_counts):
+    assigns = Assignment.objects.filter(team=team).order_by('-due_at')
+    if with_counts:
+        assigns = assigns.annotate(
+            submitted_count=Count("submission", filter=Q(submission__status__in=("submitted", "late", "graded"))),
+            graded_count=Count("submission", filter=Q(submission__status="graded")),
+        )
+    return assigns
+
 @login_required
 def team_edit(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    if request.user != team.owner:
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
 
     if request.method == "POST":
@@ -381,20 +436,28 @@ def team_edit(request, team_id):
         if not name:
             return render(request, "teams/edit.html", {"team": team, "error": "팀명을 입력하세요."})
 
+        try:
+            stale = covers.attach(team, cover) if cover else []
+        except covers.InvalidCover as e:
+            return render(request, "teams/edit.html", {
+                "team": team, "error": str(e),
+                "cover_image": covers.picture(team.id, team.cover.name, team.cover_variants),
+            })
         team.name = name
         team.description = desc
-        if cover:
-            team.cover = cover
         team.save()
+        covers.discard_on_commit(team.cover.storage, stale)  # 이전 변형 정리
         return redirect("team_detail", team_id=team.id)
 
-    return render(request, "teams/edit.html", {"team": team})
+    return render(request, "teams/edit.html", {
+        "team": team, "cover_image": covers.picture(team.id, team.cover.name, team.cover_variants),
+    })
 
 
 @login_required
 def team_delete(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    if request.user != team.owner:
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("팀장만 삭제할 수 있습니다.")
 
     if request.method == "POST":
@@ -414,8 +477,8 @@ def team_delete(request, team_id):
 
 @login_required
 def assignment_create(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
-    if request.user != team.owner:
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
         return HttpResponseForbidden("권한이 없습니다.")
 
     if request.method == "POST":
@@ -458,6 +521,7 @@ def assignment_create(request, team_id):
             max_score=max_score,
             created_by=request.user,  # 필드가 있으면 세팅, 없으면 제거
         )
+        notifications.assignment_created(a)
         return redirect("assignment_detail", team_id=team.id, assignment_id=a.id)
 
     # GET: 기본값(일주일 뒤 23:59 등)
@@ -469,16 +533,13 @@ def assignment_create(request, team_id):
 
 
 @login_required
+@conditional_page(assignment_page)
 def assignment_detail(request, team_id, assignment_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
 
-    is_owner = (request.user.id == team.owner_id)
-    is_member = TeamMembership.objects.filter(
-        team=team, student=request.user, status="APPROVED", joined_at__isnull=False
-    ).exists() if not is_owner else False
-
-    if not (is_owner or is_member):
+    is_owner = acc.is_owner
+    if not (is_owner or acc.is_joined):
         return HttpResponseForbidden("권한이 없습니다.")
 
     my_sub = None
@@ -495,21 +556,73 @@ def assignment_detail(request, team_id, assignment_id):
             if hasattr(my_sub, "grade"):
                 my_grade = my_sub.grade
 
+    header = fragments.get_or_render(
+        f"assignment_header:{'owner' if is_owner else 'member'}", fragments.assignment_version(team, a),
+        lambda: fragments.render("assignments/_header.html", {"team": team, "a": a, "is_owner": is_owner}),
+    )
     ctx = {
         "team": team, "a": a, "my_sub": my_sub, "my_grade": my_grade,
-        "is_owner": is_owner, "can_edit": can_edit,
+        "is_owner": is_owner, "can_edit": can_edit, "header": header,
     }
     return render(request, 'assignments/detail.html', ctx)
 
-@login_required
-def assignment_submit(request, team_id, assignment_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
+def _store_submission_files(files):
+    """
+    제출 파일을 내용 주소 저장소에 쓴다(해시·복사 — DB 없음, 트랜잭션 밖 → async 뷰는 스레드 풀에서). 원본은 남는다.
+    files: [(File, 원본 파일명, size), ...] → [(저장 이름, digest, 원본 파일명, size, File), ...]
+    """
+    field = SubmissionFile._meta.get_field("file")
+    stored = []
+    for fobj, name, size in files:
+        saved = field.storage.save(field.generate_filename(None, name), fobj)
+        stored.append((saved, field.storage.digest_of(saved), os.path.basename(name), size, fobj))
+    return stored
+
+
+def _replace_submission_files(sub, comment, stored, team_id, submitted_at):
+    """제출 파일 교체: 기존 파일 삭제 → 저장해 둔 파일(_store_submission_files) 등록 → 상태/시간 갱신"""
+    storage = SubmissionFile._meta.get_field("file").storage
+    try:
+        with transaction.atomic():
+            sub.comment = comment
+
+            # ✅ 기존 파일 전부 삭제 (레코드 일괄 삭제 + blob 참조 반납)
+            sub.files.all().delete()
+
+            # 새 파일 등록
+            for idx, (name, digest, original_name, size, fobj) in enumerate(stored, start=1):
+                SubmissionFile.objects.create(
+                    submission=sub,
+                    file=name,
+                    version=idx,
+                    size=size,
+                    sha256=digest,
+                    original_name=original_name,
+                )
+                # 저장(쓰기 생략)과 참조 사이에 마지막 참조가 놓여 blob 이 지워졌을 수 있다 → 참조를 잡은 뒤 다시 확인
+                storage.ensure(name, fobj)
+
+            # 상태/시간 갱신
+            sub.status = "submitted"
+            sub.submitted_at = submitted_at  # 요청 도착 시각(저장에 걸린 시간 때문에 지각 처리되지 않도록)
+            sub.save(update_fields=["comment", "status", "submitted_at"])
+    except Exception:
+        # 먼저 써 둔 blob 중 아무도 참조하지 않는 것은 지운다
+        StoredBlob.drop_unreferenced({digest: name for name, digest, *_ in stored}, storage)
+        raise
+    # 팀장 화면의 제출 수
+    generations.bump_grades(team_id)
+
+@alogin_required
+@aform_body
+async def assignment_submit(request, team_id, assignment_id):
+    # 본문 파싱, 파일 해시·복사, 스풀 쓰기는 스레드 풀에서. 동기 스레드(sync_to_async)에는 짧은 ORM 작업만 간다.
+    # 아주 큰 파일은 이어받기(청크) 업로드 API 를 쓴다(ASGI 가 본문 전체를 받은 뒤에야 뷰가 불린다).
+    acc = await sync_to_async(access.resolve)(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
 
     # 팀 접근 권한 체크(팀장 또는 승인된 멤버)
-    is_owner = (team.owner_id == request.user.id)
-    is_member = TeamMembership.objects.filter(team=team, student=request.user, status="APPROVED").exists()
-    if not (is_owner or is_member):
+    if not acc.can_view:
         return HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
 
     # # 팀장은 제출하지 않도록 막고 싶다면(선택)
@@ -520,57 +633,466 @@ def assignment_submit(request, team_id, assignment_id):
     if getattr(a, "is_closed", False):
         return HttpResponseForbidden("마감된 과제입니다.")
 
+    # 접수 큐: 파일을 스풀에 두고 접수증으로 바로 이동(반영은 ingest_worker)
+    if request.method == "POST" and ingest.enabled():
+        uploaded_files = request.FILES.getlist("files")
+        receipt_id = await sync_to_async(ingest.enqueue, thread_sensitive=False)(
+            a, request.user,
+            comment=(request.POST.get("comment") or "").strip(),
+            files=[(uf, uf.name, uf.size or 0) for uf in uploaded_files],
+            accepted_at=arrival_time(request),
+        )
+        return redirect("submission_receipt", receipt_id=receipt_id)
+
+    if request.method == "POST":
+        uploaded_files = request.FILES.getlist("files")
+        stored = await sync_to_async(_store_submission_files, thread_sensitive=False)(
+            [(uf, uf.name, uf.size or 0) for uf in uploaded_files]
+        )
+
     # 내 제출 가져오기(없으면 생성)
-    sub, _ = Submission.objects.get_or_create(
+    sub, _ = await Submission.objects.aget_or_create(
         assignment=a, student=request.user,
         defaults={"status": "not_submitted"}
     )
 
     if request.method == "POST":
-        # 코멘트
-        sub.comment = (request.POST.get("comment") or "").strip()
-
-        # ✅ 기존 파일 전부 삭제 (레코드+실제 파일)
-        for f in list(sub.files.all()):
-            f.delete()
-
-        # 새 파일 저장
-        uploaded_files = request.FILES.getlist("files")
-        for idx, uf in enumerate(uploaded_files, start=1):
-            SubmissionFile.objects.create(
-                submission=sub,
-                file=uf,
-                version=idx,
-                size=uf.size or 0,
-            )
-
-        # 상태/시간 갱신
-        sub.status = "submitted"
-        sub.submitted_at = timezone.now()
-        sub.save(update_fields=["comment", "status", "submitted_at"])
-
+        await sync_to_async(_replace_submission_files)(
+            sub,
+            comment=(request.POST.get("comment") or "").strip(),
+            stored=stored,
+            team_id=team.id,
+            submitted_at=arrival_time(request),
+        )
         return redirect("assignment_detail", team_id=team.id, assignment_id=a.id)
 
     # GET: 제출 폼
-    return render(request, "assignments/submit.html", {
+    return await sync_to_async(render)(request, "assignments/submit.html", {
         "team": team,
         "a": a,
         "my_sub": sub,
     })
 
+# ===== 이어받기(청크) 업로드 API =====
+# 1) POST uploads                → 세션 생성(같은 파일의 미완료 세션이 있으면 그대로 반환)
+# 2) GET  uploads/<id>           → 현재 오프셋 조회(재접속 후 이어받기 지점)
+#    PUT  uploads/<id>           → Upload-Offset 헤더 위치부터 본문 바이트를 이어붙임
+# 3) POST uploads/commit         → 완료된 세션들을 SubmissionFile 로 확정
+def _upload_target(request, team_id, assignment_id):
+    """청크 업로드 공통 권한 체크. (과제, 에러응답) 반환"""
+    acc = access.resolve(request, team_id, assignment_id)
+    a = acc.assignment
+    if not acc.can_view:
+        return a, HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
+    if a.is_closed:
+        return a, HttpResponseForbidden("마감된 과제입니다.")
+    return a, None
+
+
+def _upload_state(session):
+    return {
+        "id": str(session.id),
+        "filename": session.filename,
+        "size": session.total_size,
+        "offset": session.received,
+        "crc32": f"{session.checksum:08x}",
+        "complete": session.is_complete,
+    }
+
+
+@login_required
+@require_POST
+def upload_create(request, team_id, assignment_id):
+    a, denied = _upload_target(request, team_id, assignment_id)
+    if denied:
+        return denied
+
+    filename = (request.POST.get("filename") or "").strip()
+    try:
+        size = int(request.POST.get("size") or "")
+    except ValueError:
+        return HttpResponseBadRequest("size 값이 올바르지 않습니다.")
+    if not filename or size < 0:
+        return HttpResponseBadRequest("filename/size 는 필수입니다.")
+
+    # 재접속 후 세션 ID를 잃어버린 경우에도 같은 파일이면 기존 세션에서 이어받기
+    session = UploadSession.objects.filter(
+        assignment=a, student=request.user, filename=filename, total_size=size,
+    ).order_by("-updated_at").first()
+    created = session is None
+    if created:
+        session = UploadSession.objects.create(
+            assignment=a, student=request.user, filename=filename, total_size=size,
+        )
+    data = _upload_state(session)
+    data["chunk_size"] = settings.UPLOAD_CHUNK_SIZE
+    return JsonResponse(data, status=201 if created else 200)
+
+
+@alogin_required
+async def upload_session(request, team_id, assignment_id, upload_id):
+    # 청크 본문은 길고 느리게 들어오므로 async: DB 는 짧은 조회/갱신만 sync_to_async
+    a, denied = await sync_to_async(_upload_target)(request, team_id, assignment_id)
+    if denied:
+        return denied
+    session = await aget_object_or_404(UploadSession, pk=upload_id, assignment=a, student=request.user)
+
+    if request.method in ("GET", "HEAD"):
+        return JsonResponse(_upload_state(session))
+    if request.method not in ("PUT", "PATCH"):
+        return HttpResponseBadRequest("GET/PUT 만 지원합니다.")
+
+    try:
+        offset = int(request.headers.get("Upload-Offset", ""))
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return HttpResponseBadRequest("Upload-Offset 헤더가 필요합니다.")
+    if length > settings.UPLOAD_CHUNK_MAX_BYTES:
+        return HttpResponseBadRequest("청크가 너무 큽니다.")
+    if offset < 0 or offset > session.total_size:
+        return HttpResponseBadRequest("오프셋이 파일 크기를 벗어났습니다.")
+    if offset > session.received:
+        # 중간 구간이 비어 있음 → 서버가 가진 지점부터 다시 보내도록 안내
+        return JsonResponse(_upload_state(session), status=409)
+
+    await uploads.append_chunk(session, offset, request, length)
+    return JsonResponse(_upload_state(session))
+
+
+@login_required
+@require_POST
+def upload_commit(request, team_id, assignment_id):
+    a, denied = _upload_target(request, team_id, assignment_id)
+    if denied:
+        return denied
+
+    ids = request.POST.getlist("upload_id")
+    sessions = {str(s.id): s for s in UploadSession.objects.filter(pk__in=ids, assignment=a, student=request.user)}
+    ordered = [sessions.get(i) for i in ids]
+    if not ids or None in ordered:
+        return HttpResponseBadRequest("알 수 없는 업로드 세션입니다.")
+    incomplete = [_upload_state(s) for s in ordered if not s.is_complete]
+    if incomplete:
+        return JsonResponse({"error": "아직 전송이 끝나지 않은 파일이 있습니다.", "uploads": incomplete}, status=409)
+
+    comment = (request.POST.get("comment") or "").strip()
+    if ingest.enabled():
+        staged = [uploads.open_staged(s) for s in ordered]
+        try:
+            receipt_id = ingest.enqueue(
+                a, request.user, comment=comment,
+                files=[(f, s.filename, s.total_size) for f, s in zip(staged, ordered)],
+                accepted_at=arrival_time(request),
+            )
+        finally:
+            for f in staged:
+                f.close()
+        # 스테이징 파일은 스풀로 옮겨졌으므로 세션 행만 지운다
+        UploadSession.objects.filter(pk__in=ids).delete()
+        receipt_url = reverse("submission_receipt", kwargs={"receipt_id": receipt_id})
+        return JsonResponse({"receipt": str(receipt_id), "status": "queued", "poll": receipt_url,
+                             "redirect": receipt_url}, status=202)
+
+    sub, _ = Submission.objects.get_or_create(
+        assignment=a, student=request.user,
+        defaults={"status": "not_submitted"}
+    )
+    staged = [uploads.open_staged(s) for s in ordered]
+    try:
+        _replace_submission_files(
+            sub,
+            comment=comment,
+            stored=_store_submission_files([(f, s.filename, s.total_size) for f, s in zip(staged, ordered)]),
+            team_id=a.team_id,
+            submitted_at=arrival_time(request),
+        )
+    finally:
+        for f in staged:
+            f.close()
+    for s in ordered:
+        uploads.discard(s)
+
+    return JsonResponse({
+        "submission": sub.id,
+        "files": sub.files.count(),
+        "redirect": reverse("assignment_detail", kwargs={"team_id": a.team_id, "assignment_id": a.id}),
+    })
+
+@login_required
+def submission_receipt(request, receipt_id):
+    """
+    제출 접수증. 반영 전에는 스풀의 접수 기록(queued), 반영 후에는 SubmissionReceipt 를 보여 준다.
+    (스풀은 커밋 뒤에 지우므로 스풀 → DB 순서로 보면 사이에 놓치는 일이 없다)
+    Accept: application/json 이면 JSON 으로 응답한다(업로드 스크립트/폴링용).
+    """
+    queued = ingest.lookup(receipt_id)
+    if queued:
+        student_id, status, accepted_at = queued["student"], "queued", queued["accepted_at"]
+        a = get_object_or_404(Assignment.objects.select_related("team"), pk=queued["assignment"])
+        file_count, error = len(queued["files"]), ""
+    else:
+        receipt = get_object_or_404(SubmissionReceipt.objects.select_related("assignment__team"), pk=receipt_id)
+        student_id, status, accepted_at = receipt.student_id, receipt.status, receipt.accepted_at
+        a, file_count, error = receipt.assignment, receipt.file_count, receipt.error
+    if student_id != request.user.id:
+        return HttpResponseForbidden("본인의 접수증만 볼 수 있습니다.")
+
+    late = accepted_at > a.due_at
+    if "application/json" in request.headers.get("Accept", ""):
+        return JsonResponse({
+            "receipt": str(receipt_id), "status": status, "accepted_at": accepted_at.isoformat(),
+            "late": late, "files": file_count, "error": error,
+        })
+    return render(request, "assignments/receipt.html", {
+        "team": a.team, "a": a, "receipt_id": receipt_id, "status": status,
+        "status_label": dict(SubmissionReceipt.STATUS).get(status, "접수됨(반영 대기)"),
+        "accepted_at": accepted_at, "late": late, "file_count": file_count, "error": error,
+    })
+
+SUBMISSIONS_PAGE_SIZE = 50
+
+
 @login_required
+@conditional_page(submissions_page)
 def assignment_submissions(request, team_id, assignment_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
-    if request.user != team.owner:
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
         return HttpResponseForbidden("팀장만 확인할 수 있습니다.")
     subs = (
-    Submission.objects
-    .filter(assignment=a)
-    .select_related("student", "student__studentprofile")  # ← 이름/학번 접근 빠르게
-    .prefetch_related("files")                             # ← 파일 목록
-)
-    return render(request, 'assignments/submissions.html', {"team": team, "a": a, "subs": subs})
+        Submission.objects
+        .filter(assignment=a)
+        .select_related("student", "student__studentprofile", "grade")  # ← 이름/학번/점수 접근 빠르게
+    )
+    # 필터: 상태, 채점 여부, 지각(마감 후 제출), 학번/이름 앞부분
+    filters = {key: (request.GET.get(key) or "").strip() for key in ("status", "graded", "late", "q")}
+    if filters["status"] in dict(Submission.STATUS):
+        subs = subs.filter(status=filters["status"])
+    else:
+        filters["status"] = ""
+    if filters["graded"] in ("yes", "no"):
+        subs = subs.filter(grade__isnull=filters["graded"] == "no")
+    if filters["late"] and a.due_at:
+        subs = subs.filter(submitted_at__gt=a.due_at)
+    if filters["q"]:
+        subs = subs.filter(_student_prefix(filters["q"]))
+    # 최근 제출부터 키셋 페이지(제출일시가 없는 기록은 맨 뒤)
+    page = pagination.seek(request, subs, "submitted_at", SUBMISSIONS_PAGE_SIZE, descending=True, nullable=True)
+    prefetch_related_objects(page.items, "files")  # ← 이 페이지의 파일 목록만
+    # 실시간 카운터 초깃값(assignment_events 와 같은 기준, 필터와 무관한 과제 전체)
+    counts = events.submission_counts(a.id)
+    return render(request, 'assignments/submissions.html', {
+        "team": team, "a": a, "subs": page, "counts": counts, "filters": filters, "statuses": Submission.STATUS,
+    })
+
+@functools.lru_cache(maxsize=1024)
+def _gradebook_td(late, text):
+    """성적표 칸 하나(값은 format_html 로 escape). 칸 내용은 점수/상태 문구 몇 가지뿐이라 캐시가 거의 다 맞는다"""
+    return format_html('<td class="px-3 py-1 text-center{}">{}</td>', " text-red-600" if late else "", text)
+
+
+def _gradebook_rows(book):
+    # 400×30 칸을 템플릿 for/if 로 그리면 수백 ms, 칸마다 format_html 도 100 ms 넘게 걸린다
+    # → escape 된 칸 조각을 캐시해 두고 행마다 이어 붙인다(조각이 모두 안전하므로 합친 것도 안전)
+    for student_id, label, cells, total, submitted, late in book.rows():
+        cells_html = mark_safe("".join([_gradebook_td(c[1], c[3]) for c in cells]))
+        yield label, cells_html, total, submitted, late
+
+
+@login_required
+def team_gradebook(request, team_id):
+    """팀 성적표: 학생 × 과제 (상태/점수/지연) + 행·열 합계"""
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
+        return HttpResponseForbidden("팀장만 확인할 수 있습니다.")
+    book = gradebook.build(team)
+    return render(request, "teams/gradebook.html", {
+        "team": team,
+        "columns": list(book.columns()),
+        "rows": _gradebook_rows(book),
+        "max_total": book.max_total,
+        "student_count": len(book.students),
+    })
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _grades_export(request, team, submissions, title):
+    """?format=csv(기본)|xlsx — 승인된 멤버의 제출/성적을 스트리밍으로 내려준다"""
+    submissions = submissions.filter(
+        student__team_memberships__team=team, student__team_memberships__status="APPROVED"
+    )
+    rows = exports.grade_rows(submissions)
+    if request.GET.get("format") == "xlsx":
+        response = streaming_response(request, exports.xlsx_stream(rows, sheet_name=title), content_type=XLSX_CONTENT_TYPE)
+        ext = "xlsx"
+    else:
+        response = streaming_response(request, exports.csv_stream(rows), content_type="text/csv; charset=utf-8")
+        ext = "csv"
+    stamp = timezone.localtime().strftime("%Y%m%d")
+    response["Content-Disposition"] = content_disposition_header(
+        True, f"{_safe_filename(title, f'team{team.pk}')}_성적_{stamp}.{ext}"
+    )
+    return response
+
+
+@login_required
+def team_grades_export(request, team_id):
+    team = access.resolve(request, team_id).team
+    if request.user.id != team.owner_id:
+        return HttpResponseForbidden("팀장만 내려받을 수 있습니다.")
+    return _grades_export(request, team, Submission.objects.filter(assignment__team=team), team.name)
+
+
+@login_required
+def assignment_grades_export(request, team_id, assignment_id):
+    acc = access.resolve(request, team_id, assignment_id)
+    if not acc.is_owner:
+        return HttpResponseForbidden("팀장만 내려받을 수 있습니다.")
+    a = acc.assignment
+    return _grades_export(request, acc.team, Submission.objects.filter(assignment=a), f"{acc.team.name}_{a.title}")
+
+
+@login_required
+def assignment_grades_import(request, team_id, assignment_id):
+    """
+    성적 일괄 입력. POST(미리보기) → 변경 내역 표시, POST + apply → 한 트랜잭션으로 반영.
+    오류가 한 줄이라도 있으면 반영하지 않는다.
+    """
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
+        return HttpResponseForbidden("팀장만 성적을 입력할 수 있습니다.")
+
+    ctx = {"team": team, "a": a, "data": ""}
+    if request.method == "POST":
+        try:
+            upload = request.FILES.get("file")
+            text = gradeimport.decode(upload) if upload else request.POST.get("data", "")
+            rows = gradeimport.parse(text)
+        except gradeimport.GradeImportError as e:
+            ctx["error"] = str(e)
+            ctx["data"] = request.POST.get("data", "")
+            return render(request, "assignments/grade_import.html", ctx, status=400)
+
+        if request.POST.get("apply"):
+            with transaction.atomic():
+                plan = gradeimport.plan(a, team, rows)
+                if not plan.errors:
+                    applied = gradeimport.apply(plan, a, request.user)
+            if not plan.errors:
+                messages.success(request, f"{applied}명의 성적을 반영했습니다.")
+                return redirect("assignment_submissions", team_id=team.id, assignment_id=a.id)
+        else:
+            plan = gradeimport.plan(a, team, rows)
+        ctx.update(plan=plan, data=text)
+
+    return render(request, "assignments/grade_import.html", ctx)
+
+def _student_label(user):
+    """학번_이름 (학번이 없으면 아이디_이름) — 다운로드 폴더명 등에 사용. 이름이 같아도 겹치지 않게 항상 고유값을 붙인다"""
+    sp = getattr(user, "studentprofile", None)
+    name = user.first_name or user.get_full_name()
+    key = sp.student_id if sp else user.username
+    return f"{key}_{name}" if name else key
+
+
+def _safe_filename(*candidates):
+    """
+    파일/폴더 이름으로 쓸 수 있는 첫 후보를 돌려준다.
+    get_valid_filename 은 "!!!"/".." 처럼 남는 글자가 없으면 SuspiciousFileOperation 을 던지는데,
+    스트리밍 응답은 200 을 보낸 뒤라 오류 페이지로 바꿀 수 없다 → 마지막 후보는 항상 안전한 값(pk 등)으로 넘긴다.
+    """
+    for value in candidates:
+        try:
+            return get_valid_filename(value)
+        except SuspiciousFileOperation:
+            continue
+    raise SuspiciousFileOperation(f"사용할 수 있는 파일 이름이 없습니다: {candidates!r}")
+
+
+@login_required
+def assignment_submissions_zip(request, team_id, assignment_id):
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
+        return HttpResponseForbidden("팀장만 다운로드할 수 있습니다.")
+
+    files = (
+        SubmissionFile.objects
+        .filter(submission__assignment=a)
+        .select_related("submission__student", "submission__student__studentprofile")
+        .order_by("submission__student__username", "version")
+    )
+
+    def _opener(f):
+        def _open():
+            try:
+                return f.file.open("rb")
+            except FileNotFoundError:
+                return None
+        return _open
+
+    def _entries():
+        # 파일 단위로 조금씩 읽어 내보내므로 수강생 수/파일 크기와 무관하게 메모리 일정
+        for f in files.iterator(chunk_size=200):
+            sub = f.submission
+            student = sub.student
+            folder = _safe_filename(_student_label(student), student.username, f"user{student.pk}")
+            name = _safe_filename(f"v{f.version}_{f.display_name}", f"v{f.version}_{f.pk}")
+            stamp = timezone.localtime(sub.submitted_at or timezone.now())
+            yield f"{folder}/{name}", _opener(f), stamp.timetuple()[:6]
+
+    response = streaming_response(request, zip_stream(_entries()), content_type="application/zip")
+    response["Content-Disposition"] = content_disposition_header(
+        True, f"{_safe_filename(a.title, f'assignment{a.pk}')}_제출물.zip"
+    )
+    return response
+
+# ===== 보호된 파일 다운로드(권한 확인 후 전송) =====
+COVER_VARIANT_MAX_AGE = 30 * 24 * 3600
+
+# async 뷰: 권한 확인(DB)만 sync_to_async, 전송은 ASGI 에서 async iterator(fileserve) → 느린 다운로드가 스레드를 잡지 않는다
+def _download_target(request, file_id):
+    f = get_object_or_404(
+        SubmissionFile.objects.select_related("submission__assignment__team"), pk=file_id
+    )
+    sub = f.submission
+    team = sub.assignment.team
+    # 팀장 또는 (승인된 멤버인) 제출 본인만
+    acc = access.of_team(request, team)
+    is_self = (sub.student_id == request.user.id) and acc.is_member
+    return f if (acc.is_owner or is_self) else None
+
+
+@alogin_required
+async def submission_file_download(request, file_id):
+    f = await sync_to_async(_download_target)(request, file_id)
+    if f is None:
+        return HttpResponseForbidden("권한이 없습니다.")
+    return serve_file(request, f.file, filename=f.display_name)
+
+
+@alogin_required
+async def team_cover(request, team_id, variant=None):
+    acc = await sync_to_async(access.resolve)(request, team_id)
+    team = acc.team
+    if not acc.can_view:
+        return HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
+    if not team.cover:
+        raise Http404("대표 이미지가 없습니다.")
+    if variant is None:
+        # Content-Type 은 이미지로 고정(nosniff 는 SecurityMiddleware). 검사 이전에 올라온 이미지 아닌 파일은 화면에 띄우지 않는다
+        ctype = covers.content_type(team.cover.name)
+        if ctype is None:
+            return serve_file(request, team.cover, content_type="application/octet-stream")
+        return serve_file(request, team.cover, as_attachment=False, max_age=3600, content_type=ctype)
+    # 변형: 업로드마다 이름이 바뀌므로 오래 캐시
+    item = covers.find(team, variant)
+    if item is None:
+        raise Http404("대표 이미지가 없습니다.")
+    return serve_file(request, FieldFile(team, team.cover.field, item["name"]), as_attachment=False,
+                      max_age=COVER_VARIANT_MAX_AGE)
 
 class GradeForm(forms.Form):
     score = forms.IntegerField(min_value=0, label="점수")
@@ -578,9 +1100,9 @@ class GradeForm(forms.Form):
 
 @login_required
 def grade_submission(request, team_id, assignment_id, submission_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
-    if request.user != team.owner:
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
         return HttpResponseForbidden("팀장만 채점할 수 있습니다.")
 
     sub = get_object_or_404(Submission, pk=submission_id, assignment=a)
@@ -604,6 +1126,8 @@ def grade_submission(request, team_id, assignment_id, submission_id):
             )
             sub.status = "graded"
             sub.save(update_fields=["status"])
+            generations.bump_grades(team.id)
+            notifications.graded(a, [(sub.student_id, score)])
             # messages.success(request, "채점 저장되었습니다.")
             return redirect("assignment_submissions", team_id=team.id, assignment_id=a.id)
     else:
@@ -613,28 +1137,96 @@ def grade_submission(request, team_id, assignment_id, submission_id):
 
 @login_required
 def assignment_close(request, team_id, assignment_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
-    if request.user != team.owner:
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
         return HttpResponseForbidden("권한이 없습니다.")
     a.is_closed = True
-    a.save(update_fields=["is_closed"])
+    a.save(update_fields=["is_closed", "updated_at"])  # updated_at: 조각 캐시 버전
     messages.info(request, "과제를 마감했습니다.")
     return redirect("assignment_detail", team_id=team.id, assignment_id=a.id)
 
 @login_required
 def assignment_reopen(request, team_id, assignment_id):
-    team = get_object_or_404(Team, pk=team_id)
-    a = get_object_or_404(Assignment, pk=assignment_id, team=team)
-    if request.user != team.owner:
+    acc = access.resolve(request, team_id, assignment_id)
+    team, a = acc.team, acc.assignment
+    if not acc.is_owner:
         return HttpResponseForbidden("권한이 없습니다.")
     a.is_closed = False
-    a.save(update_fields=["is_closed"])
+    a.save(update_fields=["is_closed", "updated_at"])  # updated_at: 조각 캐시 버전
     messages.info(request, "과제 마감을 해제했습니다.")
     return redirect("assignment_detail", team_id=team.id, assignment_id=a.id)
 
 @login_required
+@conditional_page(assignment_list_page)
 def assignment_list(request, team_id):
-    team = get_object_or_404(Team, id=team_id)
+    acc = access.resolve(request, team_id)
+    team = acc.team
+    # 팀장 또는 승인 + 참가 완료 멤버
+    if not (acc.is_owner or acc.is_joined):
+        return HttpResponseForbidden("팀 구성원만 접근할 수 있습니다.")
     assignments = Assignment.objects.filter(team=team).order_by("-created_at")
-    return render(request, "assignments/assignment_list.html", {"team": team, "assignments": assignments})
\ No newline at end of file
+    return render(request, "assignments/assignment_list.html", {"team": team, "assignments": assignments})
+# ===== 알림 =====
+NOTIFICATION_PAGE_SIZE = 50
+
+@login_required
+def notification_list(request):
+    # POST: 모두 읽음
+    if request.method == "POST":
+        notifications.mark_read(request.user.id)
+        return redirect("notification_list")
+    items = Notification.objects.filter(user=request.user).order_by("-created_at", "-id")[:NOTIFICATION_PAGE_SIZE]
+    return render(request, "notifications/list.html", {"items": items})
+
+@login_required
+def notification_open(request, notification_id):
+    # 읽음 처리 후 알림이 가리키는 화면으로
+    n = get_object_or_404(Notification, pk=notification_id, user=request.user)
+    if n.read_at is None:
+        notifications.mark_read(request.user.id, [n.pk])
+    return redirect(n.payload.get("url") or "notification_list")
+
+
+# ===== 실시간 알림(SSE) =====
+# ASGI(uvicorn config.asgi:application)에서는 연결을 열어 두고 바뀔 때마다 보낸다(events.py).
+# WSGI(runserver/gunicorn)에서는 현재 상태 한 번 + retry 를 보내고 닫는다 → EventSource 가 그 간격으로 다시 연결.
+def _event_stream(request, channel, event, snapshot, version, update_event=None):
+    response = StreamingHttpResponse(
+        events.stream(channel, event, snapshot, version, is_asgi(request), update_event),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx 버퍼링 끄기
+    return response
+
+
+@alogin_required
+async def membership_events(request):
+    """학생: 내 참가 요청 상태(처음에 전체 memberships, 이후 바뀐 것 하나씩 membership)"""
+    uid = request.user.id
+
+    async def snapshot():
+        return [
+            events.membership_data(m)
+            async for m in TeamMembership.objects.filter(student_id=uid).order_by("-requested_at")
+        ]
+
+    return _event_stream(
+        request, events.membership_channel(uid), "memberships", snapshot,
+        lambda: generations.current("user", [uid])[uid], update_event="membership",
+    )
+
+
+@alogin_required
+async def assignment_events(request, team_id, assignment_id):
+    """팀장: 과제의 제출/채점 수(counts)"""
+    acc = await sync_to_async(access.resolve)(request, team_id, assignment_id)
+    if not acc.is_owner:
+        return HttpResponseForbidden("팀장만 확인할 수 있습니다.")
+
+    return _event_stream(
+        request, events.assignment_channel(assignment_id), "counts",
+        lambda: events.asubmission_counts(assignment_id),
+        lambda: generations.current("grades", [team_id])[team_id],
+    )